@@ -0,0 +1,258 @@
+"""
+Affix matching structures for the unified parser
+
+Suffix tables are compiled once into immutable SuffixTable tuples and indexed
+by a SuffixTrie keyed on reversed characters, so every suffix of a word (for
+any table) is found in a single right-to-left walk instead of one endswith()
+test per table entry. PrefixTrie does the same for verb roots at the start
+of a stem.
+"""
+
+from operator import attrgetter
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+# Key under which a trie node stores its payloads; never a character of a word
+PAYLOAD = ''
+# Key under which a SuffixTrie payload node stores, per kind, the payloads of
+# its whole path (itself and every shorter suffix), pre-sorted by rank and index
+PATH_PAYLOADS = None
+
+
+class SuffixEntry(NamedTuple):
+    """One suffix of a compiled suffix table"""
+    suffix: str
+    length: int
+    priority: int
+    blocks: FrozenSet[str]
+    must_precede: FrozenSet[str]
+    info: Dict
+    index: int  # Position in the source dict (definition order)
+    rank: int  # Position in (priority, length) order, highest first
+
+
+class SuffixTable(NamedTuple):
+    """
+    Immutable form of a suffix dict, built once by compile_suffix_table()
+
+    ranked: entries by (priority, length), highest first - the order find_suffix_matches() applies them
+    ordered: entries in the dict's definition order, for callers that scan the table as written
+    """
+    name: Optional[str]
+    ranked: Tuple[SuffixEntry, ...]
+    ordered: Tuple[SuffixEntry, ...]
+
+
+def compile_suffix_table(suffix_dict: Dict[str, Dict], name: Optional[str] = None) -> SuffixTable:
+    """
+    Compile a suffix dict into a priority-ordered SuffixTable
+
+    Args:
+        suffix_dict: Mapping of suffix to info dict ('priority', 'blocks', 'must_precede', ...)
+        name: Table name, used as its kind in a SuffixTrie
+
+    Returns:
+        SuffixTable with precomputed lengths and frozenset blocking/context rules
+    """
+    items = list(suffix_dict.items())
+    order = sorted(range(len(items)),
+                   key=lambda i: (items[i][1].get('priority', 0), len(items[i][0])),
+                   reverse=True)
+    rank_of = {i: rank for rank, i in enumerate(order)}
+
+    ordered = tuple(
+        SuffixEntry(
+            suffix=suffix,
+            length=len(suffix),
+            priority=info.get('priority', 0),
+            blocks=frozenset(info.get('blocks') or ()),
+            must_precede=frozenset(info.get('must_precede') or ()),
+            info=info,
+            index=i,
+            rank=rank_of[i]
+        )
+        for i, (suffix, info) in enumerate(items)
+    )
+    return SuffixTable(name=name, ranked=tuple(ordered[i] for i in order), ordered=ordered)
+
+
+class SuffixTrie:
+    """
+    Trie over reversed suffixes of one or more suffix tables
+
+    Each node is a dict of character -> child node; a node that ends a suffix
+    also holds {kind: SuffixEntry} under the PAYLOAD key, so suffixes shared by
+    several tables are matched once. The suffixes ending a word are exactly
+    those on the path to the deepest node its walk reaches, so that node's
+    PATH_PAYLOADS already holds every match in rank and in index order.
+    """
+
+    def __init__(self):
+        self.root = {}
+        self.kinds = set()
+        self.indexed = True
+
+    @classmethod
+    def from_tables(cls, tables: Iterable[SuffixTable]) -> 'SuffixTrie':
+        """Build a trie over the given tables, using each table's name as its kind"""
+        trie = cls()
+        for table in tables:
+            for entry in table.ordered:
+                trie.add(entry.suffix, table.name, entry)
+        trie.index_paths()
+        return trie
+
+    def add(self, suffix: str, kind: str, payload):
+        """Register a suffix for a kind"""
+        node = self.root
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node.setdefault(PAYLOAD, {})[kind] = payload
+        self.kinds.add(kind)
+        self.indexed = False
+
+    def index_paths(self):
+        """Store PATH_PAYLOADS, sorted by SuffixEntry rank and index, at every payload node"""
+        stack = [(self.root, {})]
+        while stack:
+            node, inherited = stack.pop()
+            payloads = node.get(PAYLOAD)
+            if payloads:
+                inherited = dict(inherited)
+                for kind, payload in payloads.items():
+                    inherited[kind] = inherited.get(kind, ()) + (payload,)
+                node[PATH_PAYLOADS] = {
+                    kind: (tuple(sorted(entries, key=attrgetter('rank'))),
+                           tuple(sorted(entries, key=attrgetter('index'))))
+                    for kind, entries in inherited.items()
+                }
+            for char, child in node.items():
+                if char != PAYLOAD and char is not PATH_PAYLOADS:
+                    stack.append((child, inherited))
+        self.indexed = True
+
+    def walk(self, word: str) -> List[Tuple[int, Mapping]]:
+        """
+        Find every registered suffix of a word in one right-to-left pass
+
+        Args:
+            word: Word to match
+
+        Returns:
+            (suffix length, {kind: payload}) tuples, shortest suffix first
+        """
+        node = self.root
+        found = []
+        if PAYLOAD in node:
+            found.append((0, node[PAYLOAD]))
+        length = 0
+        for char in reversed(word):
+            node = node.get(char)
+            if node is None:
+                break
+            length += 1
+            payloads = node.get(PAYLOAD)
+            if payloads:
+                found.append((length, payloads))
+        return found
+
+    def matches(self, word: str, kind: str) -> List:
+        """Payloads of one kind whose suffix ends the word, shortest suffix first"""
+        return [payloads[kind] for _, payloads in self.walk(word) if kind in payloads]
+
+    def _path_matches(self, word: str, kind: str) -> Tuple[Tuple, Tuple]:
+        """(by rank, by index) payloads of one kind whose suffix ends the word"""
+        if not self.indexed:
+            self.index_paths()
+        node = self.root
+        deepest = node if PAYLOAD in node else None
+        for char in reversed(word):
+            node = node.get(char)
+            if node is None:
+                break
+            if PAYLOAD in node:
+                deepest = node
+        if deepest is None:
+            return (), ()
+        return deepest[PATH_PAYLOADS].get(kind, ((), ()))
+
+    def ranked_matches(self, word: str, kind: str) -> Tuple:
+        """SuffixEntries of one kind whose suffix ends the word, in rank order"""
+        return self._path_matches(word, kind)[0]
+
+    def ordered_matches(self, word: str, kind: str) -> Tuple:
+        """SuffixEntries of one kind whose suffix ends the word, in definition order"""
+        return self._path_matches(word, kind)[1]
+
+
+class PrefixTrie:
+    """
+    Character trie over a set of words (verb roots) for prefix queries
+
+    Finds every word that is a prefix of a string in one left-to-right walk,
+    instead of slicing the string at each length and probing a set.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root = {}
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    @classmethod
+    def from_nodes(cls, root: Dict, size: int) -> 'PrefixTrie':
+        """Wrap an existing node structure (e.g. the .root of a saved trie)"""
+        trie = cls()
+        trie.root = root
+        trie.size = size
+        return trie
+
+    def add(self, word: str):
+        """Insert a word"""
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        if PAYLOAD not in node:
+            node[PAYLOAD] = True
+            self.size += 1
+
+    def prefix_lengths(self, text: str) -> List[int]:
+        """Lengths of all words that are prefixes of text, shortest first"""
+        node = self.root
+        lengths = []
+        for i, char in enumerate(text):
+            node = node.get(char)
+            if node is None:
+                break
+            if PAYLOAD in node:
+                lengths.append(i + 1)
+        return lengths
+
+    def prefixes_of(self, text: str) -> List[str]:
+        """
+        All words that are prefixes of text (including text itself)
+
+        Args:
+            text: String to match
+
+        Returns:
+            Matching words, longest first
+        """
+        return [text[:n] for n in reversed(self.prefix_lengths(text))]
+
+    def longest_prefix(self, text: str, min_length: int = 1) -> Optional[str]:
+        """Longest word that is a prefix of text and at least min_length long, or None"""
+        lengths = self.prefix_lengths(text)
+        if lengths and lengths[-1] >= min_length:
+            return text[:lengths[-1]]
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                return False
+        return PAYLOAD in node
+
+    def __len__(self) -> int:
+        return self.size
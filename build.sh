@@ -3,4 +3,9 @@
 echo "Prakrit Parser - Build"
 echo "Database: Turso (on-demand HTTP queries)"
 pip install -r requirements.txt
+
+# Optional: bundle a snapshot of the verb roots so cold starts skip downloading them
+if [ -n "$TURSO_DATABASE_URL" ] && [ -n "$TURSO_AUTH_TOKEN" ]; then
+    python root_snapshot.py build || echo "Verb root snapshot skipped"
+fi
 echo "Build complete"
@@ -0,0 +1,264 @@
+"""
+Multiprocess corpus lemmatizer
+
+Tags every word of large Prakrit text files (HK or Devanagari) with its best
+analysis. Each distinct word is parsed once: the distinct words are split
+into chunks and spread over a pool of worker processes, each holding its
+own PrakritUnifiedParser and calling parse_many() per chunk. Finished
+chunks are appended to a checkpoint file, so an interrupted run resumes
+where it stopped. The checkpoint is named after the inputs, the output and
+the data version, so it is never reused for other texts or data, and it is
+removed once the output has been written.
+
+Usage:
+    python corpus_lemmatizer.py <file>... [-o output.tsv] [--format tsv|jsonl]
+                                [--workers N] [--chunk-size N]
+                                [--checkpoint path] [--no-resume]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from turso_db import DATA_VERSION_KEY
+from unified_parser import PrakritUnifiedParser, split_words
+
+# Distinct words sent to a worker at a time (one batched lookup each)
+DEFAULT_CHUNK_SIZE = 200
+
+# Grammatical fields joined (in this order) into an analysis' tag
+TAG_FIELDS = ('participle_type', 'tense', 'mood', 'voice', 'person', 'gender', 'case', 'number')
+
+OUTPUT_COLUMNS = ('file', 'line', 'token', 'lemma', 'type', 'tag', 'confidence', 'source')
+
+# Parser of the current worker process, created by _init_worker()
+_worker_parser = None
+
+
+def summarize_result(result: Dict) -> Dict:
+    """
+    Reduce a parse() result to the lemma and tag of its best analysis
+
+    Returns:
+        Dict with lemma, type, tag, confidence, source and the number of analyses
+    """
+    analyses = (result.get('analyses') or []) if result.get('success') else []
+    if not analyses:
+        return {'lemma': '', 'type': '', 'tag': '', 'confidence': 0.0, 'source': '',
+                'analyses': 0, 'error': result.get('error', '')}
+
+    best = analyses[0]
+    return {
+        'lemma': best.get('root') or best.get('stem') or '',
+        'type': best.get('type', ''),
+        'tag': '.'.join(str(best[field]) for field in TAG_FIELDS if best.get(field) not in (None, '', 'unknown')),
+        'confidence': best.get('confidence', 0.0),
+        'source': best.get('source', ''),
+        'analyses': result.get('total_found', len(analyses)),
+    }
+
+
+def _init_worker(parser: Optional[PrakritUnifiedParser] = None):
+    """Give each worker process its own parser (and its own HTTP connections)"""
+    global _worker_parser
+    _worker_parser = parser or PrakritUnifiedParser(auto_download=False)
+
+
+def _tag_chunk(words: List[str]) -> List[Tuple[str, Dict]]:
+    """Parse a chunk of distinct words in a worker; returns (word, summary) pairs"""
+    results = _worker_parser.parse_many(words)
+    return [(word, summarize_result(result)) for word, result in zip(words, results)]
+
+
+def iter_tokens(paths: List[str]) -> Iterator[Tuple[str, int, str]]:
+    """Yield (file, line number, token) for every word of the input files"""
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line_number, line in enumerate(f, 1):
+                for token in split_words(line):
+                    yield path, line_number, token
+
+
+def data_version(parser: PrakritUnifiedParser) -> str:
+    """
+    Version of the data the parser answers from
+
+    Turso's (or the replica's) metadata data_version, or the name of the
+    data source when there is none.
+    """
+    parser.ensure_ready('data')
+    version = None
+    if parser.turso_connected():
+        version = parser.turso_db.get_metadata(DATA_VERSION_KEY)
+    return version or parser.data_source
+
+
+def default_checkpoint_path(paths: List[str], output: Optional[str], version: str) -> str:
+    """
+    Checkpoint file for one run: <output>.<key>.checkpoint.jsonl
+
+    The key hashes the input and output paths and the data version, so a
+    different corpus, output or database never picks up stale summaries.
+    """
+    run = [[os.path.abspath(path) for path in paths], os.path.abspath(output) if output else None, version]
+    key = hashlib.sha1(json.dumps(run).encode('utf-8')).hexdigest()[:12]
+    return f"{output or 'corpus'}.{key}.checkpoint.jsonl"
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict]:
+    """Load word summaries saved by an earlier run (a truncated last line is ignored)"""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                done[entry['token']] = entry['summary']
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _report_progress(done: int, total: int, start: float):
+    """Write a one-line progress report to stderr"""
+    elapsed = time.time() - start
+    rate = done / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(f"\rTagged {done}/{total} distinct words ({rate:.0f}/s)")
+    sys.stderr.flush()
+
+
+def tag_words(words: List[str], checkpoint_path: str, workers: int,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              parser: Optional[PrakritUnifiedParser] = None) -> Dict[str, Dict]:
+    """
+    Tag distinct words in parallel, appending finished chunks to the checkpoint
+
+    Args:
+        words: Distinct words still to tag
+        checkpoint_path: JSONL file receiving one {"token", "summary"} line per word
+        workers: Worker processes (1 parses in this process)
+        chunk_size: Words per task
+        parser: Parser to use when workers is 1 (created if omitted)
+
+    Returns:
+        Dict mapping each word to its summary
+    """
+    chunks = [words[i:i + chunk_size] for i in range(0, len(words), chunk_size)]
+    tagged = {}
+    start = time.time()
+
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+        def record(pairs):
+            for word, summary in pairs:
+                tagged[word] = summary
+                checkpoint.write(json.dumps({'token': word, 'summary': summary}, ensure_ascii=False) + '\n')
+            checkpoint.flush()
+            _report_progress(len(tagged), len(words), start)
+
+        if workers <= 1:
+            _init_worker(parser)
+            for chunk in chunks:
+                record(_tag_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                # Keep a bounded number of chunks in flight
+                remaining = iter(chunks)
+                in_flight = {pool.submit(_tag_chunk, chunk) for chunk in islice(remaining, workers * 2)}
+                while in_flight:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(future.result())
+                        chunk = next(remaining, None)
+                        if chunk is not None:
+                            in_flight.add(pool.submit(_tag_chunk, chunk))
+
+    if words:
+        sys.stderr.write('\n')
+    return tagged
+
+
+def write_output(paths: List[str], summaries: Dict[str, Dict], output, output_format: str) -> int:
+    """
+    Write one row per token, in text order
+
+    Returns:
+        Number of tokens written
+    """
+    count = 0
+    if output_format == 'tsv':
+        output.write('\t'.join(OUTPUT_COLUMNS) + '\n')
+
+    for path, line_number, token in iter_tokens(paths):
+        row = dict(summaries[token], file=path, line=line_number, token=token)
+        if output_format == 'tsv':
+            output.write('\t'.join(str(row[column]) for column in OUTPUT_COLUMNS) + '\n')
+        else:
+            output.write(json.dumps(row, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the corpus command; returns the process exit code"""
+    arg_parser = argparse.ArgumentParser(
+        prog='python corpus_lemmatizer.py',
+        description='Lemmatize and tag Prakrit text files (HK or Devanagari)')
+    arg_parser.add_argument('files', nargs='+', help='UTF-8 text files')
+    arg_parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    arg_parser.add_argument('--format', choices=('tsv', 'jsonl'), default='tsv', dest='output_format')
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (default: number of CPUs)')
+    arg_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help=f'Distinct words per task (default: {DEFAULT_CHUNK_SIZE})')
+    arg_parser.add_argument('--checkpoint',
+                            help='Checkpoint file (default: <output or corpus>.<run key>.checkpoint.jsonl)')
+    arg_parser.add_argument('--no-resume', action='store_true',
+                            help='Discard an existing checkpoint instead of resuming from it')
+    args = arg_parser.parse_args(argv)
+
+    for path in args.files:
+        if not os.path.isfile(path):
+            print(f"Error: {path} not found", file=sys.stderr)
+            return 1
+
+    parser = PrakritUnifiedParser(auto_download=False, lazy=True)
+    checkpoint_path = args.checkpoint or default_checkpoint_path(args.files, args.output, data_version(parser))
+    if args.no_resume and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    # First pass: distinct words, in order of first occurrence
+    distinct = {}
+    token_count = 0
+    for _, _, token in iter_tokens(args.files):
+        distinct.setdefault(token, None)
+        token_count += 1
+
+    summaries = load_checkpoint(checkpoint_path)
+    pending = [word for word in distinct if word not in summaries]
+    print(f"{token_count} tokens, {len(distinct)} distinct words "
+          f"({len(distinct) - len(pending)} already in {checkpoint_path})", file=sys.stderr)
+
+    summaries.update(tag_words(pending, checkpoint_path, max(1, args.workers), max(1, args.chunk_size), parser))
+
+    # Second pass: one row per token
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            written = write_output(args.files, summaries, output, args.output_format)
+        print(f"Wrote {written} tokens to {args.output}", file=sys.stderr)
+    else:
+        write_output(args.files, summaries, sys.stdout, args.output_format)
+
+    # Finished - the checkpoint is only needed to resume an interrupted run
+    os.remove(checkpoint_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,15 @@
 """
 Simple Devanagari to Harvard-Kyoto transliterator
+
+Also converts the romanizations IAST, ISO-15919, SLP1 and Velthuis to
+Harvard-Kyoto (HK), the form the parser works in.
 """
 
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional
+
 # Devanagari vowels to HK
 VOWELS = {
     'अ': 'a', 'आ': 'A', 'इ': 'i', 'ई': 'I', 'उ': 'u', 'ऊ': 'U',
@@ -51,82 +59,364 @@ DIGITS = {
     '५': '5', '६': '6', '७': '7', '८': '8', '९': '9'
 }
 
+# Reverse tables for HK to Devanagari
+HK_VOWELS = {hk: dev for dev, hk in VOWELS.items()}
+HK_VOWEL_SIGNS = {hk: dev for dev, hk in VOWEL_SIGNS.items()}
+HK_VOWEL_SIGNS['a'] = ''  # Inherent vowel
+HK_CONSONANTS = {hk: dev for dev, hk in CONSONANTS.items()}
+HK_OTHER = {hk: dev for dev, hk in SPECIAL.items() if hk}
+HK_OTHER.update({hk: dev for dev, hk in DIGITS.items()})
+VIRAMA = '्'
+
+
+def _alternation(tokens) -> str:
+    """Regex alternation of literal tokens, longest first so matching is greedy"""
+    return '|'.join(re.escape(token) for token in sorted(tokens, key=len, reverse=True))
+
+
+# One token per match: a consonant, a vowel (longest first across both, so
+# 'lR' is a vowel rather than 'l' + 'R') or any other single character
+HK_TOKEN = re.compile(f'{_alternation(set(HK_CONSONANTS) | set(HK_VOWELS))}|.', re.DOTALL)
+
+# Distinct strings remembered by hk_to_devanagari()
+HK_TO_DEVANAGARI_CACHE_SIZE = 8192
+
+# Nasal spellings collapsed by nasal_key(): anusvara (M, ṃ), retroflex (N, ṇ),
+# dental (n), palatal (J, ñ) and velar (G, ṅ) nasals
+NASAL_KEY_CHAR = 'M'
+NASAL_KEY_TABLE = str.maketrans({c: NASAL_KEY_CHAR for c in 'ṃNṇnJñGṅ'})
+# m is only a nasal spelling variant before a labial (homorganic with p/ph/b/bh/m)
+HOMORGANIC_M = re.compile(r'm(?=[pbm])')
+
+
+def nasal_key(word: str) -> str:
+    """
+    Canonical lookup key that is identical for all nasal spellings of a word
+
+    Every nasal (anusvara, N, n, J, G and their IAST-style forms, plus m
+    before a labial) becomes 'M', so e.g. 'saMjama', 'saJjama' and
+    'sañjama' share one key. Used for the form_key / headword_key columns.
+
+    Args:
+        word: Word in HK transliteration
+
+    Returns:
+        Normalized key
+    """
+    return HOMORGANIC_M.sub(NASAL_KEY_CHAR, word).translate(NASAL_KEY_TABLE)
+
+
+# Characters copied unchanged by devanagari_to_hk()
+PASSTHROUGH = ' \t\n.,;:!?()-[]{}'
+
+# Joins texts for a single pass in devanagari_to_hk_many(); copied like any PASSTHROUGH character
+BATCH_SEPARATOR = '\n'
+
+# Distinct strings remembered by devanagari_to_hk()
+DEVANAGARI_TO_HK_CACHE_SIZE = 8192
+
+
+class _DevanagariTokenTable(dict):
+    """Token -> HK table; tokens not in the table are dropped (and remembered)"""
+
+    def __missing__(self, token: str) -> str:
+        self[token] = ''
+        return ''
+
+
+def _build_token_table() -> _DevanagariTokenTable:
+    """
+    HK for every token DEVANAGARI_TOKEN can match
+
+    A consonant alone carries the inherent 'a'; followed by a virama it has
+    none, by a vowel sign it takes that vowel, and by anusvara, visarga,
+    candrabindu or avagraha it keeps the 'a' before that sign.
+    """
+    table = _DevanagariTokenTable()
+    for char in PASSTHROUGH:
+        table[char] = char
+    table.update(VOWELS)
+    table.update(SPECIAL)
+    table.update(DIGITS)
+    for consonant, hk in CONSONANTS.items():
+        table[consonant] = hk + 'a'
+        for sign, vowel in VOWEL_SIGNS.items():
+            table[consonant + sign] = hk + vowel
+        for sign, special in SPECIAL.items():
+            table[consonant + sign] = hk + ('' if sign == VIRAMA else 'a' + special)
+    return table
+
+
+# A consonant with the sign that follows it, if any, or any other single character
+DEVANAGARI_TOKEN = re.compile(
+    f"[{''.join(CONSONANTS)}][{''.join(VOWEL_SIGNS)}{''.join(SPECIAL)}]?|.", re.DOTALL)
+DEVANAGARI_TOKEN_TABLE = _build_token_table()
+
+
+def _tokens_to_hk(text: str) -> str:
+    """devanagari_to_hk() by one regex pass plus table lookups (handles any input)"""
+    return ''.join(map(DEVANAGARI_TOKEN_TABLE.__getitem__, DEVANAGARI_TOKEN.findall(text)))
+
+
+# Markers written by DEVANAGARI_TRANSLATION: a consonant's inherent 'a', the start
+# of a vowel sign or virama, and a dropped (unknown) character
+INHERENT_A = '\x01'
+SIGN = '\x02'
+DROPPED = '\x03'
+
+
+class _DevanagariTranslation(dict):
+    """str.translate() table; characters not in it become DROPPED"""
+
+    def __missing__(self, codepoint: int) -> str:
+        self[codepoint] = DROPPED
+        return DROPPED
+
+
+def _build_translation() -> _DevanagariTranslation:
+    """
+    Per-character table for _translate_to_hk()
+
+    Consonants end in INHERENT_A, and vowel signs and the virama start with
+    SIGN, so the pair INHERENT_A + SIGN marks exactly a consonant directly
+    followed by a sign, whose inherent 'a' is dropped.
+    """
+    table = _DevanagariTranslation()
+    for char, hk in DEVANAGARI_TOKEN_TABLE.items():
+        if len(char) == 1:
+            table[ord(char)] = hk
+    for consonant, hk in CONSONANTS.items():
+        table[ord(consonant)] = hk + INHERENT_A
+    for sign, vowel in VOWEL_SIGNS.items():
+        table[ord(sign)] = SIGN + vowel
+    table[ord(VIRAMA)] = SIGN
+    return table
+
+
+DEVANAGARI_TRANSLATION = _build_translation()
+
+
+def _translate_to_hk(text: str) -> str:
+    """
+    Uncached devanagari_to_hk(): str.translate() plus a few str.replace() passes
+
+    Faster than _tokens_to_hk(), since no Python code runs per character.
+    Text with a vowel sign or virama that does not follow a consonant goes
+    through _tokens_to_hk() instead.
+    """
+    hk = text.translate(DEVANAGARI_TRANSLATION).replace(INHERENT_A + SIGN, '')
+    if SIGN in hk:
+        return _tokens_to_hk(text)
+    return hk.replace(INHERENT_A, 'a').replace(DROPPED, '')
+
+
+@lru_cache(maxsize=DEVANAGARI_TO_HK_CACHE_SIZE)
 def devanagari_to_hk(text: str) -> str:
     """
     Convert Devanagari text to Harvard-Kyoto transliteration
 
+    Each character is mapped with one str.translate() table precomputed
+    from VOWELS, VOWEL_SIGNS, CONSONANTS, SPECIAL and DIGITS, and the
+    inherent 'a' of consonants followed by a vowel sign or virama is then
+    removed (see _translate_to_hk). Unknown characters are dropped.
+
     Args:
         text: Devanagari text
 
     Returns:
         Harvard-Kyoto transliteration
     """
-    result = []
-    i = 0
+    return _translate_to_hk(text)
 
-    while i < len(text):
-        char = text[i]
 
-        # Skip whitespace and punctuation
-        if char in ' \t\n.,;:!?()-[]{}':
-            result.append(char)
-            i += 1
-            continue
+def devanagari_to_hk_many(texts: List[str]) -> List[str]:
+    """
+    Convert many Devanagari texts (e.g. all words of a passage) at once
 
-        # Check for standalone vowels
-        if char in VOWELS:
-            result.append(VOWELS[char])
-            i += 1
-            continue
+    Each distinct text is converted once, and all of them in a single regex
+    pass over the joined texts.
 
-        # Check for consonants
-        if char in CONSONANTS:
-            result.append(CONSONANTS[char])
-
-            # Check for following vowel sign
-            if i + 1 < len(text):
-                next_char = text[i + 1]
-
-                # Halanta (virama) - no vowel
-                if next_char == '्':
-                    i += 2  # Skip both consonant and virama
-                    continue
-
-                # Vowel sign
-                elif next_char in VOWEL_SIGNS:
-                    result.append(VOWEL_SIGNS[next_char])
-                    i += 2  # Skip both consonant and vowel sign
-                    continue
-
-                # Anusvara, Visarga, Candrabindu
-                elif next_char in SPECIAL:
-                    result.append('a')  # Inherent 'a'
-                    result.append(SPECIAL[next_char])
-                    i += 2
-                    continue
-
-            # No following vowel sign = inherent 'a'
-            result.append('a')
-            i += 1
-            continue
+    Args:
+        texts: Devanagari texts
+
+    Returns:
+        HK transliterations, in the same order
+    """
+    distinct = list(dict.fromkeys(texts))
+    if not distinct:
+        return []
+    if any(BATCH_SEPARATOR in text for text in distinct):
+        converted = {text: devanagari_to_hk(text) for text in distinct}
+    else:
+        converted = dict(zip(distinct, _translate_to_hk(BATCH_SEPARATOR.join(distinct)).split(BATCH_SEPARATOR)))
+    return [converted[text] for text in texts]
 
-        # Special characters (anusvara, visarga, etc.)
-        if char in SPECIAL:
-            result.append(SPECIAL[char])
-            i += 1
-            continue
 
-        # Digits
-        if char in DIGITS:
-            result.append(DIGITS[char])
-            i += 1
+@lru_cache(maxsize=HK_TO_DEVANAGARI_CACHE_SIZE)
+def hk_to_devanagari(text: str) -> str:
+    """
+    Convert Harvard-Kyoto text to Devanagari
+
+    The inverse of devanagari_to_hk(), built from the same tables. Text is
+    split into longest-match tokens; vowels after a consonant become vowel
+    signs and a consonant not followed by a vowel gets a virama. Characters
+    outside the tables are kept as they are.
+
+    Args:
+        text: Harvard-Kyoto text
+
+    Returns:
+        Devanagari text
+    """
+    result = []
+    after_consonant = False
+
+    for token in HK_TOKEN.findall(text):
+        if token in HK_VOWELS:
+            result.append(HK_VOWEL_SIGNS[token] if after_consonant else HK_VOWELS[token])
+            after_consonant = False
             continue
 
-        # Unknown character - skip
-        i += 1
+        # Anything but a vowel closes a preceding consonant
+        if after_consonant:
+            result.append(VIRAMA)
+
+        if token in HK_CONSONANTS:
+            result.append(HK_CONSONANTS[token])
+            after_consonant = True
+        else:
+            result.append(HK_OTHER.get(token, token))
+            after_consonant = False
+
+    if after_consonant:
+        result.append(VIRAMA)
 
     return ''.join(result)
 
+
+# Romanization schemes to HK: only tokens spelled differently from HK are
+# listed, everything else is copied unchanged
+IAST_TO_HK = {
+    'ā': 'A', 'ī': 'I', 'ū': 'U', 'ṛ': 'R', 'ṝ': 'RR', 'ḷ': 'lR', 'ḹ': 'lRR',
+    'ṅ': 'G', 'ñ': 'J', 'ṭ': 'T', 'ḍ': 'D', 'ṇ': 'N', 'ś': 'z', 'ṣ': 'S',
+    'ṃ': 'M', 'ṁ': 'M', 'ḥ': 'H', 'm\u0310': '~',
+}
+
+ISO_15919_TO_HK = {
+    **IAST_TO_HK,
+    'r\u0325': 'R', 'r\u0325\u0304': 'RR', 'l\u0325': 'lR', 'l\u0325\u0304': 'lRR',
+    'ē': 'e', 'ō': 'o', 'ḷ': 'L',
+}
+
+SLP1_TO_HK = {
+    'K': 'kh', 'G': 'gh', 'N': 'G', 'C': 'ch', 'J': 'jh', 'Y': 'J',
+    'w': 'T', 'W': 'Th', 'q': 'D', 'Q': 'Dh', 'R': 'N',
+    'T': 'th', 'D': 'dh', 'P': 'ph', 'B': 'bh', 'S': 'z', 'z': 'S',
+    'f': 'R', 'F': 'RR', 'x': 'lR', 'X': 'lRR', 'E': 'ai', 'O': 'au',
+}
+
+VELTHUIS_TO_HK = {
+    'aa': 'A', 'ii': 'I', 'uu': 'U', '.r': 'R', '.R': 'RR', '.l': 'lR', '.L': 'lRR',
+    '"n': 'G', '~n': 'J', '.t': 'T', '.d': 'D', '.n': 'N', '"s': 'z', '.s': 'S',
+    '.m': 'M', '.h': 'H', '/': '~', '.a': "'",
+}
+
+SCHEME_TABLES = {
+    'IAST': IAST_TO_HK,
+    'ISO-15919': ISO_15919_TO_HK,
+    'SLP1': SLP1_TO_HK,
+    'Velthuis': VELTHUIS_TO_HK,
+}
+
+# Schemes that do not distinguish case (folded before conversion)
+CASELESS_SCHEMES = {'IAST', 'ISO-15919'}
+
+# Characters that only occur in one scheme, checked in this order (ISO-15919
+# before IAST, whose letters it shares); plain ASCII without any is HK.
+# SLP1 is only recognized by its consonant letters: its vowels f, x, E, O are
+# rare in Prakrit and more likely to be HK typos ('Ogha', 'x').
+SCHEME_MARKERS = (
+    ('ISO-15919', re.compile('[\u0325ēō]')),
+    ('IAST', re.compile('[āīūṛṝḷḹṅñṭḍṇśṣṃṁḥ]')),
+    ('Velthuis', re.compile(r'\.[rRlLtdnmsha]|"[ns]|~n')),
+    ('SLP1', re.compile('[KCWQPBYqw]')),
+)
+
+# Sequences normal in HK but not in SLP1: a stop followed by h (SLP1 writes
+# aspirates as one letter) and N (ṅ in SLP1) before anything but a velar.
+# Text with an SLP1 marker and one of these is read as HK.
+HK_ONLY_SEQUENCES = re.compile('[kgcjtdpbKGCJTDPBWQ]h|N(?![kKgG])')
+
+# Distinct strings remembered per scheme by scheme_to_hk()
+SCHEME_TO_HK_CACHE_SIZE = 4096
+
+
+def detect_scheme(text: str) -> str:
+    """
+    Detect the script or romanization scheme of a text
+
+    Ambiguous ASCII (e.g. an SLP1 letter in a word that is otherwise HK) is
+    read as HK.
+
+    Args:
+        text: Input text
+
+    Returns:
+        'Devanagari', 'ISO-15919', 'IAST', 'Velthuis', 'SLP1' or 'HK'
+    """
+    if any('\u0900' <= c <= '\u097F' for c in text):
+        return 'Devanagari'
+    if not text.isascii():
+        text = unicodedata.normalize('NFC', text)
+    for scheme, marker in SCHEME_MARKERS:
+        if marker.search(text):
+            if scheme == 'SLP1' and HK_ONLY_SEQUENCES.search(text):
+                return 'HK'
+            return scheme
+    return 'HK'
+
+
+def _scheme_converter(scheme: str, table: dict):
+    """Build the cached one-pass converter for one scheme"""
+    token = re.compile(f'{_alternation(table)}|.', re.DOTALL)
+    lookup = table.get
+    caseless = scheme in CASELESS_SCHEMES
+
+    @lru_cache(maxsize=SCHEME_TO_HK_CACHE_SIZE)
+    def convert(text: str) -> str:
+        text = unicodedata.normalize('NFC', text)
+        if caseless:
+            text = text.lower()
+        return ''.join([lookup(t, t) for t in token.findall(text)])
+
+    convert.__name__ = f"{scheme.lower().replace('-', '_')}_to_hk"
+    return convert
+
+
+SCHEME_CONVERTERS = {scheme: _scheme_converter(scheme, table) for scheme, table in SCHEME_TABLES.items()}
+
+
+def scheme_to_hk(text: str, scheme: Optional[str] = None) -> str:
+    """
+    Convert text in any supported script or scheme to HK
+
+    Each scheme has a precompiled longest-match token regex and its own
+    bounded cache. HK text is returned unchanged.
+
+    Args:
+        text: Input text
+        scheme: Script or scheme of the text; detected if omitted
+
+    Returns:
+        Harvard-Kyoto transliteration
+    """
+    scheme = scheme or detect_scheme(text)
+    if scheme == 'Devanagari':
+        return devanagari_to_hk(text)
+    converter = SCHEME_CONVERTERS.get(scheme)
+    return converter(text) if converter else text
+
+
 def test_transliteration():
     """Test cases for transliteration"""
     test_cases = [
@@ -145,5 +435,47 @@ def test_transliteration():
         status = "✓" if result == expected else "✗"
         print(f"{status} {dev:15s} → {result:15s} (expected: {expected})")
 
+    print()
+    print("Testing HK to Devanagari transliteration:")
+    print("=" * 60)
+    for dev, hk in test_cases:
+        result = hk_to_devanagari(hk)
+        status = "✓" if result == dev else "✗"
+        print(f"{status} {hk:15s} → {result:15s} (expected: {dev})")
+
+    key_cases = [
+        (['saMjama', 'saJjama', 'sañjama', 'saṃjama'], 'saMjama'),
+        (['kaMpa', 'kampa'], 'kaMpa'),
+        (['muNinti', 'muṇinti', 'muNiMti'], 'muMiMti'),
+    ]
+
+    print()
+    print("Testing nasal_key:")
+    print("=" * 60)
+    for words, expected in key_cases:
+        keys = {nasal_key(w) for w in words}
+        status = "✓" if keys == {expected} else "✗"
+        print(f"{status} {', '.join(words):40s} → {', '.join(sorted(keys))} (expected: {expected})")
+
+    scheme_cases = [
+        ('muṇinti', 'IAST', 'muNinti'),
+        ('pucchissaṃti', 'IAST', 'pucchissaMti'),
+        ('kēśa', 'ISO-15919', 'keza'),
+        ('saYjamo', 'SLP1', 'saJjamo'),
+        ('Bavati', 'SLP1', 'bhavati'),
+        ('mu.niihi.mto', 'Velthuis', 'muNIhiMto'),
+        ('jANaMti', 'HK', 'jANaMti'),
+    ]
+
+    print()
+    print("Testing scheme detection and conversion to HK:")
+    print("=" * 60)
+    for text, scheme, expected in scheme_cases:
+        detected = detect_scheme(text)
+        result = scheme_to_hk(text)
+        status = "✓" if (detected, result) == (scheme, expected) else "✗"
+        print(f"{status} {text:15s} → {detected:10s} {result:15s} (expected: {scheme} {expected})")
+
+
 if __name__ == '__main__':
     test_transliteration()
@@ -16,6 +16,8 @@ import json
 from typing import List, Dict, Optional, Tuple
 import os
 
+from devanagari_transliterator import nasal_key
+
 
 class PrakritDictionary:
     """SQLite-based Prakrit dictionary lookup"""
@@ -34,11 +36,46 @@ class PrakritDictionary:
         self.conn = sqlite3.connect(db_path, check_same_thread=False)
         self.cursor = self.conn.cursor()
 
+        # headword_key (nasal_key of headword_translit) is added by migrate_form_keys.py
+        self.cursor.execute('PRAGMA table_info(dictionary)')
+        self.has_headword_key = any(row[1] == 'headword_key' for row in self.cursor.fetchall())
+
     def __del__(self):
         """Close database connection"""
         if hasattr(self, 'conn'):
             self.conn.close()
 
+    # Columns selected by lookup() and lookup_by_key(), in _row_to_entry() order
+    ENTRY_COLUMNS = '''
+                headword_devanagari,
+                headword_translit,
+                type_list,
+                gender,
+                sanskrit_equivalent,
+                is_desya,
+                is_root,
+                is_word,
+                meanings,
+                "references",
+                cross_references'''
+
+    @staticmethod
+    def _row_to_entry(row: Tuple) -> Dict:
+        """Convert a row of ENTRY_COLUMNS into a dictionary entry"""
+        return {
+            'headword_devanagari': row[0],
+            'headword_translit': row[1],
+            'type': json.loads(row[2]) if row[2] else [],
+            'gender': row[3],
+            'sanskrit_equivalent': json.loads(row[4]) if row[4] else [],
+            'is_desya': bool(row[5]),
+            'is_root': bool(row[6]),
+            'is_word': bool(row[7]),
+            'meanings': json.loads(row[8]) if row[8] else [],
+            'references': json.loads(row[9]) if row[9] else [],
+            'cross_references': json.loads(row[10]) if row[10] else []
+        }
+
     def lookup(self, word: str, script: str = 'HK') -> List[Dict]:
         """
         Look up a word in the dictionary
@@ -56,43 +93,40 @@ class PrakritDictionary:
             field = 'headword_devanagari'
 
         query = f'''
-            SELECT
-                headword_devanagari,
-                headword_translit,
-                type_list,
-                gender,
-                sanskrit_equivalent,
-                is_desya,
-                is_root,
-                is_word,
-                meanings,
-                references,
-                cross_references
+            SELECT{self.ENTRY_COLUMNS}
             FROM dictionary
             WHERE {field} = ?
         '''
 
         self.cursor.execute(query, (word,))
-        results = self.cursor.fetchall()
+        return [self._row_to_entry(row) for row in self.cursor.fetchall()]
 
-        entries = []
-        for row in results:
-            entry = {
-                'headword_devanagari': row[0],
-                'headword_translit': row[1],
-                'type': json.loads(row[2]) if row[2] else [],
-                'gender': row[3],
-                'sanskrit_equivalent': json.loads(row[4]) if row[4] else [],
-                'is_desya': bool(row[5]),
-                'is_root': bool(row[6]),
-                'is_word': bool(row[7]),
-                'meanings': json.loads(row[8]) if row[8] else [],
-                'references': json.loads(row[9]) if row[9] else [],
-                'cross_references': json.loads(row[10]) if row[10] else []
-            }
-            entries.append(entry)
+    def lookup_by_key(self, word: str) -> List[Dict]:
+        """
+        Look up a word under all of its nasal spellings at once
 
-        return entries
+        Matches on headword_key, so e.g. 'saMjama' also finds 'saJjama'.
+        Entries spelled exactly like the word come first. Falls back to
+        lookup() if the database has no headword_key column.
+
+        Args:
+            word: Word in HK transliteration
+
+        Returns:
+            List of dictionary entries
+        """
+        if not self.has_headword_key:
+            return self.lookup(word, 'HK')
+
+        query = f'''
+            SELECT{self.ENTRY_COLUMNS}
+            FROM dictionary
+            WHERE headword_key = ?
+            ORDER BY headword_translit = ? DESC, id
+        '''
+
+        self.cursor.execute(query, (nasal_key(word), word))
+        return [self._row_to_entry(row) for row in self.cursor.fetchall()]
 
     def search(self, query: str, limit: int = 10) -> List[Dict]:
         """
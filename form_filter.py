@@ -0,0 +1,233 @@
+"""
+Bloom filter over all attested forms
+
+Built offline from the verb_forms, noun_forms and participle_forms tables
+and loaded at startup, so the Turso client can skip variants that are
+certainly not in the database instead of paying a round trip for them.
+False positives only cost a query that returns no rows; there are no false
+negatives as long as the filter was built from the current data (the
+Turso metadata 'data_version' is stored in the file and checked on connect;
+a filter or database without a data_version is never used).
+
+Usage:
+    python form_filter.py build [output.bloom] [--from-replica replica.db]
+    python form_filter.py check <form> [filter.bloom]
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import sys
+import time
+from typing import Iterator, Optional
+
+FORM_FILTER_PATH = os.getenv('FORM_FILTER_PATH',
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), 'attested_forms.bloom'))
+
+# kind -> table holding its forms
+FILTER_TABLES = {
+    'verb': 'verb_forms',
+    'noun': 'noun_forms',
+    'participle': 'participle_forms',
+}
+
+BUILD_PAGE_SIZE = 10000
+
+
+def filter_key(kind: str, form: str) -> str:
+    """Key under which a form of a given kind is stored in the filter"""
+    return f'{kind}\x00{form}'
+
+
+class BloomFilter:
+    """Compact probabilistic set of strings (no false negatives)"""
+
+    MAGIC = b'PKBF'
+    FORMAT_VERSION = 1
+    # magic, format version, size in bits, hash count, item count, data_version length
+    HEADER = struct.Struct('<4sHQIQH')
+
+    def __init__(self, size_bits: int, num_hashes: int, bits: Optional[bytearray] = None,
+                 count: int = 0, data_version: Optional[str] = None):
+        """
+        Initialize filter
+
+        Args:
+            size_bits: Number of bits in the filter
+            num_hashes: Number of bit positions set per item
+            bits: Existing bit array (for loading)
+            count: Number of items already added
+            data_version: Turso data_version the filter was built from
+        """
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((size_bits + 7) // 8)
+        self.count = count
+        self.data_version = data_version
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01, **kwargs) -> 'BloomFilter':
+        """Create a filter sized for `capacity` items at the given false-positive rate"""
+        capacity = max(capacity, 1)
+        size_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        num_hashes = max(1, int(round(size_bits / capacity * math.log(2))))
+        return cls(size_bits, num_hashes, **kwargs)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        """Bit positions for an item (double hashing over one blake2b digest)"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, item: str):
+        """Add an item"""
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """False if the item was certainly never added"""
+        bits = self.bits
+        for pos in self._positions(item):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def might_contain(self, kind: str, form: str) -> bool:
+        """False if the form certainly does not exist in the table for `kind`"""
+        return filter_key(kind, form) in self
+
+    def save(self, path: str):
+        """Write the filter to a binary file"""
+        version = (self.data_version or '').encode('utf-8')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, self.size_bits,
+                                     self.num_hashes, self.count, len(version)))
+            f.write(version)
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        """Read a filter written by save()"""
+        with open(path, 'rb') as f:
+            header = f.read(cls.HEADER.size)
+            magic, fmt, size_bits, num_hashes, count, version_len = cls.HEADER.unpack(header)
+            if magic != cls.MAGIC or fmt != cls.FORMAT_VERSION:
+                raise ValueError(f"Not a form filter file: {path}")
+            data_version = f.read(version_len).decode('utf-8') or None
+            bits = bytearray(f.read())
+        if len(bits) != (size_bits + 7) // 8:
+            raise ValueError(f"Truncated form filter file: {path}")
+        return cls(size_bits, num_hashes, bits, count, data_version)
+
+
+def load_form_filter(path: str = FORM_FILTER_PATH) -> Optional[BloomFilter]:
+    """Load the attested-form filter if the file exists, else None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return BloomFilter.load(path)
+    except Exception as e:
+        print(f"Warning: Could not load form filter: {e}")
+        return None
+
+
+def _iter_turso_forms(db, table: str, page_size: int) -> Iterator[str]:
+    """Yield every form in a Turso table, paging by rowid"""
+    last_id = 0
+    while True:
+        rows = db._execute(
+            f'SELECT rowid, form FROM {table} WHERE rowid > CAST(? AS INTEGER) '
+            f'ORDER BY rowid LIMIT {int(page_size)}',
+            [last_id]
+        )
+        if rows is None:
+            raise RuntimeError(f"Failed to fetch forms from {table}")
+        for _, form in rows:
+            if form:
+                yield form
+        if len(rows) < page_size:
+            return
+        last_id = int(rows[-1][0])
+
+
+def build_form_filter(output_path: str = FORM_FILTER_PATH, replica_path: Optional[str] = None,
+                      error_rate: float = 0.01, page_size: int = BUILD_PAGE_SIZE) -> BloomFilter:
+    """
+    Build the attested-form filter from Turso or a local replica
+
+    Args:
+        output_path: Where to write the filter
+        replica_path: Read forms from this turso_replica.py file instead of Turso
+        error_rate: Target false-positive rate
+        page_size: Rows fetched per Turso request
+
+    Returns:
+        The built filter
+    """
+    from turso_db import DATA_VERSION_KEY, TursoDatabase
+
+    if replica_path:
+        conn = sqlite3.connect(f'file:{replica_path}?mode=ro', uri=True)
+        counts = {kind: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                  for kind, table in FILTER_TABLES.items()}
+        row = conn.execute('SELECT value FROM metadata WHERE key = ?', (DATA_VERSION_KEY,)).fetchone()
+        bloom = BloomFilter.for_capacity(sum(counts.values()), error_rate, data_version=row[0] if row else None)
+        for kind, table in FILTER_TABLES.items():
+            for (form,) in conn.execute(f'SELECT form FROM {table}'):
+                if form:
+                    bloom.add(filter_key(kind, form))
+        conn.close()
+    else:
+        db = TursoDatabase(cache_size=0)
+        if not db.connect():
+            raise RuntimeError("Turso not available")
+        with db.stream():
+            counts = {}
+            for kind, table in FILTER_TABLES.items():
+                rows = db._execute(f'SELECT COUNT(*) FROM {table}')
+                counts[kind] = int(rows[0][0]) if rows else 0
+            bloom = BloomFilter.for_capacity(sum(counts.values()), error_rate,
+                                             data_version=db.get_metadata(DATA_VERSION_KEY))
+            for kind, table in FILTER_TABLES.items():
+                for form in _iter_turso_forms(db, table, page_size):
+                    bloom.add(filter_key(kind, form))
+        db.close()
+
+    bloom.save(output_path)
+    return bloom
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    replica = None
+    if '--from-replica' in args:
+        i = args.index('--from-replica')
+        replica = args[i + 1]
+        del args[i:i + 2]
+
+    command = args[0] if args else ''
+    if command == 'build':
+        path = args[1] if len(args) > 1 else FORM_FILTER_PATH
+        start = time.time()
+        bloom = build_form_filter(path, replica_path=replica)
+        print(f"Built {path}: {bloom.count} forms, {len(bloom.bits) / 1e6:.1f} MB, "
+              f"{bloom.num_hashes} hashes, data_version={bloom.data_version} "
+              f"in {time.time() - start:.1f}s")
+        if not bloom.data_version:
+            print("Warning: the database has no data_version, so clients will ignore this filter "
+                  "(upload_to_turso.py and migrate_form_keys.py set one when they write)")
+    elif command == 'check' and len(args) > 1:
+        bloom = BloomFilter.load(args[2] if len(args) > 2 else FORM_FILTER_PATH)
+        for kind in FILTER_TABLES:
+            print(f"{kind}: {'maybe' if bloom.might_contain(kind, args[1]) else 'no'}")
+    else:
+        print("Usage: python form_filter.py build [output.bloom] [--from-replica replica.db]")
+        print("       python form_filter.py check <form> [filter.bloom]")
+        sys.exit(1)
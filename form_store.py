@@ -0,0 +1,388 @@
+"""
+Memory-mapped compact store of attested forms
+
+Holds millions of (form -> lemma + grammatical features) entries in one
+read-only binary file per table instead of Python dicts. Forms are sorted
+by their UTF-8 bytes and found by binary search; lemmas and feature values
+are interned into string tables and each record is packed as a 32-bit
+lemma id plus one 16-bit code per feature. Because the file is mmap'ed,
+all worker processes share a single page-cached copy and opening it costs
+almost nothing.
+
+File layout (little-endian, sections 8-byte aligned):
+    header      magic, format, field count, section counts and offsets
+    lemmas      u32 offsets[n_lemmas + 1] + UTF-8 blob
+    values      u32 offsets[n_values + 1] + UTF-8 blob (first entries are field names)
+    forms       u32 offsets[n_forms + 1] + UTF-8 blob, sorted
+    starts      u32 first record index per form [n_forms + 1]
+    records     n_records x (u32 lemma id, u16 value code per field)
+
+Usage:
+    python form_store.py build --from-replica turso_replica.db [output_dir]
+    python form_store.py build --from-json [output_dir]
+    python form_store.py lookup <verb|noun|participle> <form> [store_dir]
+"""
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+FORM_STORE_DIR = os.getenv('FORM_STORE_DIR', os.path.dirname(os.path.abspath(__file__)))
+
+# kind -> (file name, feature fields in the order stored)
+STORE_KINDS = {
+    'verb': ('verb_forms.fstore', ('tense', 'voice', 'mood', 'dialect', 'person', 'number')),
+    'noun': ('noun_forms.fstore', ('gender', 'case', 'number')),
+    'participle': ('participle_forms.fstore', ('participle_type', 'suffix', 'gender', 'case', 'number')),
+}
+
+# Query per kind over a Turso-schema SQLite file (e.g. turso_replica.py output)
+BUILD_QUERIES = {
+    'verb': """
+        SELECT vf.form, vr.root, vf.tense, vf.voice, vf.mood, vf.dialect, vf.person, vf.number
+        FROM verb_forms vf
+        JOIN verb_roots vr ON vf.root_id = vr.root_id
+        ORDER BY vf.form, vf.rowid
+    """,
+    'noun': """
+        SELECT nf.form, ns.stem, ns.gender, nf.case_name, nf.number
+        FROM noun_forms nf
+        JOIN noun_stems ns ON nf.stem_id = ns.stem_id
+        ORDER BY nf.form, nf.rowid
+    """,
+    'participle': """
+        SELECT pf.form, vr.root, pf.participle_type, pf.suffix, pf.gender, pf.case_name, pf.number
+        FROM participle_forms pf
+        JOIN verb_roots vr ON pf.root_id = vr.root_id
+        ORDER BY pf.form, pf.rowid
+    """,
+}
+
+MAGIC = b'PKFS'
+FORMAT_VERSION = 1
+# magic, format, n_fields, n_lemmas, n_values, n_forms, n_records, then 5 section offsets
+HEADER = struct.Struct('<4sHHIIII5Q')
+NO_VALUE = 0xFFFF  # feature present with a null value
+ABSENT_CODE = 0xFFFE  # feature not present in the record's info dict
+ABSENT = object()  # pass as a feature value to leave it out of the info dict
+
+
+def _align(buf: bytearray):
+    """Pad a buffer to an 8-byte boundary"""
+    buf.extend(b'\0' * (-len(buf) % 8))
+
+
+def _pack_strings(strings: Sequence[bytes]) -> bytes:
+    """Pack strings as a u32 offsets array followed by the concatenated blob"""
+    offsets = array('I', [0])
+    total = 0
+    for s in strings:
+        total += len(s)
+        offsets.append(total)
+    if total >= 2 ** 32:
+        raise ValueError("String table too large for a form store")
+    out = bytearray(offsets.tobytes())
+    for s in strings:
+        out.extend(s)
+    return bytes(out)
+
+
+def build_form_store(path: str, fields: Sequence[str],
+                     rows: Iterable[Tuple[str, str, Sequence[Optional[str]]]]) -> Dict:
+    """
+    Write a form store file
+
+    Args:
+        path: Output file
+        fields: Names of the grammatical features stored per record
+        rows: (form, lemma, feature values) tuples sorted by form (UTF-8 byte order);
+              rows sharing a form become records of one entry. A value of ABSENT
+              leaves the feature out of the looked-up info dict
+
+    Returns:
+        Dict with 'forms', 'records', 'lemmas' and 'values' counts
+    """
+    lemma_ids = {}
+    value_ids = {name: i for i, name in enumerate(fields)}
+    form_blob = bytearray()
+    form_offsets = array('I', [0])
+    record_starts = array('I')
+    records = bytearray()
+    record_struct = struct.Struct('<I' + 'H' * len(fields))
+    n_records = 0
+    last_form = None
+
+    for form, lemma, values in rows:
+        form_bytes = form.encode('utf-8')
+        if form_bytes != last_form:
+            if last_form is not None and form_bytes < last_form:
+                raise ValueError(f"Rows are not sorted by form: {form!r}")
+            form_blob.extend(form_bytes)
+            form_offsets.append(len(form_blob))
+            record_starts.append(n_records)
+            last_form = form_bytes
+
+        lemma_id = lemma_ids.setdefault(lemma or '', len(lemma_ids))
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(NO_VALUE)
+            elif value is ABSENT:
+                codes.append(ABSENT_CODE)
+            else:
+                codes.append(value_ids.setdefault(str(value), len(value_ids)))
+        if len(value_ids) >= ABSENT_CODE:
+            raise ValueError("Too many distinct feature values for a form store")
+        records.extend(record_struct.pack(lemma_id, *codes))
+        n_records += 1
+
+    record_starts.append(n_records)
+    if len(form_blob) >= 2 ** 32:
+        raise ValueError("Form table too large for a form store")
+
+    sections = [
+        _pack_strings([s.encode('utf-8') for s in lemma_ids]),
+        _pack_strings([s.encode('utf-8') for s in value_ids]),
+        form_offsets.tobytes() + bytes(form_blob),
+        record_starts.tobytes(),
+        bytes(records),
+    ]
+    body = bytearray(HEADER.size)
+    _align(body)
+    offsets = []
+    for section in sections:
+        offsets.append(len(body))
+        body.extend(section)
+        _align(body)
+    body[:HEADER.size] = HEADER.pack(MAGIC, FORMAT_VERSION, len(fields), len(lemma_ids),
+                                     len(value_ids), len(form_offsets) - 1, n_records, *offsets)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+
+    return {'forms': len(form_offsets) - 1, 'records': n_records,
+            'lemmas': len(lemma_ids), 'values': len(value_ids) - len(fields)}
+
+
+class _StringTable:
+    """Read-only view of a packed string table inside the mapped file"""
+
+    def __init__(self, buf: memoryview, offset: int, count: int):
+        self.offsets = buf[offset:offset + 4 * (count + 1)].cast('I')
+        self.blob_start = offset + 4 * (count + 1)
+        self.buf = buf
+
+    def raw(self, i: int) -> bytes:
+        start = self.blob_start + self.offsets[i]
+        return bytes(self.buf[start:self.blob_start + self.offsets[i + 1]])
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode('utf-8')
+
+
+class FormStore:
+    """
+    Read-only, memory-mapped form store
+
+    Behaves like the dict indexes built by PrakritUnifiedParser.build_form_index:
+    get(form) returns a list of (lemma, form_info) tuples.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open store
+
+        Args:
+            path: Store file written by build_form_store()
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mm)
+
+        (magic, fmt, n_fields, n_lemmas, n_values, n_forms, n_records,
+         lemma_off, value_off, form_off, starts_off, records_off) = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Not a form store file: {path}")
+
+        self.n_forms = n_forms
+        self.n_records = n_records
+        self._lemmas = _StringTable(self._buf, lemma_off, n_lemmas)
+        self._values = _StringTable(self._buf, value_off, n_values)
+        self._forms = _StringTable(self._buf, form_off, n_forms)
+        self._starts = self._buf[starts_off:starts_off + 4 * (n_forms + 1)].cast('I')
+        self._records_off = records_off
+        self._record = struct.Struct('<I' + 'H' * n_fields)
+        self.fields = tuple(self._values[i] for i in range(n_fields))
+
+        # Feature values are few; decode them once
+        self._value_cache = [self._values[i] for i in range(n_values)]
+        self._lemma_cache = {}
+
+    def _find(self, form: str) -> int:
+        """Index of a form in the sorted table, or -1"""
+        key = form.encode('utf-8')
+        lo, hi = 0, self.n_forms
+        raw = self._forms.raw
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_forms and raw(lo) == key:
+            return lo
+        return -1
+
+    def _lemma(self, i: int) -> str:
+        lemma = self._lemma_cache.get(i)
+        if lemma is None:
+            lemma = self._lemmas[i]
+            self._lemma_cache[i] = lemma
+        return lemma
+
+    def get(self, form: str, default=None) -> Optional[List[Tuple[str, Dict]]]:
+        """
+        Look up a form
+
+        Args:
+            form: Surface form
+            default: Returned if the form is absent
+
+        Returns:
+            List of (lemma, form_info) tuples, or default
+        """
+        i = self._find(form)
+        if i < 0:
+            return default
+
+        results = []
+        values = self._value_cache
+        for r in range(self._starts[i], self._starts[i + 1]):
+            lemma_id, *codes = self._record.unpack_from(self._buf, self._records_off + r * self._record.size)
+            info = {field: (None if code == NO_VALUE else values[code])
+                    for field, code in zip(self.fields, codes) if code != ABSENT_CODE}
+            results.append((self._lemma(lemma_id), info))
+        return results
+
+    def __contains__(self, form: str) -> bool:
+        return self._find(form) >= 0
+
+    def __len__(self) -> int:
+        return self.n_forms
+
+    def close(self):
+        """Release the mapping"""
+        for name in ('_starts', '_forms', '_values', '_lemmas'):
+            view = getattr(self, name, None)
+            if isinstance(view, _StringTable):
+                view.offsets.release()
+            elif view is not None:
+                view.release()
+        self._buf.release()
+        self._mm.close()
+
+
+def store_path(kind: str, store_dir: str = FORM_STORE_DIR) -> str:
+    """Path of the store file for a kind ('verb', 'noun' or 'participle')"""
+    return os.path.join(store_dir, STORE_KINDS[kind][0])
+
+
+def load_form_store(kind: str, store_dir: str = FORM_STORE_DIR) -> Optional[FormStore]:
+    """Open the store for a kind if its file exists, else None"""
+    path = store_path(kind, store_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        return FormStore(path)
+    except Exception as e:
+        print(f"Warning: Could not open form store {path}: {e}")
+        return None
+
+
+def build_from_sqlite(db_path: str, output_dir: str = FORM_STORE_DIR) -> Dict[str, Dict]:
+    """Build all stores from a SQLite file with the Turso schema"""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    stats = {}
+    try:
+        for kind, (_, fields) in STORE_KINDS.items():
+            rows = ((row[0], row[1], row[2:]) for row in conn.execute(BUILD_QUERIES[kind]) if row[0])
+            stats[kind] = build_form_store(store_path(kind, output_dir), fields, rows)
+    finally:
+        conn.close()
+    return stats
+
+
+def build_from_json(source_dir: str, output_dir: str = FORM_STORE_DIR) -> Dict[str, Dict]:
+    """Build verb and noun stores from all_verb_forms.json / all_noun_forms.json"""
+    stats = {}
+    for kind, filename in (('verb', 'all_verb_forms.json'), ('noun', 'all_noun_forms.json')):
+        path = os.path.join(source_dir, filename)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            forms_by_lemma = json.load(f)
+
+        fields = list(STORE_KINDS[kind][1])
+        rows = []
+        for lemma, forms in forms_by_lemma.items():
+            if isinstance(forms, dict):
+                for form, info in forms.items():
+                    info = info if isinstance(info, dict) else {}
+                    for field in info:
+                        if field not in fields:
+                            fields.append(field)
+                    rows.append((form, lemma, info))
+            elif isinstance(forms, list):
+                for form in dict.fromkeys(forms):
+                    rows.append((form, lemma, {}))
+
+        rows.sort(key=lambda row: row[0].encode('utf-8'))
+        stats[kind] = build_form_store(
+            store_path(kind, output_dir), fields,
+            ((form, lemma, [info.get(field, ABSENT) for field in fields]) for form, lemma, info in rows)
+        )
+    return stats
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    command = args[0] if args else ''
+
+    if command == 'build' and '--from-replica' in args:
+        i = args.index('--from-replica')
+        db_path = args[i + 1]
+        rest = args[1:i] + args[i + 2:]
+        output_dir = rest[0] if rest else FORM_STORE_DIR
+        start = time.time()
+        for kind, kind_stats in build_from_sqlite(db_path, output_dir).items():
+            print(f"{kind}: {kind_stats}")
+        print(f"Done in {time.time() - start:.1f}s")
+    elif command == 'build' and '--from-json' in args:
+        rest = [a for a in args[1:] if a != '--from-json']
+        output_dir = rest[0] if rest else FORM_STORE_DIR
+        start = time.time()
+        for kind, kind_stats in build_from_json(os.path.dirname(os.path.abspath(__file__)), output_dir).items():
+            print(f"{kind}: {kind_stats}")
+        print(f"Done in {time.time() - start:.1f}s")
+    elif command == 'lookup' and len(args) > 2:
+        store = load_form_store(args[1], args[3] if len(args) > 3 else FORM_STORE_DIR)
+        if store is None:
+            print(f"No {args[1]} form store found")
+            sys.exit(1)
+        for lemma, info in store.get(args[2], []):
+            print(f"{lemma}: {info}")
+    else:
+        print("Usage: python form_store.py build --from-replica <replica.db> [output_dir]")
+        print("       python form_store.py build --from-json [output_dir]")
+        print("       python form_store.py lookup <verb|noun|participle> <form> [store_dir]")
+        sys.exit(1)
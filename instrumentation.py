@@ -0,0 +1,174 @@
+"""
+Per-stage latency instrumentation for the parser and the Turso client
+
+Code under measurement is wrapped in span('stage'). Each span is timed with
+time.perf_counter() and added to an in-memory histogram for its stage, so
+/api/timings can show where time goes across all requests. Inside
+collect_timings() the spans of the current request are also kept in order,
+which is what /api/parse?debug=timing returns.
+
+The active collector lives in a context variable, so concurrent requests
+(threads or asyncio tasks) never see each other's spans.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Aggregate every span into the stage histograms (PARSE_TIMING=0 disables;
+# ?debug=timing still works)
+PARSE_TIMING = os.getenv('PARSE_TIMING', '1') != '0'
+
+# Histogram bucket upper bounds in seconds (100 µs to 10 s)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Spans of the current request, set by collect_timings()
+_collector: ContextVar[Optional[List]] = ContextVar('timing_collector', default=None)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed buckets, sum, count and max"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initialize histogram
+
+        Args:
+            buckets: Increasing bucket upper bounds; values above the last
+                one fall into an implicit +Inf bucket
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Add one observation"""
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def cumulative(self) -> List[int]:
+        """Observations <= each bucket bound, plus the total (+Inf) last"""
+        with self._lock:
+            counts = list(self.counts)
+        total = 0
+        cumulative = []
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, capped at the maximum"""
+        cumulative = self.cumulative()
+        if not cumulative[-1]:
+            return 0.0
+        rank = q * cumulative[-1]
+        for bound, count in zip(self.buckets, cumulative):
+            if count >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict:
+        """Count, sum, mean, max and approximate percentiles, in milliseconds"""
+        with self._lock:
+            count, total, maximum = self.count, self.sum, self.max
+        return {
+            'count': count,
+            'total_ms': round(total * 1000, 3),
+            'mean_ms': round(total / count * 1000, 3) if count else 0.0,
+            'max_ms': round(maximum * 1000, 3),
+            'p50_ms': round(self.quantile(0.5) * 1000, 3),
+            'p90_ms': round(self.quantile(0.9) * 1000, 3),
+            'p99_ms': round(self.quantile(0.99) * 1000, 3),
+        }
+
+
+STAGE_HISTOGRAMS: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _histogram(stage: str) -> Histogram:
+    """Get or create the histogram of a stage"""
+    histogram = STAGE_HISTOGRAMS.get(stage)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = STAGE_HISTOGRAMS.setdefault(stage, Histogram())
+    return histogram
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    Time the enclosed block as one span of the given stage
+
+    Does nothing (beyond one context variable read) when aggregation is
+    disabled and no collector is active.
+    """
+    collector = _collector.get()
+    if collector is None and not PARSE_TIMING:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if PARSE_TIMING:
+            _histogram(stage).observe(elapsed)
+        if collector is not None:
+            collector.append((stage, start, elapsed))
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict]:
+    """
+    Collect the spans of the enclosed block
+
+    Yields a dict that is filled in when the block exits:
+    'total_ms', 'stages' (milliseconds summed per stage) and 'spans'
+    (each span in start order with its offset from the block's start).
+    """
+    timings = {}
+    spans = []
+    token = _collector.set(spans)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        total = time.perf_counter() - start
+        _collector.reset(token)
+
+        stages = {}
+        for stage, _, elapsed in spans:
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+        timings['total_ms'] = round(total * 1000, 3)
+        timings['stages'] = {stage: round(elapsed * 1000, 3) for stage, elapsed in stages.items()}
+        timings['spans'] = [
+            {'stage': stage, 'start_ms': round((span_start - start) * 1000, 3), 'ms': round(elapsed * 1000, 3)}
+            for stage, span_start, elapsed in sorted(spans, key=lambda s: s[1])
+        ]
+
+
+def stage_stats() -> Dict[str, Dict]:
+    """Histogram summary of every stage seen so far"""
+    return {stage: histogram.snapshot() for stage, histogram in sorted(STAGE_HISTOGRAMS.items())}
+
+
+def reset_stage_stats():
+    """Forget all aggregated spans"""
+    with _histograms_lock:
+        STAGE_HISTOGRAMS.clear()
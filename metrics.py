@@ -0,0 +1,214 @@
+"""
+Prometheus metrics for the parser API and the Turso client
+
+Counters and histograms live in memory (per process) and are rendered in
+the Prometheus text exposition format, version 0.0.4, which the Flask app
+serves at /metrics. Cache and data source state is read from the parser
+at scrape time.
+"""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from instrumentation import LATENCY_BUCKETS, Histogram
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bucket upper bounds for the number of analyses found per word
+ANALYSES_BUCKETS = (0, 1, 2, 3, 5, 8, 10, 15, 20, 30, 50)
+
+# Values of PrakritUnifiedParser.data_source, exported as one 0/1 gauge each
+DATA_SOURCES = ('turso', 'replica', 'local_json', 'none')
+
+# Table named in a statement's FROM clause
+SQL_TABLE = re.compile(r'\bFROM\s+(\w+)', re.IGNORECASE)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    """Render a {name="value",...} label set (empty string if no labels)"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    """Render a sample value or bucket bound"""
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter family keyed by label values"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        """Add amount to the counter with the given label values"""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        """Exposition lines of every labeled counter"""
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield f'{self.name}{_labels(self.labels, label_values)} {_number(value)}'
+
+
+class HistogramFamily:
+    """Histogram family keyed by label values"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        """Add one observation to the histogram with the given label values"""
+        histogram = self._histograms.get(label_values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(label_values, Histogram(self.buckets))
+        histogram.observe(value)
+
+    def samples(self) -> Iterator[str]:
+        """Exposition lines (buckets, sum, count) of every labeled histogram"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        for label_values, histogram in histograms:
+            cumulative = histogram.cumulative()
+            for bound, count in zip(self.buckets + (float('inf'),), cumulative):
+                labels = _labels(self.labels, label_values, f'le="{_number(bound)}"')
+                yield f'{self.name}_bucket{labels} {count}'
+            labels = _labels(self.labels, label_values)
+            yield f'{self.name}_sum{labels} {_number(histogram.sum)}'
+            yield f'{self.name}_count{labels} {cumulative[-1]}'
+
+
+HTTP_REQUESTS = Counter(
+    'prakrit_http_requests_total', 'HTTP requests by endpoint, method and status code',
+    ('endpoint', 'method', 'status'))
+HTTP_REQUEST_SECONDS = HistogramFamily(
+    'prakrit_http_request_duration_seconds', 'Time to serve the HTTP response, body included, by endpoint',
+    ('endpoint',))
+TURSO_QUERIES = Counter(
+    'prakrit_turso_queries_total', 'SQL statements sent to Turso, by table', ('table',))
+TURSO_REQUEST_SECONDS = HistogramFamily(
+    'prakrit_turso_request_duration_seconds', 'Turso pipeline request latency, by table queried',
+    ('table',))
+TURSO_ERRORS = Counter(
+    'prakrit_turso_errors_total', 'Failed Turso statements by table and kind (error or timeout)',
+    ('table', 'kind'))
+ANALYSES_PER_WORD = HistogramFamily(
+    'prakrit_analyses_per_word', 'Analyses found per analyzed word', buckets=ANALYSES_BUCKETS)
+
+METRICS = (HTTP_REQUESTS, HTTP_REQUEST_SECONDS, TURSO_QUERIES, TURSO_REQUEST_SECONDS,
+           TURSO_ERRORS, ANALYSES_PER_WORD)
+
+
+@lru_cache(maxsize=256)
+def sql_table(sql: str) -> str:
+    """Table a statement reads from ('none' for e.g. SELECT 1)"""
+    match = SQL_TABLE.search(sql)
+    return match.group(1) if match else 'none'
+
+
+def record_turso_request(statements: List[Tuple[str, Optional[List]]], rows: List[Optional[List]],
+                         seconds: float, error_kind: str = 'error'):
+    """
+    Record one Turso pipeline request
+
+    Args:
+        statements: (sql, args) tuples that were sent
+        rows: Result per statement; None marks a failed statement
+        seconds: Request latency
+        error_kind: Label for failed statements ('error' or 'timeout')
+    """
+    tables = set()
+    for (sql, _), result in zip(statements, rows):
+        table = sql_table(sql)
+        tables.add(table)
+        TURSO_QUERIES.inc(table)
+        if result is None:
+            TURSO_ERRORS.inc(table, error_kind)
+    for table in tables:
+        TURSO_REQUEST_SECONDS.observe(seconds, table)
+
+
+def _cache_samples(caches: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Samples of the cache gauges/counters from PrakritUnifiedParser.cache_stats()"""
+    samples = {'prakrit_cache_hit_ratio': [], 'prakrit_cache_hits_total': [],
+               'prakrit_cache_misses_total': [], 'prakrit_cache_entries': []}
+    for cache, stats in sorted(caches.items()):
+        if not stats.get('enabled'):
+            continue
+        labels = _labels(('cache',), (cache,))
+        samples['prakrit_cache_hit_ratio'].append(f'prakrit_cache_hit_ratio{labels} {_number(stats["hit_ratio"])}')
+        samples['prakrit_cache_hits_total'].append(f'prakrit_cache_hits_total{labels} {stats["hits"]}')
+        samples['prakrit_cache_misses_total'].append(f'prakrit_cache_misses_total{labels} {stats["misses"]}')
+        samples['prakrit_cache_entries'].append(f'prakrit_cache_entries{labels} {stats["size"]}')
+    return samples
+
+
+PARSER_METRICS = (
+    ('prakrit_cache_hit_ratio', 'gauge', 'Hit ratio of each lookup/parse cache since start'),
+    ('prakrit_cache_hits_total', 'counter', 'Cache hits'),
+    ('prakrit_cache_misses_total', 'counter', 'Cache misses'),
+    ('prakrit_cache_entries', 'gauge', 'Entries currently cached'),
+    ('prakrit_data_source', 'gauge', 'Data source in use (1) among the possible ones'),
+)
+
+
+def render(parser=None) -> str:
+    """
+    Render all metrics in the Prometheus text format
+
+    Args:
+        parser: PrakritUnifiedParser whose caches and data source are
+            exported (nothing is loaded to do so)
+
+    Returns:
+        Exposition text
+    """
+    lines = []
+    for metric in METRICS:
+        lines.append(f'# HELP {metric.name} {metric.help_text}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.samples())
+
+    if parser is not None:
+        samples = _cache_samples(parser.cache_stats())
+        samples['prakrit_data_source'] = [
+            f'prakrit_data_source{_labels(("source",), (source,))} {int(parser.data_source == source)}'
+            for source in DATA_SOURCES
+        ]
+        for name, kind, help_text in PARSER_METRICS:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples[name])
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,159 @@
+"""
+Add nasal-normalized lookup keys to the form tables and the dictionary
+
+Adds an indexed form_key column (devanagari_transliterator.nasal_key of the
+form) to verb_forms, noun_forms and participle_forms in Turso, backfills it
+over a single Hrana stream, and then sets the 'form_key' metadata flag (and
+a new 'data_version' if any row changed).
+Clients that see the flag when they connect look up all nasal spellings of
+a word with one exact-key query per table. The local dictionary database
+gets a headword_key column the same way.
+
+Requires a read-write TURSO_AUTH_TOKEN. Re-running is safe: rows whose key is
+already correct are left alone, so an interrupted backfill can be resumed.
+
+Usage:
+    python migrate_form_keys.py turso
+    python migrate_form_keys.py dictionary [prakrit-dict.db]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, Optional
+
+from devanagari_transliterator import nasal_key
+from turso_db import FORM_KEY_FLAG, TursoDatabase
+
+FORM_KEY_TABLES = ('verb_forms', 'noun_forms', 'participle_forms')
+# Rows read per request, and UPDATE statements sent per pipeline request
+PAGE_SIZE = 5000
+UPDATE_BATCH_SIZE = 500
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prakrit-dict.db')
+
+
+def migrate_turso(db: Optional[TursoDatabase] = None, page_size: int = PAGE_SIZE) -> Dict:
+    """
+    Add, backfill and index form_key in the Turso form tables
+
+    Args:
+        db: TursoDatabase with a read-write token (a new one is created if omitted)
+        page_size: Rows read per request
+
+    Returns:
+        Dict with 'status' ('migrated' or 'error') and per-table 'updated' row counts
+    """
+    db = db or TursoDatabase()
+    if not db.connect():
+        return {'status': 'error', 'error': 'Turso not available'}
+
+    updated = {}
+    with db.stream():
+        for table in FORM_KEY_TABLES:
+            columns = db._execute(f'PRAGMA table_info({table})')
+            if columns is None:
+                return {'status': 'error', 'error': f'Cannot read schema of {table}', 'updated': updated}
+            if not any(row[1] == 'form_key' for row in columns):
+                if db._execute(f'ALTER TABLE {table} ADD COLUMN form_key TEXT') is None:
+                    return {'status': 'error', 'error': f'Cannot add form_key to {table}', 'updated': updated}
+
+            updated[table] = 0
+            last_id = 0
+            while True:
+                rows = db._execute(
+                    f'SELECT rowid, form, form_key FROM {table} '
+                    f'WHERE rowid > CAST(? AS INTEGER) ORDER BY rowid LIMIT {int(page_size)}',
+                    [last_id]
+                )
+                if rows is None:
+                    return {'status': 'error', 'error': f'Failed to read {table}', 'updated': updated}
+                if not rows:
+                    break
+
+                statements = []
+                for rowid, form, current_key in rows:
+                    if form is None:
+                        continue
+                    key = nasal_key(form)
+                    if key != current_key:
+                        statements.append((f'UPDATE {table} SET form_key = ? WHERE rowid = CAST(? AS INTEGER)',
+                                           [key, rowid]))
+
+                for i in range(0, len(statements), UPDATE_BATCH_SIZE):
+                    results = db._execute_many(statements[i:i + UPDATE_BATCH_SIZE])
+                    if any(result is None for result in results):
+                        return {'status': 'error', 'error': f'Failed to update {table}', 'updated': updated}
+
+                updated[table] += len(statements)
+                last_id = int(rows[-1][0])
+                sys.stdout.write(f"\r  {table}: scanned to rowid {last_id}, updated {updated[table]}")
+                sys.stdout.flush()
+                if len(rows) < page_size:
+                    break
+            print()
+
+            if db._execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_form_key ON {table}(form_key)') is None:
+                return {'status': 'error', 'error': f'Cannot index {table}.form_key', 'updated': updated}
+
+        # Only advertise the column once every table is backfilled and indexed
+        if db._execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)', [FORM_KEY_FLAG, '1']) is None:
+            return {'status': 'error', 'error': 'Cannot set form_key metadata flag', 'updated': updated}
+
+        # The tables were written to: invalidate filters, snapshots and replicas
+        if any(updated.values()) and db.bump_data_version() is None:
+            return {'status': 'error', 'error': 'Cannot update metadata data_version', 'updated': updated}
+
+    return {'status': 'migrated', 'updated': updated}
+
+
+def migrate_dictionary(path: str = DICTIONARY_PATH) -> int:
+    """
+    Add, backfill and index headword_key in the local dictionary database
+
+    Args:
+        path: Dictionary SQLite file
+
+    Returns:
+        Number of entries keyed
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.create_function('nasal_key', 1, nasal_key, deterministic=True)
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(dictionary)')}
+        if 'headword_key' not in columns:
+            conn.execute('ALTER TABLE dictionary ADD COLUMN headword_key TEXT')
+        cursor = conn.execute('UPDATE dictionary SET headword_key = nasal_key(headword_translit) '
+                              'WHERE headword_translit IS NOT NULL')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_dictionary_headword_key ON dictionary(headword_key)')
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    command = args[0] if args else ''
+    start = time.time()
+
+    if command == 'turso':
+        result = migrate_turso()
+        print(f"Turso form keys: {result['status']} in {time.time() - start:.1f}s")
+        for table, count in result.get('updated', {}).items():
+            print(f"  {table}: {count} rows updated")
+        if result['status'] == 'error':
+            print(f"Error: {result.get('error')}")
+            sys.exit(1)
+    elif command == 'dictionary':
+        path = args[1] if len(args) > 1 else DICTIONARY_PATH
+        if not os.path.exists(path):
+            print(f"Dictionary database not found: {path}")
+            sys.exit(1)
+        count = migrate_dictionary(path)
+        print(f"Dictionary {path}: {count} headwords keyed in {time.time() - start:.1f}s")
+    else:
+        print("Usage: python migrate_form_keys.py turso")
+        print("       python migrate_form_keys.py dictionary [prakrit-dict.db]")
+        sys.exit(1)
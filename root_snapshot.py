@@ -0,0 +1,161 @@
+"""
+Precomputed snapshot of the Turso verb roots
+
+Downloading all verb roots (SELECT DISTINCT root FROM verb_roots) is the
+biggest cost of connecting to Turso at startup. The snapshot stores the
+roots as a frozenset together with their prefix trie, marshalled into one
+small file next to the code, so a process can install them in milliseconds.
+It records the Turso metadata 'data_version' it was built from; the parser
+installs the snapshot before connecting, then compares that version with
+the one read on connect (in a background thread) and re-downloads the roots
+when they differ or either is unknown.
+
+Usage:
+    python root_snapshot.py build [output.snapshot] [--from-replica replica.db]
+    python root_snapshot.py info [verb_roots.snapshot]
+"""
+
+import marshal
+import os
+import sys
+import time
+from typing import NamedTuple, Optional
+
+from affix_tries import PrefixTrie
+
+ROOT_SNAPSHOT_PATH = os.getenv('ROOT_SNAPSHOT_PATH',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'verb_roots.snapshot'))
+
+MAGIC = b'PKRS'
+FORMAT_VERSION = 1
+
+
+class RootSnapshot(NamedTuple):
+    """Verb roots loaded from a snapshot file"""
+    roots: frozenset
+    trie: PrefixTrie
+    data_version: Optional[str]
+    created_at: float
+
+
+def save_root_snapshot(roots, data_version: Optional[str], path: str = ROOT_SNAPSHOT_PATH) -> int:
+    """
+    Write a root snapshot (atomically, via a temporary file)
+
+    Args:
+        roots: Verb roots in HK transliteration
+        data_version: Turso data_version the roots were read at
+        path: Output file
+
+    Returns:
+        Number of roots written
+    """
+    roots = frozenset(root for root in roots if root)
+    trie = PrefixTrie(roots)
+    payload = {
+        'format': FORMAT_VERSION,
+        'data_version': data_version,
+        'created_at': time.time(),
+        'roots': roots,
+        'trie': trie.root,
+        'trie_size': len(trie),
+    }
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(marshal.dumps(payload))
+    os.replace(tmp_path, path)
+    return len(roots)
+
+
+def load_root_snapshot(path: str = ROOT_SNAPSHOT_PATH) -> Optional[RootSnapshot]:
+    """
+    Load a root snapshot
+
+    Returns:
+        RootSnapshot, or None if the file is missing, unreadable or was
+        written in another format (or by an incompatible Python)
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            return None
+        payload = marshal.loads(data[len(MAGIC):])
+        if payload.get('format') != FORMAT_VERSION or not payload.get('roots'):
+            return None
+        return RootSnapshot(
+            roots=payload['roots'],
+            trie=PrefixTrie.from_nodes(payload['trie'], payload['trie_size']),
+            data_version=payload.get('data_version'),
+            created_at=payload.get('created_at', 0.0),
+        )
+    except (OSError, ValueError, EOFError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def build_root_snapshot(path: str = ROOT_SNAPSHOT_PATH, source=None) -> dict:
+    """
+    Build a snapshot from Turso (or another database with the same interface)
+
+    Args:
+        path: Output file
+        source: Object with load_verb_roots() and get_metadata(), e.g. a
+            ReplicaDatabase; a TursoDatabase is created if omitted
+
+    Returns:
+        Dict with 'status' ('built' or 'error'), 'roots' and 'data_version'
+    """
+    if source is None:
+        from turso_db import TursoDatabase
+        source = TursoDatabase()
+        if not source.connect():
+            return {'status': 'error', 'error': 'Turso not available'}
+
+    from turso_db import DATA_VERSION_KEY
+    data_version = source.get_metadata(DATA_VERSION_KEY)
+    roots = source.load_verb_roots()
+    if not roots:
+        return {'status': 'error', 'error': 'No verb roots found'}
+
+    count = save_root_snapshot(roots, data_version, path)
+    return {'status': 'built', 'roots': count, 'data_version': data_version}
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    command = args[0] if args else 'info'
+
+    if command == 'build':
+        source = None
+        if '--from-replica' in args:
+            i = args.index('--from-replica')
+            from turso_replica import ReplicaDatabase
+            source = ReplicaDatabase(args[i + 1])
+            args = args[:i] + args[i + 2:]
+        path = args[1] if len(args) > 1 else ROOT_SNAPSHOT_PATH
+        start = time.time()
+        result = build_root_snapshot(path, source)
+        if result['status'] == 'error':
+            print(f"Error: {result['error']}")
+            sys.exit(1)
+        print(f"Wrote {result['roots']} roots (data_version {result['data_version']}) "
+              f"to {path} in {time.time() - start:.1f}s")
+    elif command == 'info':
+        path = args[1] if len(args) > 1 else ROOT_SNAPSHOT_PATH
+        start = time.perf_counter()
+        snapshot = load_root_snapshot(path)
+        elapsed = time.perf_counter() - start
+        if snapshot is None:
+            print(f"No usable root snapshot at {path}")
+            sys.exit(1)
+        print(f"Root snapshot {path}:")
+        print(f"  roots: {len(snapshot.roots)}")
+        print(f"  data_version: {snapshot.data_version}")
+        print(f"  created_at: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot.created_at))}")
+        print(f"  load time: {elapsed * 1000:.1f} ms")
+    else:
+        print("Usage: python root_snapshot.py build [output.snapshot] [--from-replica replica.db]")
+        print("       python root_snapshot.py info [verb_roots.snapshot]")
+        sys.exit(1)
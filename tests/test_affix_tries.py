@@ -0,0 +1,37 @@
+"""
+Tests for affix_tries
+
+Run with: python -m pytest tests
+"""
+
+import random
+
+from affix_tries import SuffixTrie, compile_suffix_table
+
+TABLES = [
+    compile_suffix_table({'o': {'priority': 5}, 'Ao': {'priority': 8}, 'hinto': {'priority': 9},
+                          'ssa': {'priority': 7}, 'a': {'priority': 1}, '': {'priority': 0}}, 'noun'),
+    compile_suffix_table({'i': {'priority': 3}, 'ai': {'priority': 3}, 'di': {'priority': 4},
+                          'edi': {'priority': 6}, 'nti': {'priority': 6}, 'Mti': {'priority': 6}}, 'verb'),
+]
+
+
+def test_path_matches_equal_sorted_walk():
+    trie = SuffixTrie.from_tables(TABLES)
+    rng = random.Random(0)
+    words = [''.join(rng.choice('aAiodeMnthsSo') for _ in range(rng.randint(0, 7))) for _ in range(2000)]
+    words += ['devassa', 'mAlAo', 'karedi', 'kareMti', 'muNIhinto', '']
+    for word in words:
+        for table in TABLES:
+            found = trie.matches(word, table.name)
+            assert trie.ranked_matches(word, table.name) == tuple(sorted(found, key=lambda e: e.rank))
+            assert trie.ordered_matches(word, table.name) == tuple(sorted(found, key=lambda e: e.index))
+            assert list(trie.ranked_matches(word, table.name)) == [
+                e for e in table.ranked if word.endswith(e.suffix)]
+
+
+def test_add_after_build_reindexes():
+    trie = SuffixTrie.from_tables(TABLES)
+    entry = compile_suffix_table({'Ni': {'priority': 9}}, 'verb').ranked[0]
+    trie.add('Ni', 'verb', entry)
+    assert entry in trie.ranked_matches('jANi', 'verb')
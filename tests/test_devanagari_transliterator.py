@@ -0,0 +1,168 @@
+"""
+Tests for devanagari_transliterator
+
+Run with: python -m pytest tests
+"""
+
+import random
+
+import pytest
+
+from devanagari_transliterator import (
+    CONSONANTS, DIGITS, PASSTHROUGH, SPECIAL, VOWEL_SIGNS, VOWELS,
+    _tokens_to_hk, _translate_to_hk, detect_scheme, devanagari_to_hk, devanagari_to_hk_many,
+    hk_to_devanagari, scheme_to_hk,
+)
+
+
+def devanagari_to_hk_reference(text: str) -> str:
+    """
+    The original character-by-character devanagari_to_hk(), which the
+    table-driven versions must match
+
+    Args:
+        text: Devanagari text
+
+    Returns:
+        Harvard-Kyoto transliteration
+    """
+    result = []
+    i = 0
+
+    while i < len(text):
+        char = text[i]
+
+        # Skip whitespace and punctuation
+        if char in ' \t\n.,;:!?()-[]{}':
+            result.append(char)
+            i += 1
+            continue
+
+        # Check for standalone vowels
+        if char in VOWELS:
+            result.append(VOWELS[char])
+            i += 1
+            continue
+
+        # Check for consonants
+        if char in CONSONANTS:
+            result.append(CONSONANTS[char])
+
+            # Check for following vowel sign
+            if i + 1 < len(text):
+                next_char = text[i + 1]
+
+                # Halanta (virama) - no vowel
+                if next_char == '्':
+                    i += 2  # Skip both consonant and virama
+                    continue
+
+                # Vowel sign
+                elif next_char in VOWEL_SIGNS:
+                    result.append(VOWEL_SIGNS[next_char])
+                    i += 2  # Skip both consonant and vowel sign
+                    continue
+
+                # Anusvara, Visarga, Candrabindu
+                elif next_char in SPECIAL:
+                    result.append('a')  # Inherent 'a'
+                    result.append(SPECIAL[next_char])
+                    i += 2
+                    continue
+
+            # No following vowel sign = inherent 'a'
+            result.append('a')
+            i += 1
+            continue
+
+        # Special characters (anusvara, visarga, etc.)
+        if char in SPECIAL:
+            result.append(SPECIAL[char])
+            i += 1
+            continue
+
+        # Digits
+        if char in DIGITS:
+            result.append(DIGITS[char])
+            i += 1
+            continue
+
+        # Unknown character - skip
+        i += 1
+
+    return ''.join(result)
+
+
+def random_texts(count: int, seed: int = 0):
+    """Random strings of Devanagari, punctuation and stray characters"""
+    rng = random.Random(seed)
+    alphabet = [chr(c) for c in range(0x0900, 0x0980)] + list(PASSTHROUGH) + ['x', '|', '\ue000', '\n']
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+WORDS = [
+    ('पुच्छिस्संति', 'pucchissaMti'),
+    ('मुणिन्ति', 'muNinti'),
+    ('जाणिन्ति', 'jANinti'),
+    ('मुणीहिंतो', 'muNIhiMto'),
+    ('नेमो', 'nemo'),
+    ('भवति', 'bhavati'),
+]
+
+
+@pytest.mark.parametrize('dev, hk', WORDS)
+def test_devanagari_to_hk(dev, hk):
+    assert devanagari_to_hk(dev) == hk
+
+
+@pytest.mark.parametrize('dev, hk', WORDS)
+def test_hk_to_devanagari(dev, hk):
+    assert hk_to_devanagari(hk) == dev
+
+
+def test_conversions_match_reference():
+    for text in random_texts(20000):
+        expected = devanagari_to_hk_reference(text)
+        assert _tokens_to_hk(text) == expected, text
+        assert _translate_to_hk(text) == expected, text
+
+
+def test_every_character_and_pair_matches_reference():
+    chars = list(VOWELS) + list(CONSONANTS) + list(VOWEL_SIGNS) + list(SPECIAL) + list(DIGITS) + ['x', ' ']
+    for first in chars:
+        for second in chars:
+            text = first + second
+            assert devanagari_to_hk(text) == devanagari_to_hk_reference(text), text
+
+
+def test_many_matches_single_conversion():
+    texts = random_texts(2000, seed=1) + ['भवति', 'भवति', '', 'क\nि', 'क\ue000ि']
+    assert devanagari_to_hk_many(texts) == [devanagari_to_hk_reference(text) for text in texts]
+    assert devanagari_to_hk_many([]) == []
+
+
+@pytest.mark.parametrize('text, scheme, hk', [
+    ('muṇinti', 'IAST', 'muNinti'),
+    ('pucchissaṃti', 'IAST', 'pucchissaMti'),
+    ('kēśa', 'ISO-15919', 'keza'),
+    ('saYjamo', 'SLP1', 'saJjamo'),
+    ('Bavati', 'SLP1', 'bhavati'),
+    ('pucCamARo', 'SLP1', 'pucchamANo'),
+    ('Kalu', 'SLP1', 'khalu'),
+    ('mu.niihi.mto', 'Velthuis', 'muNIhiMto'),
+    ('jANaMti', 'HK', 'jANaMti'),
+])
+def test_scheme_detection_and_conversion(text, scheme, hk):
+    assert detect_scheme(text) == scheme
+    assert scheme_to_hk(text) == hk
+
+
+@pytest.mark.parametrize('text', [
+    # Capitalized HK: an SLP1 letter next to HK-only sequences, or only SLP1 vowels
+    'Ogha', 'PaNo', 'Bhavati', 'Khalu', 'x', 'X', 'Eso', 'kfta',
+    # Mixed case HK
+    'jANaMti', 'muNIhiMto', 'vaNNo', 'pucchamANo', 'DhammaM', 'ThANa',
+])
+def test_hk_words_stay_hk(text):
+    assert detect_scheme(text) == 'HK'
+    assert scheme_to_hk(text) == text
@@ -0,0 +1,170 @@
+"""
+Tests for turso_replica
+
+Run with: python -m pytest tests
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+from devanagari_transliterator import nasal_key
+from turso_db import DATA_VERSION_KEY
+from turso_replica import REPLICA_TABLES, ReplicaDatabase, sync_replica
+
+
+class SQLiteRemote:
+    """
+    Stand-in for TursoDatabase serving the replicated tables from an
+    in-memory SQLite database
+
+    Fetches whose call number is in fail_on return None, like a failed
+    Hrana request.
+    """
+
+    def __init__(self, fail_on=()):
+        self.connected = True
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self.db = sqlite3.connect(':memory:')
+        for table, columns in REPLICA_TABLES.items():
+            self.db.execute(f'CREATE TABLE {table} ({", ".join(columns)})')
+        self.db.execute('CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)')
+
+    @contextmanager
+    def stream(self):
+        yield self
+
+    def get_metadata(self, key):
+        row = self.db.execute('SELECT value FROM metadata WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _execute(self, sql, args=None):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            return None
+        return [list(row) for row in self.db.execute(sql, args or [])]
+
+
+def add_verb_forms(remote, forms, version):
+    remote.db.executemany(
+        'INSERT INTO verb_forms (root_id, form, tense, voice, mood, dialect, person, number) '
+        "VALUES (1, ?, 'present', 'active', 'indicative', NULL, 'third', 'singular')",
+        [(form,) for form in forms]
+    )
+    remote.db.execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
+                      (DATA_VERSION_KEY, version))
+
+
+def test_sync_keys_rows_from_an_interrupted_sync(tmp_path):
+    path = str(tmp_path / 'replica.db')
+    forms = [f'kare{i}di' for i in range(12)] + ['karedi']
+    remote = SQLiteRemote()
+    remote.db.execute("INSERT INTO verb_roots (root_id, root) VALUES (1, 'kara')")
+    add_verb_forms(remote, forms, 'v1')
+
+    # Fetch 1 is verb_roots, 2 the first verb_forms page, 3 the second
+    remote.fail_on = {3}
+    assert sync_replica(path, remote, page_size=5)['status'] == 'error'
+
+    remote.fail_on = set()
+    assert sync_replica(path, remote, page_size=5)['status'] == 'synced'
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute('SELECT form, form_key FROM verb_forms').fetchall()
+    conn.close()
+    assert len(rows) == len(forms)
+    assert all(key == nasal_key(form) for form, key in rows)
+
+    replica = ReplicaDatabase(path)
+    assert [root for root, _ in replica.check_verb_form('karedi')] == ['kara']
+    assert replica.check_verb_form('kare0di')
+
+
+def test_schema_repairs_unkeyed_rows(tmp_path):
+    path = str(tmp_path / 'replica.db')
+    remote = SQLiteRemote()
+    remote.db.execute("INSERT INTO verb_roots (root_id, root) VALUES (1, 'gam')")
+    add_verb_forms(remote, ['gacchaMti'], 'v1')
+    sync_replica(path, remote)
+
+    conn = sqlite3.connect(path)
+    conn.execute('UPDATE verb_forms SET form_key = NULL')
+    conn.commit()
+    conn.close()
+
+    add_verb_forms(remote, ['gacchadi'], 'v2')
+    sync_replica(path, remote)
+
+    replica = ReplicaDatabase(path)
+    assert replica.check_verb_form('gacchaMti')
+    assert replica.check_verb_form('gacchanti')
+
+
+def replica_parser(path):
+    """A lazily loaded parser serving from the replica at path"""
+    from unified_parser import PrakritUnifiedParser
+
+    parser = PrakritUnifiedParser(lazy=True)
+    parser.turso_db = ReplicaDatabase(path)
+    parser.set_verb_roots(parser.turso_db.load_verb_roots())
+    parser.data_source = 'replica'
+    parser.all_verb_forms, parser.all_noun_forms, parser.all_participle_forms = {}, {}, {}
+    parser.verb_form_index, parser.noun_form_index, parser.participle_form_index = {}, {}, {}
+    parser.load_times['data'] = 0.0
+    return parser
+
+
+def attested_roots(result):
+    return [a['root'] for a in result['analyses'] if a.get('source') == 'attested_form']
+
+
+def test_replica_sync_invalidates_memoized_parses(tmp_path):
+    path = str(tmp_path / 'replica.db')
+    remote = SQLiteRemote()
+    remote.db.execute("INSERT INTO verb_roots (root_id, root) VALUES (1, 'kara')")
+    add_verb_forms(remote, ['karedi'], 'v1')
+    sync_replica(path, remote)
+    parser = replica_parser(path)
+    assert attested_roots(parser.parse('karedi')) == ['kara']
+    assert attested_roots(parser.parse('kareMti')) == []
+
+    add_verb_forms(remote, ['kareMti'], 'v2')
+    result = sync_replica(path, remote)
+    assert result['status'] == 'synced'
+    parser.on_replica_synced(result)
+
+    assert parser.data_version == 'v2'
+    assert attested_roots(parser.parse('kareMti')) == ['kara']
+
+
+def test_parse_cache_is_keyed_on_data_version(tmp_path):
+    path = str(tmp_path / 'replica.db')
+    remote = SQLiteRemote()
+    remote.db.execute("INSERT INTO verb_roots (root_id, root) VALUES (1, 'kara')")
+    add_verb_forms(remote, ['karedi'], 'v1')
+    sync_replica(path, remote)
+    parser = replica_parser(path)
+    assert attested_roots(parser.parse('kareMti')) == []
+
+    add_verb_forms(remote, ['kareMti'], 'v2')
+    sync_replica(path, remote)
+    parser.turso_db.data_version = 'v2'
+
+    assert attested_roots(parser.parse('kareMti')) == ['kara']
+
+
+def test_replica_sync_installs_new_verb_roots(tmp_path):
+    path = str(tmp_path / 'replica.db')
+    remote = SQLiteRemote()
+    remote.db.execute("INSERT INTO verb_roots (root_id, root) VALUES (1, 'kara')")
+    add_verb_forms(remote, ['karedi'], 'v1')
+    sync_replica(path, remote)
+    parser = replica_parser(path)
+    assert 'pucch' not in parser.verb_roots
+
+    remote.db.execute("INSERT INTO verb_roots (root_id, root) VALUES (2, 'pucch')")
+    add_verb_forms(remote, [], 'v2')
+    parser.on_replica_synced(sync_replica(path, remote))
+
+    assert 'pucch' in parser.verb_roots
+    assert len('pucch') in parser.root_trie.prefix_lengths('pucchai')
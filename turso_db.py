@@ -4,13 +4,380 @@ Uses Turso HTTP API (compatible with Vercel serverless)
 """
 
 import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Tuple
 
+from devanagari_transliterator import nasal_key
+from form_filter import load_form_filter
+from instrumentation import span
+from metrics import record_turso_request
+from ttl_cache import MISSING, TTLCache
+
+# Optional dependency for the asyncio client
+try:
+    import asyncio
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
 # Turso database configuration from environment variables
 TURSO_DATABASE_URL = os.getenv('TURSO_DATABASE_URL', '')
 TURSO_AUTH_TOKEN = os.getenv('TURSO_AUTH_TOKEN', '')
 
+# HTTP client tuning (connection pool size and per-request timeouts in seconds)
+TURSO_POOL_SIZE = int(os.getenv('TURSO_POOL_SIZE', '10'))
+TURSO_CONNECT_TIMEOUT = float(os.getenv('TURSO_CONNECT_TIMEOUT', '3'))
+TURSO_READ_TIMEOUT = float(os.getenv('TURSO_READ_TIMEOUT', '8'))
+# Form lookup cache: entries (0 disables) and time-to-live in seconds
+TURSO_CACHE_SIZE = int(os.getenv('TURSO_CACHE_SIZE', '10000'))
+TURSO_CACHE_TTL = float(os.getenv('TURSO_CACHE_TTL', '3600'))
+# Maximum number of in-flight requests per AsyncTursoDatabase
+TURSO_MAX_CONCURRENCY = int(os.getenv('TURSO_MAX_CONCURRENCY', '8'))
+# Maximum number of statements sent in one pipeline request; larger batches are split
+TURSO_PIPELINE_MAX_STATEMENTS = int(os.getenv('TURSO_PIPELINE_MAX_STATEMENTS', '500'))
+
+
+# metadata key whose value changes whenever the form tables are updated
+DATA_VERSION_KEY = 'data_version'
+# metadata key set once the form tables carry an indexed, backfilled form_key
+# column (nasal_key of the form; see migrate_form_keys.py)
+FORM_KEY_FLAG = 'form_key'
+
+# Form lookup queries (one bound parameter: the surface form)
+VERB_FORM_SQL = """
+    SELECT
+        vr.root,
+        vf.tense,
+        vf.voice,
+        vf.mood,
+        vf.dialect,
+        vf.person,
+        vf.number
+    FROM verb_forms vf
+    JOIN verb_roots vr ON vf.root_id = vr.root_id
+    WHERE vf.form = ?
+    LIMIT 50
+"""
+
+NOUN_FORM_SQL = """
+    SELECT
+        ns.stem,
+        ns.gender,
+        nf.case_name,
+        nf.number
+    FROM noun_forms nf
+    JOIN noun_stems ns ON nf.stem_id = ns.stem_id
+    WHERE nf.form = ?
+    LIMIT 50
+"""
+
+PARTICIPLE_FORM_SQL = """
+    SELECT
+        vr.root,
+        pf.participle_type,
+        pf.suffix,
+        pf.gender,
+        pf.case_name,
+        pf.number
+    FROM participle_forms pf
+    JOIN verb_roots vr ON pf.root_id = vr.root_id
+    WHERE pf.form = ?
+    LIMIT 50
+"""
+
+
+def _verb_row(row: List) -> Tuple[str, Dict]:
+    """Convert a VERB_FORM_SQL row to a (root, grammatical_info) tuple"""
+    return (row[0], {
+        'tense': row[1],
+        'voice': row[2],
+        'mood': row[3],
+        'dialect': row[4],
+        'person': row[5],
+        'number': row[6]
+    })
+
+
+def _noun_row(row: List) -> Tuple[str, Dict]:
+    """Convert a NOUN_FORM_SQL row to a (stem, grammatical_info) tuple"""
+    return (row[0], {
+        'gender': row[1],
+        'case': row[2],
+        'number': row[3]
+    })
+
+
+def _participle_row(row: List) -> Tuple[str, Dict]:
+    """Convert a PARTICIPLE_FORM_SQL row to a (root, grammatical_info) tuple"""
+    return (row[0], {
+        'participle_type': row[1],
+        'suffix': row[2],
+        'gender': row[3],
+        'case': row[4],
+        'number': row[5]
+    })
+
+
+# (kind, query, row converter) for each attested-form table
+FORM_TABLES = [
+    ('verb', VERB_FORM_SQL, _verb_row),
+    ('noun', NOUN_FORM_SQL, _noun_row),
+    ('participle', PARTICIPLE_FORM_SQL, _participle_row),
+]
+
+
+# kind -> (query, row converter)
+FORM_QUERIES = {kind: (sql, row_converter) for kind, sql, row_converter in FORM_TABLES}
+
+
+def _form_key_sql(sql: str) -> str:
+    """Turn a form query into a form_key query that also returns each row's stored form"""
+    alias = re.search(r'WHERE (\w+)\.form = \?', sql).group(1)
+    return (sql.replace(f'{alias}.form = ?', f'{alias}.form_key = ?')
+               .replace('\n    FROM ', f',\n        {alias}.form\n    FROM ', 1)
+               .replace('LIMIT 50', 'LIMIT 200'))
+
+
+# kind -> (query on form_key, row converter); one key covers every nasal spelling,
+# so allow more rows than a single-form query. The stored form is the last column.
+FORM_KEY_QUERIES = {
+    kind: (_form_key_sql(sql), row_converter)
+    for kind, sql, row_converter in FORM_TABLES
+}
+
+
+def _make_cache(cache_size: Optional[int], cache_ttl: Optional[float]) -> Optional[TTLCache]:
+    """Create the form lookup cache, or None if disabled"""
+    cache_size = TURSO_CACHE_SIZE if cache_size is None else cache_size
+    cache_ttl = TURSO_CACHE_TTL if cache_ttl is None else cache_ttl
+    if cache_size <= 0:
+        return None
+    return TTLCache(cache_size, cache_ttl or None)
+
+
+def _split_cached(cache: Optional[TTLCache], keys: List[Tuple[str, str]],
+                  form_filter=None) -> Tuple[Dict, List[Tuple[str, str]]]:
+    """
+    Answer (kind, form) keys from the attested-form filter and the cache
+
+    Returns:
+        (results, pending) - results maps every key to its cached matches
+        (or an empty list placeholder), pending lists the keys to query
+    """
+    results = {}
+    pending = []
+    for key in keys:
+        if key in results:
+            continue
+        if form_filter is not None and not form_filter.might_contain(*key):
+            results[key] = []  # Certainly not in the database
+            continue
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not MISSING:
+                results[key] = cached
+                continue
+        results[key] = []
+        pending.append(key)
+    return results, pending
+
+
+def _store_rows(cache: Optional[TTLCache], results: Dict, pending: List[Tuple[str, str]],
+                all_rows: List[Optional[List[List]]]):
+    """Convert fetched rows into matches, caching hits and empty results alike"""
+    for key, rows in zip(pending, all_rows):
+        if rows is None:
+            continue  # Failed statement - leave uncached
+        matches = [FORM_QUERIES[key[0]][1](row) for row in rows]
+        results[key] = matches
+        if cache is not None:
+            cache.set(key, matches)
+
+
+def _store_key_rows(cache: Optional[TTLCache], found: Dict, pending: List[Tuple[str, str]],
+                    all_rows: List[Optional[List[List]]]):
+    """_store_rows for form_key queries: each match is kept with the form it is stored under"""
+    for key_pair, rows in zip(pending, all_rows):
+        if rows is None:
+            continue  # Failed statement - leave uncached
+        row_converter = FORM_KEY_QUERIES[key_pair[0]][1]
+        matches = [(row[-1], row_converter(row)) for row in rows]
+        found[key_pair] = matches
+        if cache is not None:
+            cache.set(key_pair, matches)
+
+
+def _form_key_groups(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
+    """Group (kind, form) pairs by their (kind, form_key), keeping input order"""
+    groups = {}
+    for kind, form in keys:
+        groups.setdefault((kind, nasal_key(form)), []).append((kind, form))
+    return groups
+
+
+def _assign_key_matches(results: Dict, members: List[Tuple[str, str]], stored: List[Tuple[str, Tuple[str, Dict]]]):
+    """
+    Report the (stored form, match) rows of one form key under the pairs sharing it
+
+    Each row goes to the pair with the form it is stored under, so every
+    pair gets exactly what a query on the form column returns; rows stored
+    under a spelling nobody asked for go to the first pair. Flattening the
+    results in input order therefore yields every row once.
+    """
+    by_pair = {pair: [] for pair in members}
+    first = members[0]
+    for form, match in stored:
+        pair = (first[0], form)
+        by_pair[pair if pair in by_pair else first].append(match)
+    results.update(by_pair)
+
+
+def _read_metadata_rows(rows: Optional[List[List]]) -> Dict[str, str]:
+    """Turn 'SELECT key, value FROM metadata' rows into a dict"""
+    return {row[0]: row[1] for row in rows or [] if len(row) >= 2}
+
+
+def new_data_version() -> str:
+    """A fresh, unique data_version value (UTC timestamp plus a random suffix)"""
+    return f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+
+
+def _check_filter_version(form_filter, current: Optional[str]):
+    """
+    Drop the attested-form filter unless it was built from the data Turso now holds
+
+    A filter or database without a data_version cannot be checked, so the
+    filter is not used (it could miss forms added since it was built).
+    """
+    if form_filter is None:
+        return None
+    if not form_filter.data_version or not current:
+        print("Turso: Form filter or database has no data_version; ignoring the filter")
+        return None
+    if current != form_filter.data_version:
+        print(f"Turso: Form filter is stale (built for data_version {form_filter.data_version}, "
+              f"database has {current}); ignoring it")
+        return None
+    return form_filter
+
+
+def _apply_connect_metadata(db, metadata_rows: Optional[List[List]]):
+    """
+    Configure a freshly connected client from the metadata table
+
+    Records data_version, checks the form filter against it and switches form
+    lookups to the form_key column when the database advertises it. The lookup
+    cache is cleared if the data_version or the lookup mode changed (cached
+    misses may now exist, and the cache keys differ per mode).
+    """
+    metadata = _read_metadata_rows(metadata_rows)
+    data_version = metadata.get(DATA_VERSION_KEY)
+    use_form_key = metadata.get(FORM_KEY_FLAG) == '1'
+    if (data_version != db.data_version or use_form_key != db.use_form_key) and db.cache is not None:
+        db.cache.clear()
+
+    db.data_version = data_version
+    db.form_filter = _check_filter_version(load_form_filter(), db.data_version)
+    db.use_form_key = use_form_key
+
+
+CONNECT_METADATA_SQL = "SELECT key, value FROM metadata WHERE key IN (?, ?)"
+
+
+def _execute_requests(statements: List[Tuple[str, Optional[List]]]) -> List[Dict]:
+    """Build Hrana 'execute' requests for a list of (sql, args) tuples"""
+    requests_list = []
+    for sql, args in statements:
+        stmt = {'sql': sql}
+        if args:
+            stmt['args'] = [{'type': 'text', 'value': str(a)} for a in args]
+        requests_list.append({'type': 'execute', 'stmt': stmt})
+    return requests_list
+
+
+def _extract_rows(data: Dict, count: int) -> List[Optional[List[List]]]:
+    """
+    Extract plain row values from a pipeline response
+
+    Args:
+        data: Decoded pipeline response body
+        count: Number of execute statements that were sent
+
+    Returns:
+        One entry per statement: list of rows, or None if that statement failed
+    """
+    results = data.get('results', [])
+
+    all_rows = []
+    for i in range(count):
+        if i >= len(results) or results[i].get('type') != 'ok':
+            all_rows.append(None)
+            continue
+
+        result = results[i].get('response', {}).get('result', {})
+        raw_rows = result.get('rows', [])
+
+        # Extract values from typed response
+        rows = []
+        for raw_row in raw_rows:
+            row = []
+            for col in raw_row:
+                if isinstance(col, dict):
+                    row.append(col.get('value'))
+                else:
+                    row.append(col)
+            rows.append(row)
+        all_rows.append(rows)
+
+    return all_rows
+
+
+def _extract_errors(data: Dict, count: int) -> List[Optional[str]]:
+    """
+    Extract per-statement error messages from a pipeline response
+
+    Args:
+        data: Decoded pipeline response body
+        count: Number of execute statements that were sent
+
+    Returns:
+        One entry per statement: the Hrana error message, or None if it succeeded
+    """
+    results = data.get('results', [])
+    errors = []
+    for i in range(count):
+        if i >= len(results):
+            errors.append('no result returned')
+        elif results[i].get('type') != 'ok':
+            errors.append((results[i].get('error') or {}).get('message', 'unknown error'))
+        else:
+            errors.append(None)
+    return errors
+
+
+def _chunks(statements: List[Tuple[str, Optional[List]]]) -> List[List[Tuple[str, Optional[List]]]]:
+    """Split statements into pipeline-sized chunks"""
+    size = max(1, TURSO_PIPELINE_MAX_STATEMENTS)
+    return [statements[i:i + size] for i in range(0, len(statements), size)]
+
+
+def _unique(items: List[str]) -> List[str]:
+    """Remove duplicates while preserving order"""
+    seen = set()
+    unique_items = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            unique_items.append(item)
+    return unique_items
+
 
 def _to_https_url(url: str) -> str:
     """Convert libsql:// or other URL schemes to https://"""
@@ -24,17 +391,164 @@ def _to_https_url(url: str) -> str:
 
 
 class TursoDatabase:
-    """Turso database connection wrapper using HTTP API"""
+    """
+    Turso database connection wrapper using HTTP API
+
+    Requests go through a pooled keep-alive transport, so the TCP/TLS
+    handshake is paid once per pooled connection rather than per query.
+    Each thread gets its own requests.Session, but all sessions share one
+    HTTPAdapter (and therefore one urllib3 connection pool), which makes a
+    single instance safe to share across Flask worker threads.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 cache_size: Optional[int] = None,
+                 cache_ttl: Optional[float] = None,
+                 database_url: Optional[str] = None,
+                 auth_token: Optional[str] = None):
+        """
+        Initialize Turso database connection
 
-    def __init__(self):
-        """Initialize Turso database connection"""
+        Args:
+            pool_size: Maximum number of pooled connections (default: TURSO_POOL_SIZE)
+            connect_timeout: Connect timeout in seconds (default: TURSO_CONNECT_TIMEOUT)
+            read_timeout: Read timeout in seconds (default: TURSO_READ_TIMEOUT)
+            cache_size: Form lookup cache entries, 0 to disable (default: TURSO_CACHE_SIZE)
+            cache_ttl: Form lookup cache TTL in seconds (default: TURSO_CACHE_TTL)
+            database_url: Database URL (default: TURSO_DATABASE_URL)
+            auth_token: Auth token, e.g. a read-write one (default: TURSO_AUTH_TOKEN)
+        """
+        database_url = database_url or TURSO_DATABASE_URL
+        auth_token = auth_token or TURSO_AUTH_TOKEN
         self.connected = False
-        self.base_url = _to_https_url(TURSO_DATABASE_URL) if TURSO_DATABASE_URL else ''
+        self.base_url = _to_https_url(database_url) if database_url else ''
         self.pipeline_url = f'{self.base_url}/v2/pipeline' if self.base_url else ''
         self.headers = {
-            'Authorization': f'Bearer {TURSO_AUTH_TOKEN}',
+            'Authorization': f'Bearer {auth_token}',
             'Content-Type': 'application/json'
-        } if TURSO_AUTH_TOKEN else {}
+        } if auth_token else {}
+
+        self.pool_size = pool_size or TURSO_POOL_SIZE
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else TURSO_CONNECT_TIMEOUT,
+            read_timeout if read_timeout is not None else TURSO_READ_TIMEOUT
+        )
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        # Per-thread HTTP session and Hrana stream state (baton, base URL, nesting depth)
+        self._local = threading.local()
+        # (kind, form) -> matches, or (kind, form_key) -> matches when use_form_key;
+        # empty results are cached too
+        self.cache = _make_cache(cache_size, cache_ttl)
+        # Bloom filter of attested forms (see form_filter.py); only set by
+        # connect() once its data_version matches the database's
+        self.form_filter = None
+        # Query the form_key column instead of one statement per spelling (set by connect())
+        self.use_form_key = False
+        # metadata data_version, read by connect()
+        self.data_version = None
+
+    def _session(self) -> requests.Session:
+        """Return this thread's HTTP session (sharing the pooled adapter)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    @contextmanager
+    def stream(self):
+        """
+        Keep one server-side Hrana stream open for all queries in the block
+
+        Inside the block every pipeline request reuses the baton returned by
+        the previous one instead of opening and closing a stream per request.
+        If the baton has expired, a new stream is opened transparently. The
+        stream is closed when the outermost block exits. Streams are per
+        thread, so concurrent threads never share a baton.
+
+        Usage:
+            with db.stream():
+                db.check_verb_forms(variants)
+                db.check_noun_forms(variants)
+        """
+        depth = getattr(self._local, 'stream_depth', 0)
+        self._local.stream_depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._local.stream_depth = depth
+            if depth == 0:
+                self._close_stream()
+
+    def _in_stream(self) -> bool:
+        """Whether the current thread is inside a stream() block"""
+        return getattr(self._local, 'stream_depth', 0) > 0
+
+    def _stream_pipeline_url(self) -> str:
+        """Pipeline URL for the current stream (Turso may redirect a stream)"""
+        base_url = getattr(self._local, 'stream_base_url', None)
+        return f'{base_url}/v2/pipeline' if base_url else self.pipeline_url
+
+    def _close_stream(self):
+        """Close the current thread's open stream, if any"""
+        baton = getattr(self._local, 'baton', None)
+        url = self._stream_pipeline_url()
+        self._local.baton = None
+        self._local.stream_base_url = None
+        if not baton:
+            return
+        try:
+            self._session().post(
+                url,
+                json={'baton': baton, 'requests': [{'type': 'close'}]},
+                timeout=self.timeout
+            )
+        except Exception:
+            pass
+
+    def _post_pipeline(self, requests_list: List[Dict]) -> Optional[Dict]:
+        """
+        Send pipeline requests, reusing the current stream's baton if any
+
+        Args:
+            requests_list: Hrana pipeline requests
+
+        Returns:
+            Decoded response body, or None on HTTP error
+        """
+        if not self._in_stream():
+            resp = self._session().post(
+                self.pipeline_url,
+                json={'requests': requests_list + [{'type': 'close'}]},
+                timeout=self.timeout
+            )
+            return resp.json() if resp.status_code == 200 else None
+
+        baton = getattr(self._local, 'baton', None)
+        payload = {'requests': requests_list}
+        if baton:
+            payload['baton'] = baton
+        resp = self._session().post(self._stream_pipeline_url(), json=payload, timeout=self.timeout)
+
+        if resp.status_code != 200 and baton:
+            # Baton expired (or stream was lost) - reopen a fresh stream and retry once
+            self._local.baton = None
+            self._local.stream_base_url = None
+            resp = self._session().post(self.pipeline_url, json={'requests': requests_list}, timeout=self.timeout)
+
+        if resp.status_code != 200:
+            return None
+
+        data = resp.json()
+        self._local.baton = data.get('baton')
+        if data.get('base_url'):
+            self._local.stream_base_url = _to_https_url(data['base_url']).rstrip('/')
+        return data
 
     def _execute(self, sql: str, args: Optional[List] = None) -> Optional[List[List]]:
         """
@@ -47,66 +561,83 @@ class TursoDatabase:
         Returns:
             List of rows (each row is a list of values), or None on error
         """
-        if not self.pipeline_url or not self.headers:
-            return None
+        return self._execute_many([(sql, args)])[0]
 
-        stmt = {'sql': sql}
-        if args:
-            stmt['args'] = [{'type': 'text', 'value': str(a)} for a in args]
+    def _execute_many(self, statements: List[Tuple[str, Optional[List]]]) -> List[Optional[List[List]]]:
+        """
+        Execute several SQL statements in a single Turso pipeline request
 
-        payload = {
-            'requests': [
-                {'type': 'execute', 'stmt': stmt},
-                {'type': 'close'}
-            ]
-        }
+        More than TURSO_PIPELINE_MAX_STATEMENTS statements are sent as
+        consecutive pipeline requests.
 
-        try:
-            resp = requests.post(
-                self.pipeline_url,
-                headers=self.headers,
-                json=payload,
-                timeout=8
-            )
-            if resp.status_code != 200:
-                return None
+        Args:
+            statements: List of (sql, args) tuples
 
-            data = resp.json()
-            results = data.get('results', [])
-            if not results or results[0].get('type') != 'ok':
-                return None
+        Returns:
+            One entry per statement: list of rows, or None if that statement
+            (or the request carrying it) failed
+        """
+        return self._execute_many_with_errors(statements)[0]
 
-            result = results[0].get('response', {}).get('result', {})
-            raw_rows = result.get('rows', [])
+    def _execute_many_with_errors(self, statements: List[Tuple[str, Optional[List]]]
+                                  ) -> Tuple[List[Optional[List[List]]], List[Optional[str]]]:
+        """
+        _execute_many() that also reports why each failed statement failed
 
-            # Extract values from typed response
-            rows = []
-            for raw_row in raw_rows:
-                row = []
-                for col in raw_row:
-                    if isinstance(col, dict):
-                        row.append(col.get('value'))
-                    else:
-                        row.append(col)
-                rows.append(row)
+        Args:
+            statements: List of (sql, args) tuples
 
-            return rows
+        Returns:
+            (rows, errors): rows as from _execute_many(), and one entry per
+            statement holding its error message, or None if it succeeded
+        """
+        if not statements:
+            return [], []
+        if not self.pipeline_url or not self.headers:
+            return [None] * len(statements), ['Turso URL or auth token not configured'] * len(statements)
 
-        except Exception:
-            return None
+        all_rows = []
+        all_errors = []
+        for chunk in _chunks(statements):
+            start = time.perf_counter()
+            error_kind = 'error'
+            try:
+                with span('turso'):
+                    data = self._post_pipeline(_execute_requests(chunk))
+                if data is None:
+                    rows = [None] * len(chunk)
+                    errors = ['pipeline request failed'] * len(chunk)
+                else:
+                    rows = _extract_rows(data, len(chunk))
+                    errors = _extract_errors(data, len(chunk))
+            except requests.Timeout:
+                rows = [None] * len(chunk)
+                errors = ['request timed out'] * len(chunk)
+                error_kind = 'timeout'
+            except Exception as e:
+                rows = [None] * len(chunk)
+                errors = [str(e)] * len(chunk)
+            record_turso_request(chunk, rows, time.perf_counter() - start, error_kind)
+            all_rows.extend(rows)
+            all_errors.extend(errors)
+        return all_rows, all_errors
 
     def connect(self):
         """Establish connection to Turso database"""
-        if not self.base_url or not TURSO_AUTH_TOKEN:
+        if not self.base_url or not self.headers:
             print("Turso: URL or auth token not configured")
             self.connected = False
             return False
 
         try:
-            rows = self._execute("SELECT 1")
+            rows, metadata_rows = self._execute_many([
+                ("SELECT 1", None),
+                (CONNECT_METADATA_SQL, [DATA_VERSION_KEY, FORM_KEY_FLAG])
+            ])
             if rows is not None:
                 self.connected = True
                 print("Turso: Connected successfully")
+                _apply_connect_metadata(self, metadata_rows)
                 return True
             else:
                 print("Turso: Connection test failed")
@@ -173,6 +704,107 @@ class TursoDatabase:
         except Exception:
             return None
 
+    def bump_data_version(self) -> Optional[str]:
+        """
+        Record that the form tables changed by writing a new metadata data_version
+
+        Must be called after every write to the form tables, so clients stop
+        trusting form filters, root snapshots and replicas built from the old
+        data. Needs a read-write token.
+
+        Returns:
+            The new data_version, or None if it could not be written
+        """
+        version = new_data_version()
+        if self._execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
+                         [DATA_VERSION_KEY, version]) is None:
+            return None
+        self.data_version = version
+        return version
+
+    def _lookup_forms(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Tuple[str, Dict]]]:
+        """
+        Look up (kind, form) pairs, querying Turso only for uncached ones
+
+        All uncached pairs are sent as statements of a single pipeline request.
+
+        Args:
+            keys: (kind, form) pairs, kind being 'verb', 'noun' or 'participle'
+
+        Returns:
+            Dict mapping each pair to its list of (lemma, grammatical_info) tuples
+        """
+        return self._lookup_form_groups([keys])[0]
+
+    def _lookup_form_groups(self, groups: List[List[Tuple[str, str]]]) -> List[Dict[Tuple[str, str], List[Tuple[str, Dict]]]]:
+        """
+        Look up several lists of (kind, form) pairs with one set of statements
+
+        Args:
+            groups: Lists of (kind, form) pairs, e.g. one list per word
+
+        Returns:
+            One dict per group, as _lookup_forms would return for that group alone
+        """
+        if self.use_form_key:
+            return self._lookup_form_key_groups(groups)
+
+        results, pending = _split_cached(self.cache, [key for keys in groups for key in keys], self.form_filter)
+
+        if pending and (self.connected or self.connect()):
+            try:
+                all_rows = self._execute_many([(FORM_QUERIES[kind][0], [form]) for kind, form in pending])
+                _store_rows(self.cache, results, pending, all_rows)
+            except Exception:
+                pass
+        return [{key: results[key] for key in keys} for keys in groups]
+
+    def _lookup_form_key_groups(self, groups: List[List[Tuple[str, str]]]) -> List[Dict[Tuple[str, str], List[Tuple[str, Dict]]]]:
+        """
+        form_key counterpart of _lookup_form_groups
+
+        Pairs the form filter rules out are dropped first; the rest collapse to
+        their nasal keys, and each uncached key costs one statement however
+        many groups share it. Rows are reported under the pair with their
+        stored form (see _assign_key_matches).
+        """
+        split = [_split_cached(None, keys, self.form_filter) for keys in groups]
+        key_groups = [_form_key_groups(candidates) for _, candidates in split]
+        found, pending = _split_cached(self.cache, [key_pair for members in key_groups for key_pair in members])
+
+        if pending and (self.connected or self.connect()):
+            try:
+                all_rows = self._execute_many([(FORM_KEY_QUERIES[kind][0], [key]) for kind, key in pending])
+                _store_key_rows(self.cache, found, pending, all_rows)
+            except Exception:
+                pass
+
+        for (results, _), members_by_key in zip(split, key_groups):
+            for key_pair, members in members_by_key.items():
+                _assign_key_matches(results, members, found[key_pair])
+        return [results for results, _ in split]
+
+    def _check_forms(self, kind: str, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Look up several forms of one kind in a single request
+
+        Args:
+            kind: 'verb', 'noun' or 'participle'
+            forms: Forms to check
+
+        Returns:
+            Dict mapping each form to its list of (lemma, grammatical_info) tuples
+        """
+        forms = _unique(forms)
+        found = self._lookup_forms([(kind, form) for form in forms])
+        return {form: found[(kind, form)] for form in forms}
+
+    def cache_stats(self) -> Dict:
+        """Return form lookup cache statistics (hits, misses, size, ...)"""
+        if self.cache is None:
+            return {'enabled': False}
+        return dict(self.cache.stats(), enabled=True)
+
     def check_verb_form(self, form: str) -> List[Tuple[str, Dict]]:
         """
         Check if a verb form exists in the database
@@ -183,42 +815,19 @@ class TursoDatabase:
         Returns:
             List of (root, grammatical_info) tuples for all matching rows
         """
-        if not self.connected:
-            if not self.connect():
-                return []
+        return self.check_verb_forms([form])[form]
 
-        try:
-            rows = self._execute("""
-                SELECT
-                    vr.root,
-                    vf.tense,
-                    vf.voice,
-                    vf.mood,
-                    vf.dialect,
-                    vf.person,
-                    vf.number
-                FROM verb_forms vf
-                JOIN verb_roots vr ON vf.root_id = vr.root_id
-                WHERE vf.form = ?
-                LIMIT 50
-            """, [form])
-
-            if not rows:
-                return []
-
-            results = []
-            for row in rows:
-                results.append((row[0], {
-                    'tense': row[1],
-                    'voice': row[2],
-                    'mood': row[3],
-                    'dialect': row[4],
-                    'person': row[5],
-                    'number': row[6]
-                }))
-            return results
-        except Exception:
-            return []
+    def check_verb_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Check several verb forms (e.g. anusvara variants) in one round trip
+
+        Args:
+            forms: Verb forms to check
+
+        Returns:
+            Dict mapping each form to its list of (root, grammatical_info) tuples
+        """
+        return self._check_forms('verb', forms)
 
     def check_noun_form(self, form: str) -> List[Tuple[str, Dict]]:
         """
@@ -230,36 +839,19 @@ class TursoDatabase:
         Returns:
             List of (stem, grammatical_info) tuples for all matching rows
         """
-        if not self.connected:
-            if not self.connect():
-                return []
+        return self.check_noun_forms([form])[form]
 
-        try:
-            rows = self._execute("""
-                SELECT
-                    ns.stem,
-                    ns.gender,
-                    nf.case_name,
-                    nf.number
-                FROM noun_forms nf
-                JOIN noun_stems ns ON nf.stem_id = ns.stem_id
-                WHERE nf.form = ?
-                LIMIT 50
-            """, [form])
-
-            if not rows:
-                return []
-
-            results = []
-            for row in rows:
-                results.append((row[0], {
-                    'gender': row[1],
-                    'case': row[2],
-                    'number': row[3]
-                }))
-            return results
-        except Exception:
-            return []
+    def check_noun_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Check several noun forms (e.g. anusvara variants) in one round trip
+
+        Args:
+            forms: Noun forms to check
+
+        Returns:
+            Dict mapping each form to its list of (stem, grammatical_info) tuples
+        """
+        return self._check_forms('noun', forms)
 
     def check_participle_form(self, form: str) -> List[Tuple[str, Dict]]:
         """
@@ -271,41 +863,345 @@ class TursoDatabase:
         Returns:
             List of (root, grammatical_info) tuples for all matching rows
         """
+        return self.check_participle_forms([form])[form]
+
+    def check_participle_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Check several participle forms (e.g. anusvara variants) in one round trip
+
+        Args:
+            forms: Participle forms to check
+
+        Returns:
+            Dict mapping each form to its list of (root, grammatical_info) tuples
+        """
+        return self._check_forms('participle', forms)
+
+    def lookup_all(self, forms: List[str]) -> Dict[str, Dict[str, List[Tuple[str, Dict]]]]:
+        """
+        Check forms against verb_forms, noun_forms and participle_forms at once
+
+        All statements (one per form and table) are sent in a single
+        pipeline request. When the database has a form_key column, forms
+        sharing a nasal key cost a single statement per table; each form
+        still gets the rows stored under that exact spelling.
+
+        Args:
+            forms: Forms to check (typically the anusvara variants of a word)
+
+        Returns:
+            Dict with 'verb', 'noun' and 'participle' keys, each mapping
+            every form to its list of (lemma, grammatical_info) tuples
+        """
+        return self.lookup_all_many([forms])[0]
+
+    def lookup_all_many(self, form_groups: List[List[str]]) -> List[Dict[str, Dict[str, List[Tuple[str, Dict]]]]]:
+        """
+        lookup_all() for several groups of forms in one round trip
+
+        Statements for all groups are deduplicated and sent together (split
+        only at TURSO_PIPELINE_MAX_STATEMENTS), so looking up every word of a
+        passage costs a few requests instead of one per word.
+
+        Args:
+            form_groups: Lists of forms, typically the anusvara variants of each word
+
+        Returns:
+            One lookup_all() result per group, in the same order
+        """
+        form_groups = [_unique(forms) for forms in form_groups]
+        found = self._lookup_form_groups([
+            [(kind, form) for kind, _, _ in FORM_TABLES for form in forms] for forms in form_groups
+        ])
+        return [
+            {kind: {form: group_found[(kind, form)] for form in forms} for kind, _, _ in FORM_TABLES}
+            for forms, group_found in zip(form_groups, found)
+        ]
+
+    def close(self):
+        """Close database connection and release pooled HTTP connections"""
+        self._close_stream()
+        self.connected = False
+        self._adapter.close()
+
+
+class AsyncTursoDatabase:
+    """
+    Asyncio Turso client with the same lookup surface as TursoDatabase
+
+    Built on a pooled httpx.AsyncClient. Independent lookups (e.g. the
+    verb, noun and participle tables in lookup_all) are issued concurrently,
+    with a semaphore bounding the number of in-flight requests. An instance
+    must be used from a single event loop.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None,
+                 pool_size: Optional[int] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 cache_size: Optional[int] = None,
+                 cache_ttl: Optional[float] = None,
+                 database_url: Optional[str] = None,
+                 auth_token: Optional[str] = None):
+        """
+        Initialize async Turso client
+
+        Args:
+            max_concurrency: Maximum in-flight requests (default: TURSO_MAX_CONCURRENCY)
+            pool_size: Maximum number of pooled connections (default: TURSO_POOL_SIZE)
+            connect_timeout: Connect timeout in seconds (default: TURSO_CONNECT_TIMEOUT)
+            read_timeout: Read timeout in seconds (default: TURSO_READ_TIMEOUT)
+            cache_size: Form lookup cache entries, 0 to disable (default: TURSO_CACHE_SIZE)
+            cache_ttl: Form lookup cache TTL in seconds (default: TURSO_CACHE_TTL)
+            database_url: Database URL (default: TURSO_DATABASE_URL)
+            auth_token: Auth token, e.g. a read-write one (default: TURSO_AUTH_TOKEN)
+        """
+        if not HAS_HTTPX:
+            raise ImportError("AsyncTursoDatabase requires httpx. Install with: pip install httpx")
+
+        database_url = database_url or TURSO_DATABASE_URL
+        auth_token = auth_token or TURSO_AUTH_TOKEN
+        self.connected = False
+        self.base_url = _to_https_url(database_url) if database_url else ''
+        self.pipeline_url = f'{self.base_url}/v2/pipeline' if self.base_url else ''
+        self.headers = {
+            'Authorization': f'Bearer {auth_token}',
+            'Content-Type': 'application/json'
+        } if auth_token else {}
+
+        self.max_concurrency = max_concurrency or TURSO_MAX_CONCURRENCY
+        self.pool_size = pool_size or TURSO_POOL_SIZE
+        self.timeout = httpx.Timeout(
+            read_timeout if read_timeout is not None else TURSO_READ_TIMEOUT,
+            connect=connect_timeout if connect_timeout is not None else TURSO_CONNECT_TIMEOUT
+        )
+        self._client = None
+        self._semaphore = None
+        self.cache = _make_cache(cache_size, cache_ttl)
+        self.form_filter = None
+        self.use_form_key = False
+        self.data_version = None
+
+    def _get_client(self) -> 'httpx.AsyncClient':
+        """Create the pooled HTTP client and semaphore on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _execute(self, sql: str, args: Optional[List] = None) -> Optional[List[List]]:
+        """
+        Execute a SQL query via Turso HTTP pipeline API
+
+        Args:
+            sql: SQL query string
+            args: Optional list of query arguments
+
+        Returns:
+            List of rows (each row is a list of values), or None on error
+        """
+        return (await self._execute_many([(sql, args)]))[0]
+
+    async def _execute_many(self, statements: List[Tuple[str, Optional[List]]]) -> List[Optional[List[List]]]:
+        """
+        Execute several SQL statements in a single Turso pipeline request
+
+        More than TURSO_PIPELINE_MAX_STATEMENTS statements are split into
+        several pipeline requests, sent concurrently.
+
+        Args:
+            statements: List of (sql, args) tuples
+
+        Returns:
+            One entry per statement: list of rows, or None if that statement
+            (or the request carrying it) failed
+        """
+        if not statements:
+            return []
+        if not self.pipeline_url or not self.headers:
+            return [None] * len(statements)
+
+        async def post(chunk):
+            payload = {'requests': _execute_requests(chunk) + [{'type': 'close'}]}
+            start = None
+            error_kind = 'error'
+            try:
+                client = self._get_client()
+                async with self._semaphore:
+                    start = time.perf_counter()
+                    with span('turso'):
+                        resp = await client.post(self.pipeline_url, json=payload)
+                if resp.status_code != 200:
+                    rows = [None] * len(chunk)
+                else:
+                    rows = _extract_rows(resp.json(), len(chunk))
+            except httpx.TimeoutException:
+                rows = [None] * len(chunk)
+                error_kind = 'timeout'
+            except Exception:
+                rows = [None] * len(chunk)
+            elapsed = time.perf_counter() - start if start is not None else 0.0
+            record_turso_request(chunk, rows, elapsed, error_kind)
+            return rows
+
+        chunk_rows = await asyncio.gather(*[post(chunk) for chunk in _chunks(statements)])
+        return [rows for chunk in chunk_rows for rows in chunk]
+
+    async def connect(self):
+        """Establish connection to Turso database"""
+        if not self.base_url or not self.headers:
+            print("Turso: URL or auth token not configured")
+            self.connected = False
+            return False
+
+        rows, metadata_rows = await self._execute_many([
+            ("SELECT 1", None),
+            (CONNECT_METADATA_SQL, [DATA_VERSION_KEY, FORM_KEY_FLAG])
+        ])
+        self.connected = rows is not None
         if not self.connected:
-            if not self.connect():
-                return []
+            print("Turso: Connection test failed")
+        else:
+            _apply_connect_metadata(self, metadata_rows)
+        return self.connected
 
-        try:
-            rows = self._execute("""
-                SELECT
-                    vr.root,
-                    pf.participle_type,
-                    pf.suffix,
-                    pf.gender,
-                    pf.case_name,
-                    pf.number
-                FROM participle_forms pf
-                JOIN verb_roots vr ON pf.root_id = vr.root_id
-                WHERE pf.form = ?
-                LIMIT 50
-            """, [form])
-
-            if not rows:
-                return []
-
-            results = []
-            for row in rows:
-                results.append((row[0], {
-                    'participle_type': row[1],
-                    'suffix': row[2],
-                    'gender': row[3],
-                    'case': row[4],
-                    'number': row[5]
-                }))
+    async def load_verb_roots(self) -> set:
+        """
+        Load all verb roots from Turso database
+
+        Returns:
+            Set of verb root strings
+        """
+        if not self.connected:
+            if not await self.connect():
+                return set()
+
+        rows = await self._execute("SELECT DISTINCT root FROM verb_roots")
+        if rows is None:
+            return set()
+        return {row[0] for row in rows if row[0]}
+
+    async def get_metadata(self, key: str) -> Optional[str]:
+        """
+        Get metadata value from database
+
+        Args:
+            key: Metadata key
+
+        Returns:
+            Metadata value or None
+        """
+        if not self.connected:
+            if not await self.connect():
+                return None
+
+        rows = await self._execute("SELECT value FROM metadata WHERE key = ?", [key])
+        if rows and rows[0]:
+            return rows[0][0]
+        return None
+
+    async def _lookup_forms(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Tuple[str, Dict]]]:
+        """
+        Look up (kind, form) pairs, querying Turso only for uncached ones
+
+        Uncached pairs are grouped by kind and the per-kind requests are
+        issued concurrently.
+        """
+        if self.use_form_key:
+            results, candidates = _split_cached(None, keys, self.form_filter)
+            members_by_key = _form_key_groups(candidates)
+            found, pending = _split_cached(self.cache, list(members_by_key))
+            if pending and (self.connected or await self.connect()):
+                await self._fetch_grouped(found, pending, FORM_KEY_QUERIES, _store_key_rows)
+            for key_pair, members in members_by_key.items():
+                _assign_key_matches(results, members, found[key_pair])
             return results
-        except Exception:
-            return []
 
-    def close(self):
-        """Close database connection"""
+        results, pending = _split_cached(self.cache, keys, self.form_filter)
+        if not pending:
+            return results
+
+        if not self.connected:
+            if not await self.connect():
+                return results
+
+        await self._fetch_grouped(results, pending, FORM_QUERIES)
+        return results
+
+    async def _fetch_grouped(self, results: Dict, pending: List[Tuple[str, str]], queries: Dict,
+                             store=_store_rows):
+        """Query pending (kind, value) pairs, one concurrent request per kind"""
+        groups = {}
+        for key in pending:
+            groups.setdefault(key[0], []).append(key)
+
+        async def fetch(group):
+            all_rows = await self._execute_many([(queries[kind][0], [value]) for kind, value in group])
+            store(self.cache, results, group, all_rows)
+
+        await asyncio.gather(*[fetch(group) for group in groups.values()])
+
+    async def _check_forms(self, kind: str, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """Async counterpart of TursoDatabase._check_forms"""
+        forms = _unique(forms)
+        found = await self._lookup_forms([(kind, form) for form in forms])
+        return {form: found[(kind, form)] for form in forms}
+
+    def cache_stats(self) -> Dict:
+        """Return form lookup cache statistics (hits, misses, size, ...)"""
+        if self.cache is None:
+            return {'enabled': False}
+        return dict(self.cache.stats(), enabled=True)
+
+    async def check_verb_form(self, form: str) -> List[Tuple[str, Dict]]:
+        """Check if a verb form exists; returns (root, grammatical_info) tuples"""
+        return (await self.check_verb_forms([form]))[form]
+
+    async def check_verb_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """Check several verb forms in one round trip"""
+        return await self._check_forms('verb', forms)
+
+    async def check_noun_form(self, form: str) -> List[Tuple[str, Dict]]:
+        """Check if a noun form exists; returns (stem, grammatical_info) tuples"""
+        return (await self.check_noun_forms([form]))[form]
+
+    async def check_noun_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """Check several noun forms in one round trip"""
+        return await self._check_forms('noun', forms)
+
+    async def check_participle_form(self, form: str) -> List[Tuple[str, Dict]]:
+        """Check if a participle form exists; returns (root, grammatical_info) tuples"""
+        return (await self.check_participle_forms([form]))[form]
+
+    async def check_participle_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """Check several participle forms in one round trip"""
+        return await self._check_forms('participle', forms)
+
+    async def lookup_all(self, forms: List[str]) -> Dict[str, Dict[str, List[Tuple[str, Dict]]]]:
+        """
+        Check forms against the verb, noun and participle tables concurrently
+
+        Args:
+            forms: Forms to check (typically the anusvara variants of a word)
+
+        Returns:
+            Dict with 'verb', 'noun' and 'participle' keys, each mapping
+            every form to its list of (lemma, grammatical_info) tuples
+        """
+        forms = _unique(forms)
+        found = await self._lookup_forms([(kind, form) for kind, _, _ in FORM_TABLES for form in forms])
+        return {kind: {form: found[(kind, form)] for form in forms} for kind, _, _ in FORM_TABLES}
+
+    async def close(self):
+        """Close the HTTP client and its pooled connections"""
         self.connected = False
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,409 @@
+"""
+Local SQLite replica of the Turso form tables
+
+Materializes verb_roots, verb_forms, noun_stems, noun_forms and
+participle_forms into an indexed local SQLite file so attested-form lookups
+run without a network round trip. The replica records the Turso
+metadata 'data_version' it was synced at; a sync only pulls rows when that
+version changed, and then only rows with a rowid above the last one copied
+(the tables are append-only, see upload_to_turso.py). Use --full to rebuild
+from scratch after rows were edited or deleted upstream.
+
+Form tables also get a form_key column (nasal_key of the form), computed
+locally, so lookups collapse all nasal spellings of a word into one query
+whether or not the Turso database has been migrated.
+
+Usage:
+    python turso_replica.py sync [--full] [replica.db]
+    python turso_replica.py status [replica.db]
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from devanagari_transliterator import nasal_key
+from turso_db import (DATA_VERSION_KEY, FORM_KEY_QUERIES, FORM_QUERIES, FORM_TABLES, TursoDatabase,
+                      _assign_key_matches, _form_key_groups, _unique)
+
+REPLICA_PATH = os.getenv('TURSO_REPLICA_PATH',
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'turso_replica.db'))
+# Seconds after the last successful sync during which the replica counts as fresh
+REPLICA_MAX_AGE = float(os.getenv('TURSO_REPLICA_MAX_AGE', '86400'))
+# Seconds between background syncs while the parser serves from the replica (0 = off)
+REPLICA_SYNC_INTERVAL = float(os.getenv('TURSO_REPLICA_SYNC_INTERVAL', '0'))
+
+# Replicated tables and their columns (besides the copied Turso rowid)
+REPLICA_TABLES = {
+    'verb_roots': ('root_id', 'root'),
+    'verb_forms': ('root_id', 'form', 'tense', 'voice', 'mood', 'dialect', 'person', 'number'),
+    'noun_stems': ('stem_id', 'stem', 'gender'),
+    'noun_forms': ('stem_id', 'form', 'case_name', 'number'),
+    'participle_forms': ('root_id', 'form', 'participle_type', 'suffix', 'gender', 'case_name', 'number'),
+}
+
+REPLICA_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_verb_roots_root_id ON verb_roots(root_id)',
+    'CREATE INDEX IF NOT EXISTS idx_verb_forms_form ON verb_forms(form)',
+    'CREATE INDEX IF NOT EXISTS idx_noun_stems_stem_id ON noun_stems(stem_id)',
+    'CREATE INDEX IF NOT EXISTS idx_noun_forms_form ON noun_forms(form)',
+    'CREATE INDEX IF NOT EXISTS idx_participle_forms_form ON participle_forms(form)',
+]
+
+# Tables with a locally computed form_key column
+KEYED_TABLES = ('verb_forms', 'noun_forms', 'participle_forms')
+
+SYNC_PAGE_SIZE = 5000
+
+
+def _create_schema(conn: sqlite3.Connection):
+    """Create replica tables and indexes if missing"""
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.create_function('nasal_key', 1, nasal_key, deterministic=True)
+    for table, columns in REPLICA_TABLES.items():
+        column_defs = ', '.join(f"{c} {'INTEGER' if c.endswith('_id') else 'TEXT'}" for c in columns)
+        if table in KEYED_TABLES:
+            column_defs += ', form_key TEXT'
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {column_defs})')
+
+        if table in KEYED_TABLES:
+            existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+            if 'form_key' not in existing:
+                # Replica created before form keys existed
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN form_key TEXT')
+            # Also repairs rows left unkeyed by syncs that backfilled after the copy
+            conn.execute(f'UPDATE {table} SET form_key = nasal_key(form) WHERE form_key IS NULL')
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_form_key ON {table}(form_key)')
+    conn.execute('CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)')
+    conn.execute('CREATE TABLE IF NOT EXISTS replica_state (key TEXT PRIMARY KEY, value TEXT)')
+    for sql in REPLICA_INDEXES:
+        conn.execute(sql)
+    conn.commit()
+
+
+def _get_state(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    """Read a value from the replica_state table"""
+    row = conn.execute('SELECT value FROM replica_state WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_state(conn: sqlite3.Connection, key: str, value: str):
+    """Write a value to the replica_state table"""
+    conn.execute('INSERT OR REPLACE INTO replica_state (key, value) VALUES (?, ?)', (key, value))
+
+
+def sync_replica(path: str = REPLICA_PATH, remote: Optional[TursoDatabase] = None,
+                 full: bool = False, page_size: int = SYNC_PAGE_SIZE) -> Dict:
+    """
+    Bring the local replica up to date with Turso
+
+    Args:
+        path: Replica file path
+        remote: Connected TursoDatabase (a new one is created if omitted)
+        full: Drop and re-copy all tables instead of syncing incrementally
+        page_size: Rows fetched per pipeline request
+
+    Returns:
+        Dict with 'status' ('synced', 'up_to_date' or 'error'), the synced
+        'data_version' and per-table 'copied' row counts
+    """
+    remote = remote or TursoDatabase()
+    if not remote.connected and not remote.connect():
+        return {'status': 'error', 'error': 'Turso not available'}
+
+    conn = sqlite3.connect(path)
+    try:
+        if full:
+            for table in REPLICA_TABLES:
+                conn.execute(f'DROP TABLE IF EXISTS {table}')
+            conn.execute('DROP TABLE IF EXISTS replica_state')
+        _create_schema(conn)
+
+        with remote.stream():
+            remote_version = remote.get_metadata(DATA_VERSION_KEY)
+            local_version = _get_state(conn, 'data_version')
+
+            if remote_version is not None and remote_version == local_version:
+                _set_state(conn, 'synced_at', str(time.time()))
+                conn.commit()
+                return {'status': 'up_to_date', 'data_version': remote_version, 'copied': {}}
+
+            copied = {}
+            for table, columns in REPLICA_TABLES.items():
+                last_id = conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+                copied[table] = 0
+                insert_columns = ', '.join(('id',) + columns)
+                placeholders = ', '.join('?' * (len(columns) + 1))
+                if table in KEYED_TABLES:
+                    # Key each page as it lands so an interrupted sync leaves no unkeyed rows
+                    insert_columns += ', form_key'
+                    placeholders += f', nasal_key(?{columns.index("form") + 2})'
+                while True:
+                    rows = remote._execute(
+                        f'SELECT rowid, {", ".join(columns)} FROM {table} '
+                        f'WHERE rowid > CAST(? AS INTEGER) ORDER BY rowid LIMIT {int(page_size)}',
+                        [last_id]
+                    )
+                    if rows is None:
+                        conn.rollback()
+                        return {'status': 'error', 'error': f'Failed to fetch {table}', 'copied': copied}
+                    if not rows:
+                        break
+                    conn.executemany(f'INSERT OR REPLACE INTO {table} ({insert_columns}) '
+                                     f'VALUES ({placeholders})', rows)
+                    conn.commit()
+                    last_id = int(rows[-1][0])
+                    copied[table] += len(rows)
+                    if len(rows) < page_size:
+                        break
+
+            metadata = remote._execute('SELECT key, value FROM metadata') or []
+            conn.executemany('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)', metadata)
+
+        if remote_version is not None:
+            _set_state(conn, 'data_version', remote_version)
+        _set_state(conn, 'synced_at', str(time.time()))
+        conn.commit()
+        return {'status': 'synced', 'data_version': remote_version, 'copied': copied}
+    finally:
+        conn.close()
+
+
+def replica_status(path: str = REPLICA_PATH) -> Dict:
+    """
+    Describe the local replica
+
+    Returns:
+        Dict with 'exists', 'data_version', 'synced_at' and 'age' (seconds)
+    """
+    if not os.path.exists(path):
+        return {'exists': False, 'data_version': None, 'synced_at': None, 'age': None}
+
+    try:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            data_version = _get_state(conn, 'data_version')
+            synced_at = _get_state(conn, 'synced_at')
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return {'exists': True, 'data_version': None, 'synced_at': None, 'age': None}
+
+    synced_at = float(synced_at) if synced_at else None
+    return {
+        'exists': True,
+        'data_version': data_version,
+        'synced_at': synced_at,
+        'age': time.time() - synced_at if synced_at else None
+    }
+
+
+def replica_is_fresh(path: str = REPLICA_PATH, max_age: float = REPLICA_MAX_AGE) -> bool:
+    """Whether the replica exists and was synced within max_age seconds"""
+    status = replica_status(path)
+    return status['age'] is not None and status['age'] <= max_age
+
+
+def start_periodic_sync(path: str = REPLICA_PATH, interval: float = REPLICA_SYNC_INTERVAL,
+                        on_sync: Optional[Callable[[Dict], None]] = None) -> Optional[threading.Thread]:
+    """
+    Start a daemon thread that re-syncs the replica every `interval` seconds
+
+    Args:
+        path: Replica file path
+        interval: Seconds between syncs
+        on_sync: Called with the sync_replica() result whenever a sync
+            brought in a new data_version, e.g. to drop cached parses
+
+    Returns:
+        The started thread, or None if interval is not positive
+    """
+    if interval <= 0:
+        return None
+
+    def run():
+        remote = TursoDatabase()
+        while True:
+            time.sleep(interval)
+            try:
+                result = sync_replica(path, remote)
+                if result['status'] == 'synced':
+                    print(f"Turso replica: synced {result['copied']}")
+                    if on_sync is not None:
+                        on_sync(result)
+            except Exception as e:
+                print(f"Turso replica: sync failed: {e}")
+
+    thread = threading.Thread(target=run, name='turso-replica-sync', daemon=True)
+    thread.start()
+    return thread
+
+
+class ReplicaDatabase:
+    """
+    Read-only lookups against the local replica
+
+    Drop-in replacement for TursoDatabase's lookup methods, so the parser
+    can use it wherever it would query Turso. Each thread gets its own
+    SQLite connection.
+    """
+
+    def __init__(self, path: str = REPLICA_PATH):
+        """
+        Open replica
+
+        Args:
+            path: Replica file path
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Turso replica not found: {path}")
+
+        self.path = path
+        self.connected = True
+        self._local = threading.local()
+        self.use_form_key = self._has_form_key()
+        # data_version the replica was last synced at (updated by the parser after background syncs)
+        self.data_version = self._synced_version()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def _has_form_key(self) -> bool:
+        """Whether the replica's form tables carry the form_key column"""
+        try:
+            return all(
+                'form_key' in {row[1] for row in self._conn().execute(f'PRAGMA table_info({table})')}
+                for table in KEYED_TABLES
+            )
+        except sqlite3.Error:
+            return False
+
+    def _synced_version(self) -> Optional[str]:
+        """data_version recorded by the last sync"""
+        try:
+            return _get_state(self._conn(), 'data_version')
+        except sqlite3.Error:
+            return None
+
+    def connect(self):
+        """Replica is always available once opened"""
+        return True
+
+    @contextmanager
+    def stream(self):
+        """No-op counterpart of TursoDatabase.stream()"""
+        yield self
+
+    def _check_forms(self, kind: str, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Look up several forms with the same queries TursoDatabase uses
+
+        With form_key, forms sharing a nasal key are queried once and each
+        form gets the rows stored under its exact spelling.
+        """
+        forms = _unique(forms)
+        results = {form: [] for form in forms}
+        try:
+            conn = self._conn()
+            if self.use_form_key:
+                sql, row_converter = FORM_KEY_QUERIES[kind]
+                found = {}
+                for (_, key), members in _form_key_groups([(kind, form) for form in forms]).items():
+                    stored = [(row[-1], row_converter(row)) for row in conn.execute(sql, (key,))]
+                    _assign_key_matches(found, members, stored)
+                results.update({form: matches for (_, form), matches in found.items()})
+            else:
+                sql, row_converter = FORM_QUERIES[kind]
+                for form in forms:
+                    results[form] = [row_converter(row) for row in conn.execute(sql, (form,))]
+        except sqlite3.Error:
+            pass
+        return results
+
+    def check_verb_form(self, form: str) -> List[Tuple[str, Dict]]:
+        """Check if a verb form exists; returns (root, grammatical_info) tuples"""
+        return self.check_verb_forms([form])[form]
+
+    def check_verb_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """Check several verb forms"""
+        return self._check_forms('verb', forms)
+
+    def check_noun_form(self, form: str) -> List[Tuple[str, Dict]]:
+        """Check if a noun form exists; returns (stem, grammatical_info) tuples"""
+        return self.check_noun_forms([form])[form]
+
+    def check_noun_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """Check several noun forms"""
+        return self._check_forms('noun', forms)
+
+    def check_participle_form(self, form: str) -> List[Tuple[str, Dict]]:
+        """Check if a participle form exists; returns (root, grammatical_info) tuples"""
+        return self.check_participle_forms([form])[form]
+
+    def check_participle_forms(self, forms: List[str]) -> Dict[str, List[Tuple[str, Dict]]]:
+        """Check several participle forms"""
+        return self._check_forms('participle', forms)
+
+    def lookup_all(self, forms: List[str]) -> Dict[str, Dict[str, List[Tuple[str, Dict]]]]:
+        """Check forms against the verb, noun and participle tables"""
+        return {kind: self._check_forms(kind, forms) for kind, _, _ in FORM_TABLES}
+
+    def lookup_all_many(self, form_groups: List[List[str]]) -> List[Dict[str, Dict[str, List[Tuple[str, Dict]]]]]:
+        """lookup_all() for several groups of forms"""
+        return [self.lookup_all(forms) for forms in form_groups]
+
+    def load_verb_roots(self) -> set:
+        """Load all verb roots from the replica"""
+        try:
+            rows = self._conn().execute('SELECT DISTINCT root FROM verb_roots')
+            return {row[0] for row in rows if row[0]}
+        except sqlite3.Error:
+            return set()
+
+    def get_metadata(self, key: str) -> Optional[str]:
+        """Get a metadata value copied from Turso"""
+        try:
+            row = self._conn().execute('SELECT value FROM metadata WHERE key = ?', (key,)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    command = args[0] if args else 'status'
+    path = args[1] if len(args) > 1 else REPLICA_PATH
+
+    if command == 'sync':
+        start = time.time()
+        result = sync_replica(path, full='--full' in sys.argv)
+        print(f"Replica {path}: {result['status']} in {time.time() - start:.1f}s")
+        for table, count in result.get('copied', {}).items():
+            print(f"  {table}: +{count} rows")
+        if result['status'] == 'error':
+            print(f"Error: {result.get('error')}")
+            sys.exit(1)
+    elif command == 'status':
+        status = replica_status(path)
+        print(f"Replica {path}:")
+        for key, value in status.items():
+            print(f"  {key}: {value}")
+    else:
+        print("Usage: python turso_replica.py [sync [--full]|status] [replica.db]")
+        sys.exit(1)
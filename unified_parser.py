@@ -7,7 +7,18 @@ Implements proper suffix priority and blocking rules
 import re
 import json
 import os
-from typing import Dict, List, Tuple, Optional
+import copy
+import codecs
+import threading
+import time
+import importlib.util
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+
+from affix_tries import PrefixTrie, SuffixTable, SuffixTrie, compile_suffix_table
+from devanagari_transliterator import detect_scheme, devanagari_to_hk_many, hk_to_devanagari, scheme_to_hk
+from instrumentation import collect_timings, span, stage_stats
+import metrics
+from ttl_cache import MISSING, TTLCache
 
 # Load .env file for local development (ignored on Vercel where env vars are set in dashboard)
 try:
@@ -71,18 +82,109 @@ NOUN_ENDING_TYPES = {
     'U': 'U-ending (UkArAnta)',
 }
 
+# Maximum number of words accepted by one /api/parse/batch request
+PARSE_BATCH_MAX_WORDS = int(os.getenv('PARSE_BATCH_MAX_WORDS', '2000'))
+
+# Punctuation, digits and whitespace separating words in running text
+WORD_SEPARATORS = re.compile(r'[\s\u0964\u0965|,;:.!?"()\[\]{}<>0-9\u0966-\u096F\-\u2013\u2014]+')
+
+
+def split_words(text: str) -> List[str]:
+    """
+    Split running Prakrit text (HK or Devanagari) into words
+
+    Dandas, punctuation, digits and whitespace separate words and are dropped.
+    """
+    return [word for word in WORD_SEPARATORS.split(text) if word]
+
+
+def iter_words(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the words of text that arrives in pieces (lines, read() blocks, ...)
+
+    Only the current piece and a word cut off at its end are held in memory.
+    """
+    tail = ''
+    for chunk in chunks:
+        text = tail + chunk
+        if not text:
+            continue
+        words = split_words(text)
+        # A word running up to the end of the piece may continue in the next one
+        tail = words.pop() if words and not WORD_SEPARATORS.match(text[-1]) else ''
+        yield from words
+    if tail:
+        yield tail
+
+
+def read_text_chunks(stream, chunk_size: int = 65536) -> Iterator[str]:
+    """Decode a binary stream as UTF-8 in fixed-size blocks"""
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        yield decoder.decode(block)
+    yield decoder.decode(b'', final=True)
+
+
+def read_multipart_text(stream, boundary: bytes, chunk_size: int = 65536) -> Iterator[str]:
+    """
+    Decode the 'file' part (or else the 'text' field) of a multipart body as UTF-8
+
+    The body is parsed block by block straight from the stream, so an
+    upload is processed while it arrives instead of being spooled first.
+    """
+    from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+    parts = MultipartDecoder(boundary)
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    current = None
+    text = []
+    ended = False
+    while True:
+        event = parts.next_event()
+        if isinstance(event, NeedData):
+            if ended:
+                break  # Truncated body
+            block = stream.read(chunk_size)
+            ended = not block
+            parts.receive_data(block or None)
+        elif isinstance(event, File) and event.name == 'file' and event.filename:
+            current = 'file'
+        elif isinstance(event, (Field, File)):
+            current = 'text' if event.name == 'text' and isinstance(event, Field) else None
+        elif isinstance(event, Data):
+            if current == 'file':
+                yield decoder.decode(event.data)
+                if not event.more_data:
+                    yield decoder.decode(b'', final=True)
+                    return
+            elif current == 'text':
+                text.append(event.data)
+        elif isinstance(event, Epilogue):
+            break
+    yield b''.join(text).decode('utf-8', 'replace')
+
+
+# Words parsed together (one batched lookup) per step of /api/parse/stream
+PARSE_STREAM_BATCH_WORDS = int(os.getenv('PARSE_STREAM_BATCH_WORDS', '50'))
+
+# Memoized parse() results: entries (0 disables) and time-to-live in seconds (0 = no expiry)
+PARSE_CACHE_SIZE = int(os.getenv('PARSE_CACHE_SIZE', '4096'))
+PARSE_CACHE_TTL = float(os.getenv('PARSE_CACHE_TTL', '3600'))
+
 # Optional dependencies
 try:
-    from flask import Flask, render_template, request, jsonify
+    from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
     HAS_FLASK = True
 except ImportError:
     HAS_FLASK = False
 
-try:
-    from aksharamukha import transliterate as aksh_transliterate
-    HAS_AKSHARAMUKHA = True
-except ImportError:
-    HAS_AKSHARAMUKHA = False
+# aksharamukha is only a fallback for Devanagari input and slow to import, so
+# just check that it is available here
+HAS_AKSHARAMUKHA = importlib.util.find_spec('aksharamukha') is not None
+if not HAS_AKSHARAMUKHA:
     print("Warning: aksharamukha not installed. Install with: pip install aksharamukha")
 
 # Initialize Flask app only if available
@@ -94,21 +196,83 @@ class PrakritUnifiedParser:
     Unified parser for both Prakrit verbs and nouns with intelligent ending-based analysis
     """
 
-    def __init__(self, auto_download=True):
+    # Independently loaded parts of the parser (name -> loader method), in load order
+    SUBSYSTEMS = {
+        'data': 'load_data',
+        'feedback': 'load_feedback_data',
+        'suffixes': 'initialize_suffix_database',
+        'dictionary': 'load_dictionary',
+    }
+
+    def __init__(self, auto_download=True, lazy=False):
         """
         Initialize parser
 
         Args:
             auto_download: If True, automatically download missing databases
+            lazy: If True, load each subsystem on first use instead of now
+                (see ensure_ready())
         """
         # Auto-download databases if missing
         if auto_download:
             self.ensure_databases()
 
-        self.load_data()
-        self.load_feedback_data()
-        self.initialize_suffix_database()
-        self.load_dictionary()
+        # (data_version, word_hk, script) -> parse result; cleared whenever data or feedback changes
+        self.parse_cache = TTLCache(PARSE_CACHE_SIZE, PARSE_CACHE_TTL or None) if PARSE_CACHE_SIZE > 0 else None
+        # Bumped on every clear, so parses that started before it are not memoized
+        self.parse_cache_generation = 0
+        # Guards feedback_data['suffix_accuracy'] and the cache clear that follows updates
+        self._feedback_lock = threading.RLock()
+
+        # Subsystem name -> seconds its loader took, once loaded
+        self.load_times = {}
+        self._load_locks = {name: threading.Lock() for name in self.SUBSYSTEMS}
+        self.turso_db = None
+        self.async_turso_db = None
+        self.data_source = "none"
+        self.dictionary = None
+        # (verb roots, prefix trie over them), replaced as one tuple (see set_verb_roots)
+        self.verb_root_index = (frozenset(), PrefixTrie())
+        # Cleared while Turso connects in the background; lookups wait for it
+        self.turso_ready = threading.Event()
+        self.turso_ready.set()
+
+        if not lazy:
+            self.ensure_ready()
+
+    def ensure_ready(self, *names: str):
+        """
+        Load the given subsystems (all by default) unless already loaded
+
+        Thread-safe: concurrent callers wait for a single load of each subsystem.
+
+        Args:
+            names: Keys of SUBSYSTEMS
+        """
+        for name in names or self.SUBSYSTEMS:
+            if name in self.load_times:
+                continue
+            with self._load_locks[name]:
+                if name in self.load_times:
+                    continue
+                start = time.perf_counter()
+                getattr(self, self.SUBSYSTEMS[name])()
+                self.load_times[name] = time.perf_counter() - start
+
+    def readiness(self) -> Dict:
+        """Report which subsystems are loaded, without loading anything"""
+        subsystems = {}
+        for name in self.SUBSYSTEMS:
+            load_time = self.load_times.get(name)
+            subsystems[name] = {
+                'ready': load_time is not None,
+                'load_seconds': round(load_time, 4) if load_time is not None else None
+            }
+        return {
+            'ready': len(self.load_times) == len(self.SUBSYSTEMS),
+            'data_source': self.data_source,
+            'subsystems': subsystems
+        }
 
     def ensure_databases(self):
         """Legacy method - databases now loaded from Turso"""
@@ -131,20 +295,55 @@ class PrakritUnifiedParser:
 
     def load_data(self):
         """Load verb and noun data from Turso database, with fallbacks"""
+        self.clear_parse_cache()
+
         # Initialize Turso database connection
         self.turso_db = None
+        self.async_turso_db = None  # Created on first parse_async() call
         self.data_source = "none"  # Track which source is actually used
+        # Surface form -> [(root/stem, info)] for the local fallback
+        self.verb_form_index = {}
+        self.noun_form_index = {}
+        self.participle_form_index = {}
+
+        # Prefer a fresh local replica of the Turso tables (no network round trips)
+        try:
+            from turso_replica import ReplicaDatabase, replica_is_fresh, start_periodic_sync
+            if replica_is_fresh():
+                self.turso_db = ReplicaDatabase()
+                self.set_verb_roots(self.turso_db.load_verb_roots())
+                if self.verb_roots:
+                    self.all_verb_forms = {}
+                    self.all_noun_forms = {}
+                    self.all_participle_forms = {}
+                    self.data_source = "replica"
+                    start_periodic_sync(on_sync=self.on_replica_synced)
+                    print(f"Data source: local Turso replica ({len(self.verb_roots)} verb roots loaded)")
+                    return
+                self.turso_db = None
+        except Exception as e:
+            print(f"Turso replica not available: {e}")
+            self.turso_db = None
 
         try:
             from turso_db import TursoDatabase
             self.turso_db = TursoDatabase()
+            # With a bundled root snapshot, start serving right away and connect
+            # (and check the snapshot's freshness) in a background thread
+            if self.turso_db.base_url and self.turso_db.headers and self.load_root_snapshot():
+                self.all_verb_forms = {}
+                self.all_noun_forms = {}
+                self.all_participle_forms = {}
+                self.data_source = "turso"
+                print(f"Data source: Turso (on-demand queries, {len(self.verb_roots)} verb roots from snapshot)")
+                return
             if self.turso_db.connect():
                 # Turso connected - use on-demand queries via check_verb_form/check_noun_form
                 # Only load verb_roots (small set needed for ending-based analysis)
-                self.verb_roots = self.turso_db.load_verb_roots()
+                self.set_verb_roots(self.turso_db.load_verb_roots())
                 if not self.verb_roots:
                     # Fallback: load verb roots from local JSON
-                    self.verb_roots = self.load_verb_roots()
+                    self.set_verb_roots(self.load_verb_roots())
                 self.all_verb_forms = {}  # On-demand via check_attested_verb_form
                 self.all_noun_forms = {}  # On-demand via check_attested_noun_form
                 self.all_participle_forms = {}  # On-demand via check_participle_form
@@ -154,16 +353,140 @@ class PrakritUnifiedParser:
         except Exception as e:
             print(f"Turso not available, using local fallback: {e}")
 
-        # Fallback to local files
-        self.verb_roots = self.load_verb_roots()
-        self.all_verb_forms = self.load_verb_forms_db()
-        self.all_noun_forms = self.load_noun_forms_db()
-        self.all_participle_forms = {}  # No local participle data yet
+        self.load_local_data()
+
+    def load_local_data(self):
+        """Load verb roots and form indexes from local files (no Turso)"""
+        self.data_source = "none"
+        self.set_verb_roots(self.load_verb_roots())
+        self.all_participle_forms = {}
+
+        # Memory-mapped form stores (form_store.py) replace the JSON form files when built
+        from form_store import load_form_store
+        verb_store = load_form_store('verb')
+        noun_store = load_form_store('noun')
+        participle_store = load_form_store('participle')
+
+        if verb_store is not None:
+            self.all_verb_forms = {}
+            self.verb_form_index = verb_store
+        else:
+            self.all_verb_forms = self.load_verb_forms_db()
+            self.verb_form_index = self.build_form_index(self.all_verb_forms)
+
+        if noun_store is not None:
+            self.all_noun_forms = {}
+            self.noun_form_index = noun_store
+        else:
+            self.all_noun_forms = self.load_noun_forms_db()
+            self.noun_form_index = self.build_form_index(self.all_noun_forms)
+
+        if participle_store is not None:
+            self.participle_form_index = participle_store
 
         # Determine which fallback source worked
         if self.verb_roots:
             self.data_source = "local_json"
-            print(f"Data source: Local JSON (verb_roots: {len(self.verb_roots)}, verb_forms: {len(self.all_verb_forms)}, noun_forms: {len(self.all_noun_forms)})")
+            print(f"Data source: Local JSON (verb_roots: {len(self.verb_roots)}, verb_forms: {len(self.verb_form_index)}, noun_forms: {len(self.noun_form_index)})")
+
+    def set_verb_roots(self, roots, trie: Optional[PrefixTrie] = None):
+        """
+        Install the verb root set and the prefix trie built from it
+
+        Both are published in one assignment, so a concurrent reader of
+        verb_root_index never sees roots and a trie from different sets.
+
+        Args:
+            roots: Set of verb roots in HK transliteration
+            trie: Prebuilt PrefixTrie over roots (built here if omitted)
+        """
+        self.verb_root_index = (roots, trie if trie is not None else PrefixTrie(roots))
+
+    @property
+    def verb_roots(self):
+        """Current set of verb roots"""
+        return self.verb_root_index[0]
+
+    @property
+    def root_trie(self) -> PrefixTrie:
+        """Prefix trie over the current verb roots"""
+        return self.verb_root_index[1]
+
+    def load_root_snapshot(self) -> bool:
+        """
+        Install verb roots from the bundled snapshot (see root_snapshot.py)
+
+        Nothing here touches the network: Turso is connected in a background
+        thread (see connect_turso_background), which also re-downloads the
+        roots if the snapshot turns out to be stale. Lookups wait for that
+        connect through turso_ready.
+
+        Returns:
+            True if the snapshot was used
+        """
+        from root_snapshot import load_root_snapshot
+        snapshot = load_root_snapshot()
+        if snapshot is None:
+            return False
+
+        self.set_verb_roots(snapshot.roots, snapshot.trie)
+        self.turso_ready.clear()
+        threading.Thread(target=self.connect_turso_background, args=(snapshot.data_version,),
+                         daemon=True).start()
+        return True
+
+    def connect_turso_background(self, snapshot_version: Optional[str]):
+        """
+        Connect to Turso after starting from the root snapshot
+
+        Falls back to local files if Turso cannot be reached, and refreshes
+        the roots if the snapshot was built for another data_version (or
+        either version is unknown).
+
+        Args:
+            snapshot_version: data_version recorded in the snapshot
+        """
+        try:
+            connected = self.turso_db.connect()
+        except Exception as e:
+            print(f"Turso: Connection failed: {e}")
+            connected = False
+
+        try:
+            if not connected:
+                print("Turso not available, using local fallback")
+                self.load_local_data()
+                self.clear_parse_cache()
+                return
+        finally:
+            self.turso_ready.set()
+
+        data_version = self.turso_db.data_version
+        if snapshot_version is None or data_version is None or snapshot_version != data_version:
+            print(f"Verb root snapshot is stale (data_version {snapshot_version}, "
+                  f"database has {data_version}); refreshing")
+            self.refresh_verb_roots()
+
+    def turso_connected(self) -> bool:
+        """True if Turso lookups can be used (waits for a background connect)"""
+        if self.turso_db is None:
+            return False
+        self.turso_ready.wait()
+        return self.turso_db.connected
+
+    def refresh_verb_roots(self):
+        """Re-download verb roots from Turso and rewrite the snapshot if possible"""
+        roots = self.turso_db.load_verb_roots()
+        if not roots:
+            return
+        self.set_verb_roots(roots)
+        self.clear_parse_cache()
+
+        from root_snapshot import save_root_snapshot
+        try:
+            save_root_snapshot(roots, self.turso_db.data_version)
+        except OSError:
+            pass  # Read-only deployment - keep using the downloaded roots
 
     def load_verb_roots(self):
         """Load verb roots from verbs1.json and filter out invalid single-letter consonants"""
@@ -252,8 +575,33 @@ class PrakritUnifiedParser:
             print(f"Warning: Could not load noun forms: {e}")
             return {}
 
+    def build_form_index(self, forms_by_lemma: Dict) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Invert a {lemma: forms} table into {form: [(lemma, info), ...]}
+
+        Built once at load time so local lookups cost one dict probe per
+        variant instead of a scan over every root or stem.
+
+        Args:
+            forms_by_lemma: Mapping of root/stem to a dict (form -> info) or list of forms
+
+        Returns:
+            Dict mapping each surface form to its (lemma, form_info) tuples,
+            in the table's lemma order
+        """
+        index = {}
+        for lemma, forms in forms_by_lemma.items():
+            if isinstance(forms, dict):
+                for form, info in forms.items():
+                    index.setdefault(form, []).append((lemma, info))
+            elif isinstance(forms, list):
+                for form in dict.fromkeys(forms):
+                    index.setdefault(form, []).append((lemma, {}))
+        return index
+
     def load_feedback_data(self):
         """Load user feedback data for learning"""
+        self.clear_parse_cache()
         try:
             feedback_path = os.path.join(os.path.dirname(__file__), 'user_feedback.json')
             with open(feedback_path, encoding='utf-8') as f:
@@ -289,6 +637,7 @@ class PrakritUnifiedParser:
         Returns:
             Status dict with success/error message
         """
+        self.ensure_ready('feedback')
         try:
             # Record the correction
             if word not in self.feedback_data['form_corrections']:
@@ -299,37 +648,41 @@ class PrakritUnifiedParser:
                 'timestamp': str(__import__('datetime').datetime.now())
             })
 
-            # Update suffix accuracy tracking
-            # Only track suffix correctness, not root correctness
-            correct_suffix = correct_analysis.get('suffix') or correct_analysis.get('ending')
-            if correct_suffix:
-                if correct_suffix not in self.feedback_data['suffix_accuracy']:
-                    self.feedback_data['suffix_accuracy'][correct_suffix] = {
-                        'correct': 0,
-                        'incorrect': 0
-                    }
-
-                # Mark this suffix as correct
-                self.feedback_data['suffix_accuracy'][correct_suffix]['correct'] += 1
-
-                # Only mark OTHER suffixes as incorrect (not the same suffix with different root)
-                # Collect unique suffixes from incorrect analyses
-                incorrect_suffixes = set()
-                for analysis in all_analyses:
-                    if analysis == correct_analysis:
-                        continue
-                    other_suffix = analysis.get('suffix') or analysis.get('ending')
-                    if other_suffix and other_suffix != correct_suffix:
-                        incorrect_suffixes.add(other_suffix)
-
-                # Mark each unique incorrect suffix
-                for incorrect_suffix in incorrect_suffixes:
-                    if incorrect_suffix not in self.feedback_data['suffix_accuracy']:
-                        self.feedback_data['suffix_accuracy'][incorrect_suffix] = {
+            with self._feedback_lock:
+                # Update suffix accuracy tracking
+                # Only track suffix correctness, not root correctness
+                correct_suffix = correct_analysis.get('suffix') or correct_analysis.get('ending')
+                if correct_suffix:
+                    if correct_suffix not in self.feedback_data['suffix_accuracy']:
+                        self.feedback_data['suffix_accuracy'][correct_suffix] = {
                             'correct': 0,
                             'incorrect': 0
                         }
-                    self.feedback_data['suffix_accuracy'][incorrect_suffix]['incorrect'] += 1
+
+                    # Mark this suffix as correct
+                    self.feedback_data['suffix_accuracy'][correct_suffix]['correct'] += 1
+
+                    # Only mark OTHER suffixes as incorrect (not the same suffix with different root)
+                    # Collect unique suffixes from incorrect analyses
+                    incorrect_suffixes = set()
+                    for analysis in all_analyses:
+                        if analysis == correct_analysis:
+                            continue
+                        other_suffix = analysis.get('suffix') or analysis.get('ending')
+                        if other_suffix and other_suffix != correct_suffix:
+                            incorrect_suffixes.add(other_suffix)
+
+                    # Mark each unique incorrect suffix
+                    for incorrect_suffix in incorrect_suffixes:
+                        if incorrect_suffix not in self.feedback_data['suffix_accuracy']:
+                            self.feedback_data['suffix_accuracy'][incorrect_suffix] = {
+                                'correct': 0,
+                                'incorrect': 0
+                            }
+                        self.feedback_data['suffix_accuracy'][incorrect_suffix]['incorrect'] += 1
+
+                    # Confidence adjustments changed, so memoized parses are stale
+                    self.clear_parse_cache()
 
             self.feedback_data['total_feedback'] += 1
 
@@ -368,10 +721,12 @@ class PrakritUnifiedParser:
                 continue
 
             # Check if we have feedback for this suffix
-            if suffix in self.feedback_data['suffix_accuracy']:
-                stats = self.feedback_data['suffix_accuracy'][suffix]
-                correct = stats['correct']
-                incorrect = stats['incorrect']
+            with self._feedback_lock:
+                stats = self.feedback_data['suffix_accuracy'].get(suffix)
+                if stats:
+                    correct = stats['correct']
+                    incorrect = stats['incorrect']
+            if stats:
                 total = correct + incorrect
 
                 if total > 0:
@@ -397,6 +752,83 @@ class PrakritUnifiedParser:
 
         return analyses
 
+    def clear_parse_cache(self):
+        """Drop all memoized parse() results"""
+        if getattr(self, 'parse_cache', None) is not None:
+            with self._feedback_lock:
+                self.parse_cache_generation += 1
+                self.parse_cache.clear()
+
+    def on_replica_synced(self, result: Dict):
+        """
+        Pick up rows a background replica sync copied (see start_periodic_sync)
+
+        New verb roots are reinstalled, as refresh_verb_roots does for Turso.
+
+        Args:
+            result: sync_replica() result with status 'synced'
+        """
+        if result.get('copied', {}).get('verb_roots'):
+            roots = self.turso_db.load_verb_roots()
+            if roots:
+                self.set_verb_roots(roots)
+        self.turso_db.data_version = result.get('data_version')
+        self.clear_parse_cache()
+
+    @property
+    def data_version(self) -> Optional[str]:
+        """metadata data_version of the Turso database or replica in use, if known"""
+        return getattr(self.turso_db, 'data_version', None)
+
+    def parse_cache_state(self) -> Tuple[int, Optional[str]]:
+        """Cache generation and data_version, taken before a word is analyzed (see memoize_parse)"""
+        return self.parse_cache_generation, self.data_version
+
+    def get_memoized_parse(self, text: str, original_script: str, word_hk: str) -> Optional[Dict]:
+        """
+        Return a memoized parse() result for a prepared word, or None
+
+        Only results parsed against the current data_version count. The
+        result is a copy with 'original_form' set to this input, so callers
+        may modify it freely.
+        """
+        if self.parse_cache is None:
+            return None
+        cached = self.parse_cache.get((self.data_version, word_hk, original_script))
+        if cached is MISSING:
+            return None
+        result = copy.deepcopy(cached)
+        result['original_form'] = text
+        return result
+
+    def memoize_parse(self, original_script: str, word_hk: str, result: Dict,
+                      state: Tuple[int, Optional[str]]):
+        """
+        Remember a successful parse() result for a prepared word
+
+        state is parse_cache_state() from before the word was analyzed; if
+        the cache was cleared or the data_version changed since, the result
+        may be built on stale data or feedback and is not stored.
+        """
+        if self.parse_cache is None or not result.get('success'):
+            return
+        with self._feedback_lock:
+            if state == self.parse_cache_state():
+                self.parse_cache.set((state[1], word_hk, original_script), copy.deepcopy(result))
+
+    def cache_stats(self) -> Dict:
+        """Return statistics for the lookup and parse caches in use"""
+        stats = {}
+        if self.parse_cache is not None:
+            stats['parse_cache'] = dict(self.parse_cache.stats(), enabled=True)
+        else:
+            stats['parse_cache'] = {'enabled': False}
+        if self.turso_db and hasattr(self.turso_db, 'cache_stats'):
+            stats['turso_cache'] = self.turso_db.cache_stats()
+        if self.async_turso_db:
+            stats['async_turso_cache'] = self.async_turso_db.cache_stats()
+        return stats
+
     def initialize_suffix_database(self):
         """Initialize comprehensive suffix database with priority and blocking rules"""
 
@@ -715,15 +1147,24 @@ class PrakritUnifiedParser:
             'iia': {'type': 'past_passive_participle', 'priority': 4, 'confidence': 0.90, 'declined': True, 'consonant_only': True},
         }
 
+        # Compiled once so per-word matching needs no sorting
+        self.noun_suffix_table = compile_suffix_table(self.noun_suffixes, 'noun')
+        self.verb_ending_table = compile_suffix_table(self.verb_endings, 'verb')
+        self.participle_suffix_table = compile_suffix_table(self.participle_suffixes, 'participle')
+
+        # One reversed-suffix trie over all three tables
+        self.suffix_trie = SuffixTrie.from_tables(
+            [self.noun_suffix_table, self.verb_ending_table, self.participle_suffix_table]
+        )
+
     def detect_script(self, text: str) -> str:
-        """Detect if input is Devanagari or Harvard-Kyoto"""
-        if any('\u0900' <= c <= '\u097F' for c in text):
-            return 'Devanagari'
-        return 'HK'
+        """Detect if input is Devanagari, Harvard-Kyoto, IAST, ISO-15919, SLP1 or Velthuis"""
+        return detect_scheme(text)
 
     def transliterate_to_hk(self, text: str) -> str:
-        """Convert Devanagari to Harvard-Kyoto"""
-        if self.detect_script(text) == 'Devanagari':
+        """Convert Devanagari or another romanization scheme to Harvard-Kyoto"""
+        script = self.detect_script(text)
+        if script == 'Devanagari':
             # Use built-in transliterator
             try:
                 from devanagari_transliterator import devanagari_to_hk
@@ -731,15 +1172,14 @@ class PrakritUnifiedParser:
             except ImportError:
                 # Fallback to aksharamukha if available
                 if HAS_AKSHARAMUKHA:
+                    from aksharamukha import transliterate as aksh_transliterate
                     return aksh_transliterate.process('Devanagari', 'HK', text)
                 return text
-        return text
+        return scheme_to_hk(text, script)
 
     def transliterate_to_devanagari(self, text: str) -> str:
         """Convert Harvard-Kyoto to Devanagari"""
-        if not HAS_AKSHARAMUKHA:
-            return text
-        return aksh_transliterate.process('HK', 'Devanagari', text)
+        return hk_to_devanagari(text)
 
     def normalize_input(self, text: str) -> str:
         """Normalize input text"""
@@ -845,21 +1285,14 @@ class PrakritUnifiedParser:
         variants = self.generate_anusvara_variants(form)
 
         # Try Turso database first (direct query is more efficient)
-        if self.turso_db and self.turso_db.connected:
+        if self.turso_connected():
+            matches_by_variant = self.turso_db.check_verb_forms(variants)
             for variant in variants:
-                matches = self.turso_db.check_verb_form(variant)
-                all_results.extend(matches)
+                all_results.extend(matches_by_variant.get(variant, []))
 
         # Fallback to in-memory cache (only if no Turso results)
-        if not all_results and self.all_verb_forms:
-            for variant in variants:
-                for root, forms in self.all_verb_forms.items():
-                    if isinstance(forms, dict):
-                        if variant in forms:
-                            all_results.append((root, forms[variant]))
-                    elif isinstance(forms, list):
-                        if variant in forms:
-                            all_results.append((root, {}))
+        if not all_results and self.verb_form_index:
+            all_results = self.check_local_forms(self.verb_form_index, variants)
 
         return all_results
 
@@ -878,27 +1311,140 @@ class PrakritUnifiedParser:
         variants = self.generate_anusvara_variants(form)
 
         # Try Turso database first (direct query is more efficient)
-        if self.turso_db and self.turso_db.connected:
+        if self.turso_connected():
+            matches_by_variant = self.turso_db.check_noun_forms(variants)
             for variant in variants:
-                matches = self.turso_db.check_noun_form(variant)
-                all_results.extend(matches)
+                all_results.extend(matches_by_variant.get(variant, []))
 
         # Fallback to in-memory cache (only if no Turso results)
-        if not all_results and self.all_noun_forms:
-            for variant in variants:
-                for stem, forms in self.all_noun_forms.items():
-                    if isinstance(forms, dict):
-                        if variant in forms:
-                            all_results.append((stem, forms[variant]))
-                    elif isinstance(forms, list):
-                        if variant in forms:
-                            all_results.append((stem, {}))
+        if not all_results and self.noun_form_index:
+            all_results = self.check_local_forms(self.noun_form_index, variants)
+
+        return all_results
+
+    def check_local_forms(self, form_index: Dict[str, List[Tuple[str, Dict]]],
+                          variants: List[str]) -> List[Tuple[str, Dict]]:
+        """
+        Look up variants in an in-memory form index (see build_form_index) or a FormStore
 
+        Args:
+            form_index: Mapping of surface form to (lemma, form_info) tuples
+            variants: Forms to look for, in lookup order
+
+        Returns:
+            List of (lemma, form_info) tuples for all matches
+        """
+        all_results = []
+        for variant in variants:
+            all_results.extend(form_index.get(variant, ()))
         return all_results
 
-    def validate_prakrit_characters(self, text: str) -> Tuple[bool, str]:
-        """Validate if text contains only valid Prakrit characters"""
-        hk_text = self.transliterate_to_hk(text)
+    def lookup_attested_forms(self, word_hk: str) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Fetch attested verb, noun and participle matches for a word in one go
+
+        With Turso, all anusvara variants are checked against the three form
+        tables in a single pipeline request. The result is shared by the
+        analyze_as_* methods so that parse() hits the network only once.
+
+        Args:
+            word_hk: Word in HK transliteration
+
+        Returns:
+            Dict with 'verb', 'noun' and 'participle' lists of (lemma, form_info) tuples
+        """
+        return self.lookup_attested_forms_many([word_hk])[0]
+
+    def lookup_attested_forms_many(self, words_hk: List[str]) -> List[Dict[str, List[Tuple[str, Dict]]]]:
+        """
+        lookup_attested_forms() for several words with one batched Turso lookup
+
+        Args:
+            words_hk: Words in HK transliteration
+
+        Returns:
+            One dict of 'verb', 'noun' and 'participle' matches per word, in order
+        """
+        variant_lists = [self.generate_anusvara_variants(word_hk) for word_hk in words_hk]
+
+        all_matches = [None] * len(variant_lists)
+        if variant_lists and self.turso_connected():
+            all_matches = self.turso_db.lookup_all_many(variant_lists)
+
+        return [self.collect_attested_forms(variants, matches)
+                for variants, matches in zip(variant_lists, all_matches)]
+
+    async def lookup_attested_forms_async(self, word_hk: str) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Async counterpart of lookup_attested_forms using AsyncTursoDatabase
+
+        Args:
+            word_hk: Word in HK transliteration
+
+        Returns:
+            Dict with 'verb', 'noun' and 'participle' lists of (lemma, form_info) tuples
+        """
+        if self.data_source != 'turso':
+            # Local sources answer without network I/O
+            return self.lookup_attested_forms(word_hk)
+
+        variants = self.generate_anusvara_variants(word_hk)
+
+        matches = None
+        async_db = await self.get_async_turso_db()
+        if async_db:
+            matches = await async_db.lookup_all(variants)
+
+        return self.collect_attested_forms(variants, matches)
+
+    async def get_async_turso_db(self):
+        """Return a connected AsyncTursoDatabase, or None if unavailable"""
+        if self.data_source != 'turso':
+            return None
+
+        if self.async_turso_db is None:
+            from turso_db import AsyncTursoDatabase, HAS_HTTPX
+            if not HAS_HTTPX:
+                return None
+            self.async_turso_db = AsyncTursoDatabase()
+
+        if not self.async_turso_db.connected:
+            if not await self.async_turso_db.connect():
+                return None
+        return self.async_turso_db
+
+    def collect_attested_forms(self, variants: List[str], matches: Optional[Dict] = None) -> Dict[str, List[Tuple[str, Dict]]]:
+        """
+        Flatten per-variant database matches and apply the local fallback
+
+        Args:
+            variants: Anusvara variants of the word, in lookup order
+            matches: Result of a lookup_all() call, or None if no database was queried
+
+        Returns:
+            Dict with 'verb', 'noun' and 'participle' lists of (lemma, form_info) tuples
+        """
+        attested = {'verb': [], 'noun': [], 'participle': []}
+
+        if matches:
+            for kind in attested:
+                for variant in variants:
+                    attested[kind].extend(matches[kind].get(variant, []))
+
+        # Fallback to in-memory cache (only if no Turso results)
+        if not attested['verb'] and self.verb_form_index:
+            attested['verb'] = self.check_local_forms(self.verb_form_index, variants)
+        if not attested['noun'] and self.noun_form_index:
+            attested['noun'] = self.check_local_forms(self.noun_form_index, variants)
+        if not attested['participle'] and self.participle_form_index:
+            attested['participle'] = self.check_local_forms(self.participle_form_index, variants)
+
+        return attested
+
+    def validate_prakrit_characters(self, text: str, hk_text: Optional[str] = None) -> Tuple[bool, str]:
+        """Validate if text contains only valid Prakrit characters (hk_text: its HK, if already known)"""
+        if hk_text is None:
+            hk_text = self.transliterate_to_hk(text)
 
         # Forbidden characters in Prakrit
         forbidden = {
@@ -919,68 +1465,78 @@ class PrakritUnifiedParser:
     def check_attested_form(self, word_hk: str, form_type: str) -> Optional[Dict]:
         """Check if form is attested in JSON databases"""
         if form_type == 'verb':
-            # Check in all_verb_forms
-            for root, forms in self.all_verb_forms.items():
-                if word_hk in forms:
-                    return {
-                        'root': root,
-                        'form': word_hk,
-                        'source': 'attested_verb',
-                        'confidence': 1.0
-                    }
+            # Check in the verb form index
+            matches = self.verb_form_index.get(word_hk)
+            if matches:
+                root = matches[0][0]
+                return {
+                    'root': root,
+                    'form': word_hk,
+                    'source': 'attested_verb',
+                    'confidence': 1.0
+                }
         elif form_type == 'noun':
-            # Check in all_noun_forms
-            for stem, forms in self.all_noun_forms.items():
-                if word_hk in forms:
-                    found = forms[word_hk]
-                    return {
-                        'stem': stem,
-                        'form': word_hk,
-                        'gender': found.get('gender', 'unknown'),
-                        'case': found.get('case', 'unknown'),
-                        'number': found.get('number', 'unknown'),
-                        'source': 'attested_noun',
-                        'confidence': 1.0
-                    }
+            # Check in the noun form index
+            matches = self.noun_form_index.get(word_hk)
+            if matches:
+                stem, found = matches[0]
+                return {
+                    'stem': stem,
+                    'form': word_hk,
+                    'gender': found.get('gender', 'unknown'),
+                    'case': found.get('case', 'unknown'),
+                    'number': found.get('number', 'unknown'),
+                    'source': 'attested_noun',
+                    'confidence': 1.0
+                }
         return None
 
-    def find_suffix_matches(self, word: str, suffix_dict: Dict) -> List[Dict]:
-        """Find all possible suffix matches with priority and blocking"""
-        matches = []
+    def find_suffix_matches(self, word: str, suffix_table: SuffixTable) -> List[Dict]:
+        """
+        Find all possible suffix matches with priority and blocking
+
+        Args:
+            word: Word in HK transliteration
+            suffix_table: Compiled table (see compile_suffix_table); a plain suffix dict is compiled on the fly
 
-        # Sort suffixes by priority (longest first)
-        sorted_suffixes = sorted(suffix_dict.items(),
-                                key=lambda x: (x[1].get('priority', 0), len(x[0])),
-                                reverse=True)
+        Returns:
+            Match dicts ('suffix', 'base', 'info', 'priority'), highest priority first
+        """
+        if isinstance(suffix_table, dict):
+            suffix_table = compile_suffix_table(suffix_table)
+
+        # Suffixes ending the word, from one trie walk, applied in (priority, length) order
+        if suffix_table.name in self.suffix_trie.kinds:
+            candidates = self.suffix_trie.ranked_matches(word, suffix_table.name)
+        else:
+            candidates = [e for e in suffix_table.ranked if word.endswith(e.suffix)]
 
+        matches = []
         blocked_suffixes = set()
 
-        for suffix, info in sorted_suffixes:
+        for entry in candidates:
             # Skip if blocked by higher priority match
-            if suffix in blocked_suffixes:
+            if entry.suffix in blocked_suffixes:
                 continue
 
-            if word.endswith(suffix):
-                base = word[:-len(suffix)] if len(suffix) > 0 else word
+            base = word[:len(word) - entry.length]
 
-                # Validate context (preceding vowel requirements)
-                if info.get('must_precede'):
-                    if not base or base[-1] not in info['must_precede']:
-                        continue
+            # Validate context (preceding vowel requirements)
+            if entry.must_precede and (not base or base[-1] not in entry.must_precede):
+                continue
 
-                # Add blocks from this match
-                if info.get('blocks'):
-                    blocked_suffixes.update(info['blocks'])
+            # Add blocks from this match
+            if entry.blocks:
+                blocked_suffixes |= entry.blocks
 
-                match = {
-                    'suffix': suffix,
-                    'base': base,
-                    'info': info,
-                    'priority': info.get('priority', 0)
-                }
-                matches.append(match)
+            matches.append({
+                'suffix': entry.suffix,
+                'base': base,
+                'info': entry.info,
+                'priority': entry.priority
+            })
 
-        return sorted(matches, key=lambda x: x['priority'], reverse=True)
+        return matches
 
     def is_valid_prakrit_stem(self, stem: str) -> bool:
         """
@@ -1155,12 +1711,13 @@ class PrakritUnifiedParser:
         # Default: return base as-is
         return base
 
-    def analyze_as_noun(self, word_hk: str) -> List[Dict]:
+    def analyze_as_noun(self, word_hk: str, attested_matches: Optional[List[Tuple[str, Dict]]] = None) -> List[Dict]:
         """Analyze word as a Prakrit noun with attested form validation"""
         results = []
 
-        # First check if form is attested in noun_forms.db
-        attested_matches = self.check_attested_noun_form(word_hk)
+        # First check if form is attested in noun_forms.db (unless already fetched)
+        if attested_matches is None:
+            attested_matches = self.check_attested_noun_form(word_hk)
         is_attested = len(attested_matches) > 0
         attested_stems = {stem for stem, _ in attested_matches}
 
@@ -1197,7 +1754,7 @@ class PrakritUnifiedParser:
         # Also try ending-based analysis for additional insights
 
         # Find suffix matches
-        suffix_matches = self.find_suffix_matches(word_hk, self.noun_suffixes)
+        suffix_matches = self.find_suffix_matches(word_hk, self.noun_suffix_table)
 
         for match in suffix_matches[:10]:  # Limit to top 10 matches
             suffix = match['suffix']
@@ -1314,12 +1871,14 @@ class PrakritUnifiedParser:
 
         return candidates
 
-    def analyze_as_verb(self, word_hk: str) -> List[Dict]:
+    def analyze_as_verb(self, word_hk: str, attested_matches: Optional[List[Tuple[str, Dict]]] = None) -> List[Dict]:
         """Analyze word as a Prakrit verb with attested form validation and vowel sandhi support"""
+        verb_roots, root_trie = self.verb_root_index
         results = []
 
-        # First check if form is attested in verb_forms.db
-        attested_matches = self.check_attested_verb_form(word_hk)
+        # First check if form is attested in verb_forms.db (unless already fetched)
+        if attested_matches is None:
+            attested_matches = self.check_attested_verb_form(word_hk)
         is_attested = len(attested_matches) > 0
         attested_roots = {root for root, _ in attested_matches}
 
@@ -1365,7 +1924,7 @@ class PrakritUnifiedParser:
         # Also try ending-based analysis for additional insights
 
         # Find ending matches
-        ending_matches = self.find_suffix_matches(word_hk, self.verb_endings)
+        ending_matches = self.find_suffix_matches(word_hk, self.verb_ending_table)
 
         for match in ending_matches[:10]:  # Limit to top 10
             ending = match['suffix']
@@ -1376,20 +1935,18 @@ class PrakritUnifiedParser:
             root_candidates = []
 
             # Strategy 1: Direct substring matches
-            for i in range(len(base), 0, -1):
-                subroot = base[:i]
-                if subroot in self.verb_roots:
-                    root_candidates.append({
-                        'root': subroot,
-                        'method': 'direct_match',
-                        'sandhi_note': None,
-                        'confidence_boost': 0.15
-                    })
+            for subroot in root_trie.prefixes_of(base):
+                root_candidates.append({
+                    'root': subroot,
+                    'method': 'direct_match',
+                    'sandhi_note': None,
+                    'confidence_boost': 0.15
+                })
 
             # Strategy 2: Vowel sandhi reversals
             sandhi_candidates = self.apply_vowel_sandhi_reverse(base)
             for candidate_root, sandhi_rule in sandhi_candidates:
-                if candidate_root in self.verb_roots:
+                if candidate_root in verb_roots:
                     root_candidates.append({
                         'root': candidate_root,
                         'method': 'sandhi_reversal',
@@ -1397,14 +1954,13 @@ class PrakritUnifiedParser:
                         'confidence_boost': 0.20  # Slightly higher for sandhi (more sophisticated)
                     })
                 # Also try partial matches for compound roots
-                for i in range(len(candidate_root), 0, -1):
-                    if candidate_root[:i] in self.verb_roots:
-                        root_candidates.append({
-                            'root': candidate_root[:i],
-                            'method': 'sandhi_reversal_partial',
-                            'sandhi_note': sandhi_rule,
-                            'confidence_boost': 0.12
-                        })
+                for partial_root in root_trie.prefixes_of(candidate_root):
+                    root_candidates.append({
+                        'root': partial_root,
+                        'method': 'sandhi_reversal_partial',
+                        'sandhi_note': sandhi_rule,
+                        'confidence_boost': 0.12
+                    })
 
             # If no attested root found, use the base as a guess
             if not root_candidates:
@@ -1483,52 +2039,74 @@ class PrakritUnifiedParser:
 
         return results
 
-    def analyze_as_participle(self, word_hk: str) -> List[Dict]:
+    def check_attested_participle_form(self, form: str) -> List[Tuple[str, Dict]]:
+        """
+        Check if a participle form is attested in Turso database or local store
+
+        Args:
+            form: Participle form in HK transliteration
+
+        Returns:
+            List of (root, form_info) tuples for all matching rows
+        """
+        all_results = []
+        variants = self.generate_anusvara_variants(form)
+        if self.turso_connected():
+            matches_by_variant = self.turso_db.check_participle_forms(variants)
+            for variant in variants:
+                all_results.extend(matches_by_variant.get(variant, []))
+
+        # Fallback to a local participle form store
+        if not all_results and self.participle_form_index:
+            all_results = self.check_local_forms(self.participle_form_index, variants)
+        return all_results
+
+    def analyze_as_participle(self, word_hk: str, attested_matches: Optional[List[Tuple[str, Dict]]] = None) -> List[Dict]:
         """Analyze word as a Prakrit participle"""
+        verb_roots, root_trie = self.verb_root_index
         results = []
 
-        # First check if form is attested in participle_forms database
-        if self.turso_db and self.turso_db.connected:
-            variants = self.generate_anusvara_variants(word_hk)
-            for variant in variants:
-                matches = self.turso_db.check_participle_form(variant)
-                for root, info in matches:
-                    participle_type = info.get('participle_type')
-                    analysis = {
-                        'form': word_hk,
-                        'root': root,
-                        'type': 'participle',
-                        'participle_type': participle_type,
-                        'suffix': info.get('suffix'),
-                        'source': 'attested_form',
-                        'confidence': 1.0,
-                        'notes': [f"Participle form attested in database for root '{root}'"]
-                    }
-
-                    # Add Sanskrit term for participle type
-                    if participle_type:
-                        analysis['sanskrit_term'] = SANSKRIT_TERMS.get(participle_type, participle_type)
-
-                    # Add declension info if available (for declined participles)
-                    if info.get('gender'):
-                        gender = info.get('gender')
-                        case = info.get('case')
-                        number = info.get('number')
-                        analysis['gender'] = gender
-                        analysis['case'] = case
-                        analysis['number'] = number
-                        # Add Sanskrit terms for declined participles
-                        if gender:
-                            analysis['sanskrit_gender'] = SANSKRIT_TERMS.get(gender, gender)
-                        if case:
-                            analysis['sanskrit_case'] = SANSKRIT_TERMS.get(case, case)
-                        if number:
-                            analysis['sanskrit_number'] = SANSKRIT_TERMS.get(number, number)
-
-                    results.append(analysis)
+        # First check if form is attested in participle_forms database (unless already fetched)
+        if attested_matches is None:
+            attested_matches = self.check_attested_participle_form(word_hk)
+
+        for root, info in attested_matches:
+            participle_type = info.get('participle_type')
+            analysis = {
+                'form': word_hk,
+                'root': root,
+                'type': 'participle',
+                'participle_type': participle_type,
+                'suffix': info.get('suffix'),
+                'source': 'attested_form',
+                'confidence': 1.0,
+                'notes': [f"Participle form attested in database for root '{root}'"]
+            }
+
+            # Add Sanskrit term for participle type
+            if participle_type:
+                analysis['sanskrit_term'] = SANSKRIT_TERMS.get(participle_type, participle_type)
+
+            # Add declension info if available (for declined participles)
+            if info.get('gender'):
+                gender = info.get('gender')
+                case = info.get('case')
+                number = info.get('number')
+                analysis['gender'] = gender
+                analysis['case'] = case
+                analysis['number'] = number
+                # Add Sanskrit terms for declined participles
+                if gender:
+                    analysis['sanskrit_gender'] = SANSKRIT_TERMS.get(gender, gender)
+                if case:
+                    analysis['sanskrit_case'] = SANSKRIT_TERMS.get(case, case)
+                if number:
+                    analysis['sanskrit_number'] = SANSKRIT_TERMS.get(number, number)
+
+            results.append(analysis)
 
         # Ending-based analysis
-        suffix_matches = self.find_suffix_matches(word_hk, self.participle_suffixes)
+        suffix_matches = self.find_suffix_matches(word_hk, self.participle_suffix_table)
 
         for match in suffix_matches[:10]:
             suffix = match['suffix']
@@ -1539,7 +2117,7 @@ class PrakritUnifiedParser:
             potential_roots = []
 
             # Try direct match
-            if base in self.verb_roots:
+            if base in verb_roots:
                 potential_roots.append(base)
 
             # For consonant-only participles, skip if no consonant root found
@@ -1550,11 +2128,9 @@ class PrakritUnifiedParser:
 
             # If no direct match, try substrings
             if not potential_roots:
-                for i in range(len(base), max(1, len(base)-2), -1):
-                    subroot = base[:i]
-                    if subroot in self.verb_roots:
-                        potential_roots.append(subroot)
-                        break
+                subroot = root_trie.longest_prefix(base, max(2, len(base) - 1))
+                if subroot:
+                    potential_roots.append(subroot)
 
             # If still no match, use base as guess
             if not potential_roots:
@@ -1564,7 +2140,7 @@ class PrakritUnifiedParser:
                 confidence = info.get('confidence', 0.7)
 
                 # Boost confidence if root is in verb_roots
-                if root in self.verb_roots:
+                if root in verb_roots:
                     confidence += 0.15
 
                 participle_type = info.get('type')
@@ -1603,41 +2179,42 @@ class PrakritUnifiedParser:
             - type: participle type
             - confidence: confidence score
         """
-        # Check against known participle suffixes
-        for suffix, info in self.participle_suffixes.items():
-            if stem.endswith(suffix):
-                base = stem[:-len(suffix)]
+        verb_roots, root_trie = self.verb_root_index
+        # Known participle suffixes ending the stem, in definition order
+        entries = self.suffix_trie.ordered_matches(stem, 'participle')
 
-                # Check if root exists
-                potential_roots = []
+        for entry in entries:
+            suffix, info = entry.suffix, entry.info
+            base = stem[:-entry.length]
 
-                # Direct match
-                if base in self.verb_roots:
-                    potential_roots.append(base)
+            # Check if root exists
+            potential_roots = []
+
+            # Direct match
+            if base in verb_roots:
+                potential_roots.append(base)
 
-                # Substring matches
-                if not potential_roots:
-                    for i in range(len(base), max(1, len(base)-2), -1):
-                        subroot = base[:i]
-                        if subroot in self.verb_roots:
-                            potential_roots.append(subroot)
-                            break
-
-                # If we found a root, this is likely a participle
-                if potential_roots:
-                    root = potential_roots[0]
-                    confidence = info.get('confidence', 0.7)
-                    if root in self.verb_roots:
-                        confidence += 0.15
-
-                    return True, {
-                        'root': root,
-                        'suffix': suffix,
-                        'type': info.get('type'),
-                        'declined': info.get('declined', False),
-                        'confidence': min(confidence, 1.0),
-                        'sanskrit_term': SANSKRIT_TERMS.get(info.get('type'), info.get('type'))
-                    }
+            # Substring matches
+            if not potential_roots:
+                subroot = root_trie.longest_prefix(base, max(2, len(base) - 1))
+                if subroot:
+                    potential_roots.append(subroot)
+
+            # If we found a root, this is likely a participle
+            if potential_roots:
+                root = potential_roots[0]
+                confidence = info.get('confidence', 0.7)
+                if root in verb_roots:
+                    confidence += 0.15
+
+                return True, {
+                    'root': root,
+                    'suffix': suffix,
+                    'type': info.get('type'),
+                    'declined': info.get('declined', False),
+                    'confidence': min(confidence, 1.0),
+                    'sanskrit_term': SANSKRIT_TERMS.get(info.get('type'), info.get('type'))
+                }
 
         return False, None
 
@@ -1650,92 +2227,226 @@ class PrakritUnifiedParser:
         results = []
 
         # Try stripping noun suffixes to see if we get a participle stem
-        for noun_suffix, suffix_info in self.noun_suffixes.items():
-            if word_hk.endswith(noun_suffix):
-                # Get potential stem
-                stem = word_hk[:-len(noun_suffix)]
-
-                # Check if this stem is a participle
-                is_part, part_info = self.is_participle_stem(stem)
-
-                if is_part:
-                    # This is a declined participle!
-                    analysis = {
-                        'form': word_hk,
-                        'stem': stem,
-                        'root': part_info['root'],
-                        'type': 'participle',
-                        'participle_type': part_info['type'],
-                        'sanskrit_term': part_info['sanskrit_term'],
-                        'participle_suffix': part_info['suffix'],
-                        'noun_ending': noun_suffix,
-                        'source': 'declined_participle',
-                        'confidence': min(part_info['confidence'] + 0.1, 1.0),
-                        'notes': [
-                            f"Declined participle: {part_info['sanskrit_term']}",
-                            f"Root: '{part_info['root']}' + participle suffix '{part_info['suffix']}'",
-                            f"Declined with noun ending '-{noun_suffix}'"
-                        ]
-                    }
-
-                    # Add case/number/gender info from noun suffix
-                    cases = suffix_info.get('cases', [])
-                    numbers = suffix_info.get('numbers', [])
-                    genders = suffix_info.get('genders', [])
-
-                    if cases:
-                        # Convert to Sanskrit terms if single case
-                        if len(cases) == 1:
-                            analysis['case'] = cases[0]
-                            analysis['sanskrit_case'] = SANSKRIT_TERMS.get(cases[0], cases[0])
-                        else:
-                            analysis['cases'] = cases  # Multiple possibilities
-                            analysis['sanskrit_cases'] = [SANSKRIT_TERMS.get(c, c) for c in cases]
+        # Two-level trie walk: noun endings of the word, then participle suffixes of each stem
+        noun_entries = self.suffix_trie.ordered_matches(word_hk, 'noun')
 
-                    if numbers:
-                        if len(numbers) == 1:
-                            analysis['number'] = numbers[0]
-                            analysis['sanskrit_number'] = SANSKRIT_TERMS.get(numbers[0], numbers[0])
-                        else:
-                            analysis['numbers'] = numbers
+        for entry in noun_entries:
+            noun_suffix, suffix_info = entry.suffix, entry.info
+            # Get potential stem
+            stem = word_hk[:len(word_hk) - entry.length]
 
-                    if genders:
-                        if len(genders) == 1:
-                            analysis['gender'] = genders[0]
-                            analysis['sanskrit_gender'] = SANSKRIT_TERMS.get(genders[0], genders[0])
-                        else:
-                            analysis['genders'] = genders
+            # Check if this stem is a participle
+            is_part, part_info = self.is_participle_stem(stem)
 
-                    # Determine stem ending type
-                    if stem:
-                        stem_ending = stem[-1]
-                        if stem_ending in NOUN_ENDING_TYPES:
-                            analysis['stem_ending_type'] = NOUN_ENDING_TYPES[stem_ending]
+            if is_part:
+                # This is a declined participle!
+                analysis = {
+                    'form': word_hk,
+                    'stem': stem,
+                    'root': part_info['root'],
+                    'type': 'participle',
+                    'participle_type': part_info['type'],
+                    'sanskrit_term': part_info['sanskrit_term'],
+                    'participle_suffix': part_info['suffix'],
+                    'noun_ending': noun_suffix,
+                    'source': 'declined_participle',
+                    'confidence': min(part_info['confidence'] + 0.1, 1.0),
+                    'notes': [
+                        f"Declined participle: {part_info['sanskrit_term']}",
+                        f"Root: '{part_info['root']}' + participle suffix '{part_info['suffix']}'",
+                        f"Declined with noun ending '-{noun_suffix}'"
+                    ]
+                }
+
+                # Add case/number/gender info from noun suffix
+                cases = suffix_info.get('cases', [])
+                numbers = suffix_info.get('numbers', [])
+                genders = suffix_info.get('genders', [])
+
+                if cases:
+                    # Convert to Sanskrit terms if single case
+                    if len(cases) == 1:
+                        analysis['case'] = cases[0]
+                        analysis['sanskrit_case'] = SANSKRIT_TERMS.get(cases[0], cases[0])
+                    else:
+                        analysis['cases'] = cases  # Multiple possibilities
+                        analysis['sanskrit_cases'] = [SANSKRIT_TERMS.get(c, c) for c in cases]
+
+                if numbers:
+                    if len(numbers) == 1:
+                        analysis['number'] = numbers[0]
+                        analysis['sanskrit_number'] = SANSKRIT_TERMS.get(numbers[0], numbers[0])
+                    else:
+                        analysis['numbers'] = numbers
+
+                if genders:
+                    if len(genders) == 1:
+                        analysis['gender'] = genders[0]
+                        analysis['sanskrit_gender'] = SANSKRIT_TERMS.get(genders[0], genders[0])
+                    else:
+                        analysis['genders'] = genders
+
+                # Determine stem ending type
+                if stem:
+                    stem_ending = stem[-1]
+                    if stem_ending in NOUN_ENDING_TYPES:
+                        analysis['stem_ending_type'] = NOUN_ENDING_TYPES[stem_ending]
 
-                    results.append(analysis)
+                results.append(analysis)
 
         return results
 
     def parse(self, text: str) -> Dict:
         """Main parsing function - unified analysis"""
+        self.ensure_ready()
+        error_result, original_script, word_hk = self.prepare_word(text)
+        if error_result:
+            return error_result
+
+        with span('parse_cache'):
+            result = self.get_memoized_parse(text, original_script, word_hk)
+        if result is not None:
+            return result
+        state = self.parse_cache_state()
+
+        # Fetch attested forms once and share them across the analyzers
+        with span('lookup'):
+            attested = self.lookup_attested_forms(word_hk)
+
+        result = self.analyze_word(text, original_script, word_hk, attested)
+        self.memoize_parse(original_script, word_hk, result, state)
+        return result
+
+    async def parse_async(self, text: str) -> Dict:
+        """
+        Async variant of parse() for ASGI servers
+
+        Attested-form lookups go through AsyncTursoDatabase, so many
+        concurrent requests can overlap their network I/O on one event loop.
+        """
+        self.ensure_ready()
+        error_result, original_script, word_hk = self.prepare_word(text)
+        if error_result:
+            return error_result
+
+        with span('parse_cache'):
+            result = self.get_memoized_parse(text, original_script, word_hk)
+        if result is not None:
+            return result
+        state = self.parse_cache_state()
+
+        with span('lookup'):
+            attested = await self.lookup_attested_forms_async(word_hk)
+
+        result = self.analyze_word(text, original_script, word_hk, attested)
+        self.memoize_parse(original_script, word_hk, result, state)
+        return result
+
+    def parse_many(self, words: List[str]) -> List[Dict]:
+        """
+        Parse several words, e.g. every word of a passage
+
+        Each distinct word is prepared and analyzed once, memoized words are
+        answered from the parse cache, and attested forms for all remaining
+        words are fetched with a single batched lookup.
+
+        Args:
+            words: Words in HK or Devanagari
+
+        Returns:
+            One parse() result per input word, in input order; repeated
+            words share the same result dict
+        """
+        self.ensure_ready()
+        results = {}
+        pending = {}  # word_hk -> [(text, original_script)]
+        state = self.parse_cache_state()
+
+        # Transliterate all distinct Devanagari words in one pass
+        devanagari = [text.strip() for text in dict.fromkeys(words) if self.detect_script(text) == 'Devanagari']
+        transliterated = dict(zip(devanagari, devanagari_to_hk_many(devanagari)))
+
+        for text in words:
+            if text in results:
+                continue
+            error_result, original_script, word_hk = self.prepare_word(text, transliterated.get(text.strip()))
+            if error_result:
+                results[text] = error_result
+                continue
+            result = self.get_memoized_parse(text, original_script, word_hk)
+            if result is not None:
+                results[text] = result
+                continue
+            results[text] = None
+            pending.setdefault(word_hk, []).append((text, original_script))
+
+        words_hk = list(pending)
+        with span('lookup'):
+            attested_many = self.lookup_attested_forms_many(words_hk)
+        for word_hk, attested in zip(words_hk, attested_many):
+            for text, original_script in pending[word_hk]:
+                result = self.analyze_word(text, original_script, word_hk, attested)
+                self.memoize_parse(original_script, word_hk, result, state)
+                results[text] = result
+
+        return [results[text] for text in words]
+
+    def prepare_word(self, text: str, text_hk: Optional[str] = None) -> Tuple[Optional[Dict], str, str]:
+        """
+        Validate, normalize and transliterate an input word
+
+        Args:
+            text: Word in HK or Devanagari
+            text_hk: HK transliteration of the stripped Devanagari word, if
+                already converted (e.g. by devanagari_to_hk_many)
+
+        Returns:
+            (error_result, original_script, word_hk) - error_result is a
+            failure response if the input is invalid, otherwise None
+        """
         # Validate input
-        is_valid, error_msg = self.validate_prakrit_characters(text)
+        with span('validate'):
+            is_valid, error_msg = self.validate_prakrit_characters(text, text_hk)
         if not is_valid:
             return {
                 'success': False,
                 'error': error_msg,
                 'suggestions': ['Check input for forbidden characters', 'Use proper Prakrit transliteration']
-            }
+            }, '', ''
+
+        # Normalize and transliterate (romanized input is converted to HK
+        # first, so it is normalized exactly like HK input)
+        with span('transliterate'):
+            original_script = self.detect_script(text)
+            if original_script == 'Devanagari':
+                word_hk = text_hk if text_hk is not None else self.transliterate_to_hk(self.normalize_input(text))
+            else:
+                word_hk = self.normalize_input(self.transliterate_to_hk(text))
+        return None, original_script, word_hk
+
+    def analyze_word(self, text: str, original_script: str, word_hk: str,
+                     attested: Dict[str, List[Tuple[str, Dict]]]) -> Dict:
+        """
+        Run all analyzers on a prepared word and build the parse response
 
-        # Normalize and transliterate
-        original_script = self.detect_script(text)
-        word_hk = self.transliterate_to_hk(self.normalize_input(text))
+        Args:
+            text: Original input text
+            original_script: Script detected for the input
+            word_hk: Normalized word in HK transliteration
+            attested: Attested matches from lookup_attested_forms()
 
+        Returns:
+            Parse response dict
+        """
         # Analyze as noun, verb, and participle
-        noun_analyses = self.analyze_as_noun(word_hk)
-        verb_analyses = self.analyze_as_verb(word_hk)
-        participle_analyses = self.analyze_as_participle(word_hk)
-        declined_participle_analyses = self.analyze_as_declined_participle(word_hk)
+        with span('analyze_noun'):
+            noun_analyses = self.analyze_as_noun(word_hk, attested['noun'])
+        with span('analyze_verb'):
+            verb_analyses = self.analyze_as_verb(word_hk, attested['verb'])
+        with span('analyze_participle'):
+            participle_analyses = self.analyze_as_participle(word_hk, attested['participle'])
+        with span('analyze_declined_participle'):
+            declined_participle_analyses = self.analyze_as_declined_participle(word_hk)
 
         # Combine and sort by confidence
         # Prioritize declined participles as they are more specific
@@ -1743,9 +2454,32 @@ class PrakritUnifiedParser:
         all_analyses.sort(key=lambda x: x.get('confidence', 0), reverse=True)
 
         # Apply learned adjustments from user feedback
-        all_analyses = self.apply_learned_adjustments(all_analyses)
+        with span('feedback'):
+            all_analyses = self.apply_learned_adjustments(all_analyses)
 
         # Add dictionary meanings if dictionary is loaded
+        with span('dictionary'):
+            self.add_dictionary_meanings(all_analyses)
+
+        # Add Devanagari forms if input was romanized
+        if original_script != 'Devanagari':
+            with span('devanagari'):
+                self.add_devanagari_forms(all_analyses)
+
+        metrics.ANALYSES_PER_WORD.observe(len(all_analyses))
+
+        return {
+            'success': True,
+            'original_form': text,
+            'hk_form': word_hk,
+            'script': original_script,
+            'data_source': self.data_source,  # Show which database is being used
+            'analyses': all_analyses[:15],  # Return top 15 analyses
+            'total_found': len(all_analyses)
+        }
+
+    def add_dictionary_meanings(self, all_analyses: List[Dict]):
+        """Attach the dictionary entry of each noun stem / verb root to its analysis (in place)"""
         if self.dictionary:
             for analysis in all_analyses:
                 lookup_word = None
@@ -1757,19 +2491,25 @@ class PrakritUnifiedParser:
 
                 if lookup_word:
                     try:
-                        # Try anusvara variants for better dictionary matching
-                        # Dictionary is in Devanagari, so M/n/N variations matter
-                        variants = self.generate_anusvara_variants(lookup_word)
-
                         entries = None
                         matched_variant = None
 
-                        # Try each variant until we find a match
-                        for variant in variants:
-                            entries = self.dictionary.lookup(variant, script='HK')
+                        if self.dictionary.has_headword_key:
+                            # One query covers every nasal spelling of the word
+                            entries = self.dictionary.lookup_by_key(lookup_word)
                             if entries:
-                                matched_variant = variant
-                                break
+                                matched_variant = entries[0]['headword_translit']
+                        else:
+                            # Try anusvara variants for better dictionary matching
+                            # Dictionary is in Devanagari, so M/n/N variations matter
+                            variants = self.generate_anusvara_variants(lookup_word)
+
+                            # Try each variant until we find a match
+                            for variant in variants:
+                                entries = self.dictionary.lookup(variant, script='HK')
+                                if entries:
+                                    matched_variant = variant
+                                    break
 
                         if entries:
                             entry = entries[0]
@@ -1785,31 +2525,69 @@ class PrakritUnifiedParser:
                     except:
                         pass  # Dictionary lookup is optional
 
-        # Add Devanagari forms if input was HK
-        if original_script == 'HK':
-            for analysis in all_analyses:
-                if 'form' in analysis:
-                    analysis['devanagari'] = self.transliterate_to_devanagari(analysis['form'])
-                if 'stem' in analysis:
-                    analysis['stem_devanagari'] = self.transliterate_to_devanagari(analysis['stem'])
-                if 'root' in analysis:
-                    analysis['root_devanagari'] = self.transliterate_to_devanagari(analysis['root'])
+    def add_devanagari_forms(self, all_analyses: List[Dict]):
+        """Add Devanagari renderings of form, stem and root to each analysis (in place)"""
+        # Each distinct string is converted once
+        devanagari = {}
+        for analysis in all_analyses:
+            for field, target in (('form', 'devanagari'), ('stem', 'stem_devanagari'),
+                                  ('root', 'root_devanagari')):
+                if field in analysis:
+                    value = analysis[field]
+                    if value not in devanagari:
+                        devanagari[value] = self.transliterate_to_devanagari(value)
+                    analysis[target] = devanagari[value]
+
+# Shared parser, created by get_parser()
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser() -> PrakritUnifiedParser:
+    """
+    Return the shared parser, creating it on first call
+
+    The parser is lazy: its data, feedback, suffix tables and dictionary load
+    on first use, so importing this module (e.g. on a serverless cold start)
+    does no I/O and routes like /healthz answer immediately.
+    """
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = PrakritUnifiedParser(lazy=True)
+    return _parser
 
-        return {
-            'success': True,
-            'original_form': text,
-            'hk_form': word_hk,
-            'script': original_script,
-            'data_source': self.data_source,  # Show which database is being used
-            'analyses': all_analyses[:15],  # Return top 15 analyses
-            'total_found': len(all_analyses)
-        }
 
-# Initialize parser
-parser = PrakritUnifiedParser()
+def __getattr__(name):
+    # 'unified_parser.parser' used to be built at import time; keep it working
+    if name == 'parser':
+        return get_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Flask routes (only if Flask is available)
 if HAS_FLASK:
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        """
+        Count every request and time it by endpoint for /metrics
+
+        The latency is observed when the response is closed, so streamed
+        bodies (/api/parse/stream) are timed until their last line is sent.
+        """
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        if endpoint != '/metrics' and 'request_start' in g:
+            metrics.HTTP_REQUESTS.inc(endpoint, request.method, str(response.status_code))
+            start = g.request_start
+            response.call_on_close(
+                lambda: metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint))
+        return response
+
     @app.route('/', methods=['GET'])
     def index():
         return render_template('unified_analyzer.html')
@@ -1848,7 +2626,13 @@ if HAS_FLASK:
             }), 400
 
         try:
-            result = parser.parse(form)
+            if request.args.get('debug') == 'timing':
+                # Per-stage spans of this call, returned with the result
+                with collect_timings() as timings:
+                    result = get_parser().parse(form)
+                result = dict(result, timings=timings)
+            else:
+                result = get_parser().parse(form)
             response = jsonify(result)
             response.headers.add('Access-Control-Allow-Origin', '*')
             return response
@@ -1858,6 +2642,124 @@ if HAS_FLASK:
                 'error': f'Parser error: {str(e)}'
             }), 500
 
+    @app.route('/api/parse/batch', methods=['POST', 'OPTIONS'])
+    def api_parse_batch():
+        """
+        API endpoint for parsing many words at once
+
+        Accepts JSON with either 'forms' (a list of words) or 'text' (running
+        text, split into words). Results are returned in input order.
+        """
+        if request.method == 'OPTIONS':
+            response = jsonify({'status': 'ok'})
+            response.headers.add('Access-Control-Allow-Origin', '*')
+            response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
+            response.headers.add('Access-Control-Allow-Methods', 'POST')
+            return response
+
+        data = request.get_json(force=True, silent=True)
+        if not isinstance(data, dict):
+            data = request.form.to_dict()
+
+        forms = data.get('forms')
+        if isinstance(forms, list):
+            forms = [str(form).strip() for form in forms]
+            forms = [form for form in forms if form]
+        else:
+            forms = split_words(data.get('text', '') or '')
+
+        if not forms:
+            return jsonify({
+                'success': False,
+                'error': "Please provide 'forms' (a list of words) or 'text'"
+            }), 400
+
+        if len(forms) > PARSE_BATCH_MAX_WORDS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many words ({len(forms)}); the limit is {PARSE_BATCH_MAX_WORDS} per request'
+            }), 400
+
+        try:
+            results = get_parser().parse_many(forms)
+            response = jsonify({
+                'success': True,
+                'count': len(forms),
+                'unique': len(set(forms)),
+                'results': results
+            })
+            response.headers.add('Access-Control-Allow-Origin', '*')
+            return response
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': f'Parser error: {str(e)}'
+            }), 500
+
+    @app.route('/api/parse/stream', methods=['POST', 'OPTIONS'])
+    def api_parse_stream():
+        """
+        API endpoint streaming analyses of a long text as NDJSON
+
+        Accepts a file upload ('file'), a 'text' field (form or JSON) or a raw
+        text body. The input is read incrementally and split into words; every
+        word yields one line {"index", "form", "result"} as soon as its batch
+        of PARSE_STREAM_BATCH_WORDS words is parsed, and a final
+        {"done": true, "count": n} line marks the end of the stream.
+        """
+        if request.method == 'OPTIONS':
+            response = jsonify({'status': 'ok'})
+            response.headers.add('Access-Control-Allow-Origin', '*')
+            response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
+            response.headers.add('Access-Control-Allow-Methods', 'POST')
+            return response
+
+        # Uploads and raw bodies are read from request.stream while the response
+        # is generated (request.files would be closed by then)
+        boundary = request.mimetype_params.get('boundary')
+        if request.mimetype == 'multipart/form-data' and boundary:
+            chunks = read_multipart_text(request.stream, boundary.encode('latin-1'))
+        elif request.mimetype == 'application/x-www-form-urlencoded':
+            chunks = [request.form.get('text', '')]
+        elif request.is_json:
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({
+                    'success': False,
+                    'error': "Please provide a JSON object with 'text'"
+                }), 400
+            chunks = [str(data.get('text') or '')]
+        else:
+            chunks = read_text_chunks(request.stream)
+
+        def parse_batch(words, start):
+            for offset, (word, result) in enumerate(zip(words, get_parser().parse_many(words))):
+                line = {'index': start + offset, 'form': word, 'result': result}
+                yield json.dumps(line, ensure_ascii=False) + '\n'
+
+        def generate():
+            count = 0
+            batch = []
+            try:
+                for word in iter_words(chunks):
+                    batch.append(word)
+                    if len(batch) >= PARSE_STREAM_BATCH_WORDS:
+                        yield from parse_batch(batch, count)
+                        count += len(batch)
+                        batch = []
+                if batch:
+                    yield from parse_batch(batch, count)
+                    count += len(batch)
+            except Exception as e:
+                yield json.dumps({'success': False, 'error': f'Parser error: {str(e)}'}) + '\n'
+                return
+            yield json.dumps({'done': True, 'count': count}) + '\n'
+
+        response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        response.headers.add('X-Accel-Buffering', 'no')  # Don't let proxies buffer the stream
+        return response
+
     @app.route('/api/analyze', methods=['POST', 'OPTIONS'])
     def api_analyze():
         """Backward compatibility with old /analyze endpoint"""
@@ -1892,7 +2794,7 @@ if HAS_FLASK:
             }), 400
 
         try:
-            result = parser.parse(verb_form)
+            result = get_parser().parse(verb_form)
 
             # Transform to old format
             if result['success']:
@@ -1952,7 +2854,7 @@ if HAS_FLASK:
             correct_analysis = all_analyses[correct_analysis_index]
 
             # Record the feedback
-            result = parser.record_feedback(word, correct_analysis, all_analyses)
+            result = get_parser().record_feedback(word, correct_analysis, all_analyses)
 
             response = jsonify(result)
             response.headers.add('Access-Control-Allow-Origin', '*')
@@ -1968,6 +2870,8 @@ if HAS_FLASK:
     def api_feedback_stats():
         """Get feedback statistics"""
         try:
+            parser = get_parser()
+            parser.ensure_ready('feedback')
             stats = {
                 'total_feedback': parser.feedback_data['total_feedback'],
                 'unique_forms': len(parser.feedback_data['form_corrections']),
@@ -1983,13 +2887,45 @@ if HAS_FLASK:
                 'error': str(e)
             }), 500
 
+    @app.route('/healthz', methods=['GET'])
+    def healthz():
+        """Health check; reports subsystem readiness without loading anything"""
+        response = jsonify(dict(get_parser().readiness(), status='ok'))
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        return response
+
+    @app.route('/api/timings', methods=['GET'])
+    def api_timings():
+        """Get latency histograms of the parse stages and Turso requests"""
+        response = jsonify(stage_stats())
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        """Prometheus metrics in the text exposition format"""
+        return Response(metrics.render(get_parser()), content_type=metrics.CONTENT_TYPE)
+
+    @app.route('/api/cache/stats', methods=['GET'])
+    def api_cache_stats():
+        """Get lookup and parse cache statistics"""
+        try:
+            response = jsonify(get_parser().cache_stats())
+            response.headers.add('Access-Control-Allow-Origin', '*')
+            return response
+
+        except Exception as e:
+            return jsonify({
+                'error': str(e)
+            }), 500
+
 if __name__ == '__main__':
     import sys
 
     if len(sys.argv) > 1:
         # CLI mode
         word = sys.argv[1]
-        result = parser.parse(word)
+        result = get_parser().parse(word)
 
         if result['success']:
             print(f"\n=== Analysis for: {result['original_form']} ===")
@@ -2032,5 +2968,8 @@ if __name__ == '__main__':
             print("For CLI usage, provide a word as argument: python unified_parser.py <word>")
             sys.exit(1)
 
+        # Load the parser in the background so the server answers right away
+        threading.Thread(target=get_parser().ensure_ready, daemon=True).start()
+
         port = int(os.environ.get("PORT", 5000))
         app.run(host='0.0.0.0', port=port, debug=True)
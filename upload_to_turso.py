@@ -6,20 +6,20 @@ Transforms schema from SQL file format to Turso format.
 import re
 import sys
 import time
-import requests
+
+from devanagari_transliterator import nasal_key
+from turso_db import TursoDatabase
 
 # Turso connection (read-write token)
-TURSO_URL = "https://prakrit-khasoochi.aws-ap-south-1.turso.io/v2/pipeline"
+TURSO_URL = "https://prakrit-khasoochi.aws-ap-south-1.turso.io"
 TURSO_TOKEN = sys.argv[1] if len(sys.argv) > 1 else ""
 
 if not TURSO_TOKEN:
     print("Usage: python upload_to_turso.py <read-write-token>")
     sys.exit(1)
 
-HEADERS = {
-    "Authorization": f"Bearer {TURSO_TOKEN}",
-    "Content-Type": "application/json"
-}
+# The whole upload runs on one Hrana stream (see main())
+DB = TursoDatabase(database_url=TURSO_URL, auth_token=TURSO_TOKEN, read_timeout=30, cache_size=0)
 
 # Schema transformations
 PERSON_MAP = {
@@ -34,52 +34,29 @@ NUMBER_MAP = {
 
 
 def execute_batch(statements):
-    """Execute a batch of SQL statements via Turso pipeline API"""
-    requests_list = [{"type": "execute", "stmt": s} for s in statements]
-    requests_list.append({"type": "close"})
-    payload = {"requests": requests_list}
+    """
+    Execute a batch of (sql, args) statements in one pipeline request
 
+    The request is retried (up to 3 attempts) if no statement succeeded.
+
+    Returns:
+        (ok, errors) where errors holds "Statement <i>: <message>" for each
+        failed statement
+    """
     for attempt in range(3):
-        try:
-            resp = requests.post(TURSO_URL, headers=HEADERS, json=payload, timeout=30)
-            if resp.status_code == 200:
-                data = resp.json()
-                errors = []
-                for i, r in enumerate(data.get("results", [])):
-                    if r.get("type") == "error":
-                        errors.append(f"Statement {i}: {r.get('error', {}).get('message', 'unknown')}")
-                return True, errors
-            else:
-                if attempt < 2:
-                    time.sleep(2)
-                    continue
-                return False, [f"HTTP {resp.status_code}: {resp.text[:200]}"]
-        except Exception as e:
-            if attempt < 2:
-                time.sleep(2)
-                continue
-            return False, [str(e)]
-    return False, ["Max retries exceeded"]
+        results, messages = DB._execute_many_with_errors(statements)
+        errors = [f"Statement {i}: {message}" for i, (rows, message) in enumerate(zip(results, messages))
+                  if rows is None]
+        if len(errors) < len(statements):
+            return True, errors
+        if attempt < 2:
+            time.sleep(2)
+    return False, errors
 
 
 def execute_single(sql, args=None):
-    """Execute a single SQL query and return rows"""
-    stmt = {"sql": sql}
-    if args:
-        stmt["args"] = [{"type": "text", "value": str(a)} for a in args]
-    payload = {
-        "requests": [
-            {"type": "execute", "stmt": stmt},
-            {"type": "close"}
-        ]
-    }
-    resp = requests.post(TURSO_URL, headers=HEADERS, json=payload, timeout=30)
-    data = resp.json()
-    result = data["results"][0]
-    if result.get("type") != "ok":
-        return None
-    rows = result["response"]["result"].get("rows", [])
-    return [[c.get("value") if isinstance(c, dict) else c for c in row] for row in rows]
+    """Execute a single SQL query and return rows (None on error)"""
+    return DB._execute(sql, args)
 
 
 def parse_sql_file(filepath):
@@ -105,7 +82,8 @@ def parse_sql_file(filepath):
     return records
 
 
-def main():
+def upload():
+    """Add the roots and verb forms of verb_forms_final.sql that Turso lacks"""
     print("=== Turso Upload Script ===\n")
 
     # Test connection
@@ -147,16 +125,13 @@ def main():
         batch_size = 100
         for i in range(0, len(missing_roots), batch_size):
             batch = missing_roots[i:i + batch_size]
-            stmts = []
-            for root in batch:
-                stmts.append({
-                    "sql": "INSERT OR IGNORE INTO verb_roots (root) VALUES (?)",
-                    "args": [{"type": "text", "value": root}]
-                })
+            stmts = [("INSERT OR IGNORE INTO verb_roots (root) VALUES (?)", [root]) for root in batch]
             ok, errors = execute_batch(stmts)
             if not ok:
                 print(f"  ERROR inserting roots batch {i}: {errors}")
             else:
+                for error in errors:
+                    print(f"\n  ERROR in roots batch {i}: {error}")
                 sys.stdout.write(f"\r  Inserted roots: {min(i + batch_size, len(missing_roots))}/{len(missing_roots)}")
                 sys.stdout.flush()
         print()
@@ -169,6 +144,10 @@ def main():
             existing_roots[row[1]] = row[0]
         print(f"Total roots now: {len(existing_roots)}\n")
 
+    # Fill form_key for new rows if the table has been migrated (migrate_form_keys.py)
+    columns = execute_single("PRAGMA table_info(verb_forms)") or []
+    has_form_key = any(row[1] == "form_key" for row in columns)
+
     # Insert verb forms in batches
     print("Inserting verb forms...")
     batch_size = 200
@@ -189,28 +168,21 @@ def main():
             person = PERSON_MAP.get(rec["person"], rec["person"])
             number = NUMBER_MAP.get(rec["number"], rec["number"])
 
-            stmts.append({
-                "sql": "INSERT OR IGNORE INTO verb_forms (root_id, form, tense, voice, mood, dialect, person, number) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                "args": [
-                    {"type": "integer", "value": str(root_id)},
-                    {"type": "text", "value": rec["form"]},
-                    {"type": "text", "value": rec["tense"]},
-                    {"type": "text", "value": rec["voice"]},
-                    {"type": "text", "value": "indicative"},
-                    {"type": "text", "value": "standard"},
-                    {"type": "text", "value": person},
-                    {"type": "text", "value": number},
-                ]
-            })
+            args = [root_id, rec["form"], rec["tense"], rec["voice"], "indicative", "standard", person, number]
+            if has_form_key:
+                stmts.append(("INSERT OR IGNORE INTO verb_forms (root_id, form, tense, voice, mood, dialect, person, number, form_key) "
+                              "VALUES (CAST(? AS INTEGER), ?, ?, ?, ?, ?, ?, ?, ?)", args + [nasal_key(rec["form"])]))
+            else:
+                stmts.append(("INSERT OR IGNORE INTO verb_forms (root_id, form, tense, voice, mood, dialect, person, number) "
+                              "VALUES (CAST(? AS INTEGER), ?, ?, ?, ?, ?, ?, ?)", args))
 
         if stmts:
             ok, errors = execute_batch(stmts)
             if ok:
-                inserted += len(stmts)
-                if errors:
-                    errors_total += len(errors)
-            else:
-                errors_total += len(stmts)
+                inserted += len(stmts) - len(errors)
+            errors_total += len(errors)
+            for error in errors:
+                print(f"\n  ERROR in verb forms batch {i}: {error}")
 
         elapsed = time.time() - start_time
         rate = (i + batch_size) / elapsed if elapsed > 0 else 0
@@ -225,6 +197,15 @@ def main():
     print(f"  Skipped (no root_id): {skipped}")
     print(f"  Errors: {errors_total}")
 
+    # Tell clients the data changed, so stale form filters, root snapshots
+    # and replicas are not trusted any more
+    if missing_roots or inserted:
+        version = DB.bump_data_version()
+        if version is None:
+            print("\nERROR: Could not update metadata data_version; rebuild form filters and snapshots by hand")
+        else:
+            print(f"\nNew data_version: {version}")
+
     # Verify final counts
     new_roots = int(execute_single("SELECT COUNT(*) FROM verb_roots")[0][0])
     new_forms = int(execute_single("SELECT COUNT(*) FROM verb_forms")[0][0])
@@ -240,5 +221,10 @@ def main():
     print("\nDone!")
 
 
+def main():
+    with DB.stream():
+        upload()
+
+
 if __name__ == "__main__":
     main()